@@ -24,6 +24,10 @@ def create_app(config_name='development'):
     
     # Create Flask app
     app = Flask(__name__)
+
+    # Serialize responses with orjson (Decimal/datetime/UUID handled natively)
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
     
     # Load configuration
     if config_name == 'development':
@@ -37,12 +41,12 @@ def create_app(config_name='development'):
     # Import models (IMPORTANT: must be after db init)
     with app.app_context():
         from app.models import (
-            User, Product, Category, Order, OrderItem,
-            Cart, CartItem, UserAddress, Payment,
+            User, Product, Category, ProductAccessibilityFeature, Order, OrderItem, StockReservation,
+            Cart, CartItem, UserAddress, Payment, DailySalesRollup, DailyProductSalesRollup,
             Page, BlogPost, SiteSetting, NewsletterSubscriber, ContactMessage,
             Consultation, FAQ, Testimonial,
             Notification, MediaFile, Message, ProductCollection,
-            Review, SectionContent,
+            Review, ProductRatingSummary, SectionContent,
             PressHero, MediaCoverage, PressRelease, Exhibition,
             SpeakingEngagement, Collaboration, MediaKitItem, MediaKitConfig, PressContact
         )
@@ -63,6 +67,10 @@ def create_app(config_name='development'):
     app.register_blueprint(section_content.bp)
     app.register_blueprint(press.bp)
 
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
     # Configure CORS
     CORS(app, resources={
         r"/api/*": {
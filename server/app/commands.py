@@ -0,0 +1,51 @@
+"""
+Flask CLI maintenance commands
+
+Usage:
+    flask --app run rebuild-rating-summaries
+    flask --app run release-expired-reservations
+    flask --app run sweep-guest-carts [--days N]
+    flask --app run rebuild-sales-rollups [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import click
+
+
+def register_commands(app):
+    """Attach maintenance commands to app.cli"""
+
+    @app.cli.command('rebuild-rating-summaries')
+    def rebuild_rating_summaries():
+        """Recompute product_rating_summary from approved reviews"""
+        from app.services.review_service import ReviewService
+
+        count = ReviewService.rebuild_rating_summaries()
+        click.echo(f"Rebuilt {count} rating summaries")
+
+    @app.cli.command('release-expired-reservations')
+    def release_expired_reservations():
+        """Return stock held by unpaid orders past their reservation window"""
+        from app.services.inventory_service import InventoryService
+
+        count = InventoryService.release_expired()
+        click.echo(f"Released {count} expired stock reservations")
+
+    @app.cli.command('sweep-guest-carts')
+    @click.option('--days', type=int, default=None, help='Inactivity cutoff (default GUEST_CART_SWEEP_DAYS)')
+    def sweep_guest_carts(days):
+        """Delete guest carts in the database untouched for --days days"""
+        from app.services.guest_cart_service import GuestCartService
+
+        days = days if days is not None else app.config.get('GUEST_CART_SWEEP_DAYS', 30)
+        count = GuestCartService.sweep_abandoned(days)
+        click.echo(f"Deleted {count} abandoned guest carts")
+
+    @app.cli.command('rebuild-sales-rollups')
+    @click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='First day (default: oldest record)')
+    @click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Last day (default: yesterday)')
+    def rebuild_sales_rollups(start, end):
+        """Backfill or rebuild the daily sales rollup tables"""
+        from app.services.sales_rollup_service import SalesRollupService
+
+        count = SalesRollupService.rebuild(start.date() if start else None, end.date() if end else None)
+        click.echo(f"Rebuilt sales rollups for {count} days")
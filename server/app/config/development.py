@@ -23,7 +23,71 @@ class DevelopmentConfig:
     JWT_TOKEN_LOCATION = ['headers', 'cookies']
     JWT_COOKIE_SECURE = False  # True in production
     JWT_COOKIE_CSRF_PROTECT = False  # True in production
+    # Authorization records ('redis' or 'memory'; memory is per worker, for
+    # local development and tests only) and seconds a record read from the
+    # users table is kept
+    AUTHZ_BACKEND = os.getenv('AUTHZ_BACKEND') or 'redis'
+    AUTHZ_CACHE_TTL = int(os.getenv('AUTHZ_CACHE_TTL', 60))
+    # Revoked tokens ('memory' or 'redis'; defaults to CACHE_BACKEND). The
+    # Bloom filter is sized for TOKEN_BLOCKLIST_CAPACITY revocations per
+    # refresh token lifetime; workers pull other workers' revocations every
+    # TOKEN_BLOCKLIST_SYNC_INTERVAL seconds
+    TOKEN_BLOCKLIST_BACKEND = os.getenv('TOKEN_BLOCKLIST_BACKEND')
+    TOKEN_BLOCKLIST_CAPACITY = int(os.getenv('TOKEN_BLOCKLIST_CAPACITY', 100000))
+    TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE = float(os.getenv('TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE', 0.001))
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = float(os.getenv('TOKEN_BLOCKLIST_SYNC_INTERVAL', 1))
+
+    # Password hashing: werkzeug method for new hashes (older hashes are
+    # upgraded at login), dedicated hashing threads, and how many requests
+    # may wait for one before login/register answer 503
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 32))
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', 1))
     
+    # Redis
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+    # Response cache ('memory' or 'redis')
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', 300))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    CATALOG_CACHE_TTL = int(os.getenv('CATALOG_CACHE_TTL', 600))
+    # Max age in seconds of per-worker catalog snapshots (category tree, facet
+    # counts); bounds staleness when the memory backend's version is per worker
+    CATALOG_SNAPSHOT_TTL = int(os.getenv('CATALOG_SNAPSHOT_TTL', 60))
+
+    # Guest carts ('redis' or 'memory'). Memory carts are per worker, so a
+    # guest loses their cart when a request reaches another worker: use it
+    # for local development and tests only
+    GUEST_CART_BACKEND = os.getenv('GUEST_CART_BACKEND') or 'redis'
+    GUEST_CART_TTL = int(os.getenv('GUEST_CART_TTL', 604800))  # 7 days of inactivity
+    GUEST_CART_SWEEP_DAYS = int(os.getenv('GUEST_CART_SWEEP_DAYS', 30))
+
+    # Write-behind for last_login / read_at: seconds between batched flushes
+    # (0 writes immediately) and pending rows that force an early flush
+    WRITE_BEHIND_INTERVAL = float(os.getenv('WRITE_BEHIND_INTERVAL', 5))
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', 500))
+
+    # Rate limits for public write endpoints, per blueprint or endpoint
+    # ('auth.login' overrides 'auth'): 'ip' and 'identity' (request email)
+    # buckets of N requests refilling over the period. Set
+    # RATE_LIMIT_PROXY_COUNT to the number of proxies in front of the app so
+    # the client IP is read from X-Forwarded-For.
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND')  # 'memory' or 'redis'; defaults to CACHE_BACKEND
+    RATE_LIMIT_PROXY_COUNT = int(os.getenv('RATE_LIMIT_PROXY_COUNT', 0))
+    RATE_LIMITS = {
+        'auth': {'ip': '20/minute', 'identity': '10/minute'},
+        'auth.register': {'ip': '5/hour'},
+        'contact': {'ip': '5/minute', 'identity': '5/hour'},
+        'newsletter': {'ip': '5/minute', 'identity': '3/hour'},
+        'newsletter.submit_contact': {'ip': '5/minute', 'identity': '5/hour'},  # Serves POST /contact
+    }
+
+    # Checkout: minutes an unpaid order holds its stock
+    STOCK_RESERVATION_MINUTES = int(os.getenv('STOCK_RESERVATION_MINUTES', 30))
+
     # CORS
     CORS_ORIGINS = [os.getenv('FRONTEND_URL', 'http://localhost:5173')]
     
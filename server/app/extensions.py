@@ -17,5 +17,26 @@ def init_extensions(app):
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+
+    from app.services.cache_service import cache
+    cache.init_app(app)
+
+    from app.services.guest_cart_service import guest_carts
+    guest_carts.init_app(app)
+
+    from app.services.password_service import passwords
+    passwords.init_app(app)
+
+    from app.services.write_behind_service import write_behind
+    write_behind.init_app(app)
+
+    from app.services.authz_service import authz_store
+    authz_store.init_app(app)
+
+    from app.services.token_blocklist_service import token_blocklist
+    token_blocklist.init_app(app)
+
+    from app.middleware.rate_limiter import rate_limiter
+    rate_limiter.init_app(app)
     
     return app
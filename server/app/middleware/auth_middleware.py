@@ -4,17 +4,16 @@ from functools import wraps
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 from flask import jsonify
 from app.models import User
+from app.services.authz_service import current_authz
 
 
 def admin_required(fn):
     """Decorator to require admin role"""
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()  # Authz store marker, users table when it is missing or differs
 
-        if not user or user.role != 'admin':
+        if not user or not user.is_active or user.role != 'admin':
             return jsonify({
                 'success': False,
                 'message': 'Admin access required'
@@ -28,11 +27,9 @@ def customer_only(fn):
     """Decorator to require customer role (not admin)"""
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()  # Authz store marker, users table when it is missing or differs
 
-        if not user or user.role != 'customer':
+        if not user or not user.is_active or user.role != 'customer':
             return jsonify({
                 'success': False,
                 'message': 'Customer access only'
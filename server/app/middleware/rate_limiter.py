@@ -0,0 +1,254 @@
+"""Rate limiting middleware - Token buckets for public write endpoints
+
+Each limited request takes one token from two buckets:
+    - per client IP
+    - per identity (e.g. the email in the request body), so one address
+      cannot be hammered from many IPs
+
+A bucket holds up to N tokens and refills at N per period ('5/minute').
+When either bucket is empty the request is answered 429 with Retry-After
+before the view runs, so throttled requests cost no DB work or email.
+
+Limits are configured per blueprint in RATE_LIMITS, and a single endpoint
+can override its blueprint:
+
+    RATE_LIMITS = {
+        'contact': {'ip': '5/minute', 'identity': '5/hour'},
+        'auth.login': {'ip': '20/minute', 'identity': '10/minute'},
+    }
+
+Buckets are shared by the endpoints of the matched scope.
+
+Backends (RATE_LIMIT_BACKEND, defaults to CACHE_BACKEND):
+    memory: In-process buckets, per worker (development and tests)
+    redis:  One hash per bucket, updated atomically by a Lua script using
+            the Redis server clock, shared by all workers
+
+Like the response cache, a Redis outage is logged and lets requests through.
+"""
+
+from functools import wraps
+from flask import jsonify, request
+import hashlib
+import math
+import threading
+import time
+
+PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+# KEYS[1] bucket; ARGV rate (tokens/s), capacity, cost
+# Returns {allowed (0/1), seconds until enough tokens (string)}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+
+def parse_limit(limit):
+    """
+    Parse '5/minute' into (capacity, tokens per second)
+
+    Raises:
+        ValueError: If the limit is malformed
+    """
+    count, _, period = limit.partition('/')
+    count = int(count)
+    if count <= 0 or period not in PERIODS:
+        raise ValueError(f"Invalid rate limit: {limit}")
+    return count, count / PERIODS[period]
+
+
+class MemoryBucketBackend:
+    """
+    Thread-safe in-process token buckets
+
+    A bucket that has refilled to capacity is the same as no bucket, so
+    full ones are swept at most once per sweep_interval seconds, like the
+    Redis keys' PEXPIRE.
+    """
+
+    def __init__(self, sweep_interval=60):
+        self.sweep_interval = sweep_interval
+        self._buckets = {}  # key -> (tokens, updated_at, full_at)
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def _sweep(self, now):
+        """Delete buckets that have refilled (caller holds the lock)"""
+        if now < self._next_sweep:
+            return
+        for key in [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+        self._next_sweep = now + self.sweep_interval
+
+    def take(self, key, rate, capacity, cost=1):
+        """
+        Take tokens from a bucket
+
+        Returns:
+            tuple: (allowed, seconds until enough tokens)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            tokens, updated_at, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            if allowed:
+                return True, 0
+            return False, (cost - tokens) / rate
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBucketBackend:
+    """Token buckets in Redis, shared by all workers"""
+
+    def __init__(self, url, prefix='hisi:ratelimit:'):
+        import redis
+
+        self._redis = redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def take(self, key, rate, capacity, cost=1):
+        try:
+            allowed, wait = self._script(keys=[self.prefix + key], args=[rate, capacity, cost])
+        except self._redis.RedisError as e:
+            print(f"Rate limit check failed: {str(e)}")
+            return True, 0
+        return bool(allowed), float(wait)
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self.client.delete(*keys)
+        except self._redis.RedisError as e:
+            print(f"Rate limit clear failed: {str(e)}")
+
+
+class RateLimiter:
+    """Per-IP and per-identity token buckets for configured scopes"""
+
+    def __init__(self):
+        self.backend = MemoryBucketBackend()
+        self.enabled = True
+        self.proxy_count = 0
+        self.limits = {}
+
+    def init_app(self, app):
+        """Select the backend from RATE_LIMIT_BACKEND and parse RATE_LIMITS"""
+        backend = app.config.get('RATE_LIMIT_BACKEND') or app.config.get('CACHE_BACKEND', 'memory')
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.proxy_count = app.config.get('RATE_LIMIT_PROXY_COUNT', 0)
+        self.limits = {
+            scope: {kind: parse_limit(limit) for kind, limit in limits.items()}
+            for scope, limits in app.config.get('RATE_LIMITS', {}).items()
+        }
+
+        if backend == 'redis':
+            self.backend = RedisBucketBackend(app.config['REDIS_URL'])
+        else:
+            self.backend = MemoryBucketBackend()
+
+        app.extensions['rate_limiter'] = self
+
+    def client_ip(self):
+        """Client address, read from X-Forwarded-For behind RATE_LIMIT_PROXY_COUNT proxies"""
+        route = request.access_route
+        if self.proxy_count and len(route) >= self.proxy_count:
+            return route[-self.proxy_count]
+        return request.remote_addr or 'unknown'
+
+    def check(self, identity=None):
+        """
+        Take a token from the current request's buckets
+
+        Returns:
+            float: Seconds to wait (Retry-After), or 0 if the request may proceed
+        """
+        scope = request.endpoint if request.endpoint in self.limits else request.blueprint
+        limits = self.limits.get(scope)
+        if not self.enabled or not limits:
+            return 0
+
+        buckets = []
+        if 'ip' in limits:
+            buckets.append((f'{scope}:ip:{self.client_ip()}', limits['ip']))
+        if identity and 'identity' in limits:
+            digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+            buckets.append((f'{scope}:id:{digest}', limits['identity']))
+
+        wait = 0
+        for key, (capacity, rate) in buckets:
+            allowed, bucket_wait = self.backend.take(key, rate, capacity)
+            if not allowed:
+                wait = max(wait, bucket_wait)
+        return wait
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limit(identity_field=None):
+    """
+    Decorator to apply the endpoint's RATE_LIMITS before the view runs
+
+    Args:
+        identity_field: JSON body field identifying the client beyond its IP
+            (e.g. 'email'); values are compared lower-cased
+
+    Usage: @rate_limit(identity_field='email')
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            identity = None
+            if identity_field:
+                data = request.get_json(silent=True)
+                if isinstance(data, dict) and isinstance(data.get(identity_field), str):
+                    identity = data[identity_field].strip().lower() or None
+
+            wait = rate_limiter.check(identity)
+            if wait:
+                return jsonify({
+                    'success': False,
+                    'message': 'Too many requests, please try again later'
+                }), 429, {'Retry-After': str(max(1, math.ceil(wait)))}
+
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,14 +1,16 @@
 """Models package"""
 
 from app.models.user import User
-from app.models.product import Product, Category
+from app.models.product import Product, Category, ProductAccessibilityFeature
 from app.models.order import Order, OrderItem
+from app.models.inventory import StockReservation
 from app.models.cart import Cart, CartItem
 from app.models.address import UserAddress
 from app.models.payment import Payment
+from app.models.analytics import DailySalesRollup, DailyProductSalesRollup
 from app.models.cms import Page, BlogPost, SiteSetting, NewsletterSubscriber, ContactMessage, Consultation, FAQ, Testimonial
 from app.models.admin import Notification, MediaFile, Message, ProductCollection
-from app.models.review import Review
+from app.models.review import Review, ProductRatingSummary
 from app.models.section_content import SectionContent
 from app.models.press import (
     PressHero, MediaCoverage, PressRelease, Exhibition,
@@ -19,12 +21,16 @@ __all__ = [
     "User",
     "Product",
     "Category",
+    "ProductAccessibilityFeature",
     "Order",
     "OrderItem",
+    "StockReservation",
     "Cart",
     "CartItem",
     "UserAddress",
     "Payment",
+    "DailySalesRollup",
+    "DailyProductSalesRollup",
     "Page",
     "BlogPost",
     "SiteSetting",
@@ -38,6 +44,7 @@ __all__ = [
     "Message",
     "ProductCollection",
     "Review",
+    "ProductRatingSummary",
     "SectionContent",
     "PressHero",
     "MediaCoverage",
@@ -0,0 +1,89 @@
+"""Analytics rollup models"""
+
+from app.extensions import db
+from datetime import datetime
+import uuid
+
+
+class DailySalesRollup(db.Model):
+    """
+    Order, customer and payment totals for one closed (UTC) day
+
+    Maintained by SalesRollupService; analytics read closed days from here
+    and only aggregate raw orders/payments for the current day.
+    """
+    __tablename__ = 'daily_sales_rollup'
+    __table_args__ = {'schema': 'hisi'}
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    day = db.Column(db.Date, nullable=False, unique=True)
+
+    # Orders (by order created_at)
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    gross_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # All orders
+    net_revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # Excluding cancelled orders
+
+    # Customers
+    new_customers = db.Column(db.Integer, nullable=False, default=0)
+    returning_customers = db.Column(db.Integer, nullable=False, default=0)  # More than one order that day
+
+    # Payments (by payment created_at)
+    payments = db.Column(db.Integer, nullable=False, default=0)
+    successful_payments = db.Column(db.Integer, nullable=False, default=0)
+    pending_payments = db.Column(db.Integer, nullable=False, default=0)
+    failed_payments = db.Column(db.Integer, nullable=False, default=0)
+    successful_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    refunded_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert rollup to dictionary"""
+        return {
+            'day': self.day,
+            'orders': self.orders,
+            'gross_revenue': self.gross_revenue,
+            'net_revenue': self.net_revenue,
+            'new_customers': self.new_customers,
+            'returning_customers': self.returning_customers,
+            'payments': self.payments,
+            'successful_payments': self.successful_payments,
+            'pending_payments': self.pending_payments,
+            'failed_payments': self.failed_payments,
+            'successful_amount': self.successful_amount,
+            'refunded_amount': self.refunded_amount,
+            'refreshed_at': self.refreshed_at
+        }
+
+    def __repr__(self):
+        return f"<DailySalesRollup {self.day}>"
+
+
+class DailyProductSalesRollup(db.Model):
+    """Units and revenue per product for one closed (UTC) day"""
+    __tablename__ = 'daily_product_sales_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'product_id', name='uq_daily_product_sales_rollup_day_product_id'),
+        {'schema': 'hisi'}
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    day = db.Column(db.Date, nullable=False)
+    product_id = db.Column(db.String(36), nullable=False)  # No FK: rollups outlive deleted products
+    product_name = db.Column(db.String(255), nullable=False)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert product rollup to dictionary"""
+        return {
+            'day': self.day,
+            'product_id': self.product_id,
+            'product_name': self.product_name,
+            'units': self.units,
+            'revenue': self.revenue
+        }
+
+    def __repr__(self):
+        return f"<DailyProductSalesRollup {self.day} {self.product_id}>"
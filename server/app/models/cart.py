@@ -1,6 +1,7 @@
 """Cart models"""
 
 from app.extensions import db
+from flask import g, has_app_context
 from datetime import datetime
 import uuid
 
@@ -19,13 +20,35 @@ class Cart(db.Model):
     user = db.relationship('User', backref='carts', lazy=True)
     items = db.relationship('CartItem', backref='cart', lazy=True, cascade='all, delete-orphan')
 
+    def get_totals(self):
+        """
+        (item_count, total) in one pass over the items
+
+        Memoized on flask.g for the rest of the request; CartService drops
+        the entry whenever it changes the cart's items.
+        """
+        memo = g.setdefault('cart_totals', {}) if has_app_context() else {}
+        if self.id not in memo:
+            items = self.items
+            memo[self.id] = (
+                sum(item.quantity for item in items),
+                sum(item.get_subtotal() for item in items)
+            )
+        return memo[self.id]
+
+    @staticmethod
+    def forget_totals(cart_id):
+        """Drop the memoized totals of a cart after its items change"""
+        if has_app_context():
+            g.setdefault('cart_totals', {}).pop(cart_id, None)
+
     def get_total(self):
         """Calculate cart total"""
-        return sum(item.get_subtotal() for item in self.items)
+        return self.get_totals()[1]
 
     def get_item_count(self):
         """Get total number of items"""
-        return sum(item.quantity for item in self.items)
+        return self.get_totals()[0]
 
     def to_dict(self, include_items=True):
         """Convert cart to dictionary"""
@@ -33,9 +56,9 @@ class Cart(db.Model):
             'id': self.id,
             'user_id': self.user_id,
             'item_count': self.get_item_count(),
-            'total': float(self.get_total()),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'total': self.get_total(),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
         if include_items:
@@ -50,7 +73,10 @@ class Cart(db.Model):
 class CartItem(db.Model):
     """Cart item model"""
     __tablename__ = 'cart_items'
-    __table_args__ = {'schema': 'hisi'}
+    __table_args__ = (
+        db.UniqueConstraint('cart_id', 'product_id', name='uq_cart_items_cart_id_product_id'),
+        {'schema': 'hisi'}
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     cart_id = db.Column(db.String(36), db.ForeignKey('hisi.carts.id'), nullable=False)
@@ -76,7 +102,7 @@ class CartItem(db.Model):
                 'name': self.product.name,
                 'slug': self.product.slug,
                 'main_image': self.product.main_image,
-                'current_price': float(self.product.price),
+                'current_price': self.product.price,
                 'stock_quantity': self.product.stock_quantity,
                 'accessibility_features': self.product.accessibility_features
             }
@@ -87,9 +113,9 @@ class CartItem(db.Model):
             'product_id': self.product_id,
             'product': product_data,
             'quantity': self.quantity,
-            'price': float(self.price_at_addition),
-            'subtotal': float(self.get_subtotal()),
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'price': self.price_at_addition,
+            'subtotal': self.get_subtotal(),
+            'created_at': self.created_at
         }
 
     def __repr__(self):
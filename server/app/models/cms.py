@@ -36,9 +36,9 @@ class Page(db.Model):
             'meta_title': self.meta_title,
             'meta_description': self.meta_description,
             'is_published': self.is_published,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'published_at': self.published_at.isoformat() if self.published_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'published_at': self.published_at
         }
 
     def __repr__(self):
@@ -91,9 +91,9 @@ class BlogPost(db.Model):
             'meta_title': self.meta_title,
             'meta_description': self.meta_description,
             'is_published': self.is_published,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'published_at': self.published_at.isoformat() if self.published_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'published_at': self.published_at
         }
 
         if include_content:
@@ -143,7 +143,7 @@ class SiteSetting(db.Model):
             'value': value,
             'type': self.setting_type,
             'description': self.description,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
@@ -153,7 +153,11 @@ class SiteSetting(db.Model):
 class NewsletterSubscriber(db.Model):
     """Newsletter subscriber model"""
     __tablename__ = 'newsletter_subscribers'
-    __table_args__ = {'schema': 'hisi'}
+    __table_args__ = (
+        # Keyset (cursor) pagination: seek to the row after the cursor
+        db.Index('ix_hisi_newsletter_subscribers_subscribed_at_id', 'subscribed_at', 'id'),
+        {'schema': 'hisi'}
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
@@ -167,8 +171,8 @@ class NewsletterSubscriber(db.Model):
             'id': self.id,
             'email': self.email,
             'is_subscribed': self.is_subscribed,
-            'subscribed_at': self.subscribed_at.isoformat() if self.subscribed_at else None,
-            'unsubscribed_at': self.unsubscribed_at.isoformat() if self.unsubscribed_at else None
+            'subscribed_at': self.subscribed_at,
+            'unsubscribed_at': self.unsubscribed_at
         }
 
     def __repr__(self):
@@ -228,8 +232,8 @@ class ContactMessage(db.Model):
             'status': self.status,
             'is_read': self.is_read,
             'admin_notes': self.admin_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'replied_at': self.replied_at.isoformat() if self.replied_at else None
+            'created_at': self.created_at,
+            'replied_at': self.replied_at
         }
 
     def __repr__(self):
@@ -277,14 +281,14 @@ class Consultation(db.Model):
             'phone': self.phone,
             'consultation_type': self.consultation_type,
             'meeting_type': self.meeting_type,
-            'preferred_date': self.preferred_date.isoformat() if self.preferred_date else None,
+            'preferred_date': self.preferred_date,
             'preferred_time': self.preferred_time,
             'status': self.status,
             'notes': self.notes,
             'admin_notes': self.admin_notes,
             'confirmation_sent': self.confirmation_sent,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
@@ -319,8 +323,8 @@ class FAQ(db.Model):
             'answer': self.answer,
             'display_order': self.display_order,
             'is_published': self.is_published,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
@@ -362,8 +366,8 @@ class Testimonial(db.Model):
             'is_featured': self.is_featured,
             'display_order': self.display_order,
             'is_published': self.is_published,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
@@ -0,0 +1,51 @@
+"""Inventory models"""
+
+from app.extensions import db
+from datetime import datetime
+import uuid
+
+
+class StockReservation(db.Model):
+    """
+    Stock held for an order
+
+    Stock is taken from products.stock_quantity when the reservation is
+    created. It is returned when the reservation is released (order
+    cancelled, payment failed) or expires unpaid.
+    """
+    __tablename__ = 'stock_reservations'
+    __table_args__ = (
+        db.Index('ix_hisi_stock_reservations_status_expires_at', 'status', 'expires_at'),
+        {'schema': 'hisi'}
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    order_id = db.Column(db.String(36), db.ForeignKey('hisi.orders.id', ondelete='CASCADE'), nullable=False, index=True)
+    product_id = db.Column(db.String(36), db.ForeignKey('hisi.products.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+
+    status = db.Column(db.String(20), nullable=False, default='active')
+    # Status options: 'active', 'committed', 'released', 'expired'
+
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    released_at = db.Column(db.DateTime, nullable=True)
+
+    # Relationships
+    order = db.relationship('Order', backref=db.backref('stock_reservations', lazy=True, passive_deletes=True))
+
+    def to_dict(self):
+        """Convert reservation to dictionary"""
+        return {
+            'id': self.id,
+            'order_id': self.order_id,
+            'product_id': self.product_id,
+            'quantity': self.quantity,
+            'status': self.status,
+            'expires_at': self.expires_at,
+            'created_at': self.created_at,
+            'released_at': self.released_at
+        }
+
+    def __repr__(self):
+        return f"<StockReservation {self.product_id} x{self.quantity} ({self.status})>"
@@ -4,18 +4,36 @@ from app.extensions import db
 from datetime import datetime
 import uuid
 
+
+# Source of order numbers; nextval() never hands out the same value twice,
+# across workers and hosts, and does not roll back with the transaction
+order_number_seq = db.Sequence('order_number_seq', schema='hisi', metadata=db.metadata)
+
+
 class Order(db.Model):
     """Order model"""
     __tablename__ = 'orders'
-    __table_args__ = {'schema': 'hisi'}
+    __table_args__ = (
+        # Admin list filters, newest first
+        db.Index('ix_hisi_orders_status_created_at', 'status', 'created_at'),
+        db.Index('ix_hisi_orders_payment_status_created_at', 'payment_status', 'created_at'),
+        # Keyset (cursor) pagination: seek to the row after the cursor
+        db.Index('ix_hisi_orders_created_at_id', 'created_at', 'id'),
+        {'schema': 'hisi'}
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     order_number = db.Column(db.String(50), unique=True, nullable=False, index=True)
     user_id = db.Column(db.String(36), db.ForeignKey('hisi.users.id'), nullable=False)
 
+    # Customer details (snapshot at time of order, searched by the admin list)
+    customer_email = db.Column(db.String(255), nullable=True)
+    customer_name = db.Column(db.String(200), nullable=True)
+
     # Order status
     status = db.Column(db.String(20), nullable=False, default='pending')
-    # Status options: 'pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled', 'refunded'
+    # Status options: 'pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled', 'refunded',
+    # 'on_hold' (paid after its stock reservation lapsed and stock ran out; needs an admin)
 
     # Payment
     payment_status = db.Column(db.String(20), nullable=False, default='pending')
@@ -60,26 +78,28 @@ class Order(db.Model):
             'id': self.id,
             'order_number': self.order_number,
             'user_id': self.user_id,
+            'customer_email': self.customer_email,
+            'customer_name': self.customer_name,
             'status': self.status,
             'payment_status': self.payment_status,
             'payment_method': self.payment_method,
             'payment_reference': self.payment_reference,
-            'subtotal': float(self.subtotal),
-            'shipping_cost': float(self.shipping_cost),
-            'tax': float(self.tax),
-            'discount': float(self.discount),
-            'total': float(self.total),
+            'subtotal': self.subtotal,
+            'shipping_cost': self.shipping_cost,
+            'tax': self.tax,
+            'discount': self.discount,
+            'total': self.total,
             'currency': self.currency,
             'shipping_address': self.shipping_address,
             'billing_address': self.billing_address,
             'shipping_method': self.shipping_method,
             'tracking_number': self.tracking_number,
             'customer_notes': self.customer_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'confirmed_at': self.confirmed_at.isoformat() if self.confirmed_at else None,
-            'shipped_at': self.shipped_at.isoformat() if self.shipped_at else None,
-            'delivered_at': self.delivered_at.isoformat() if self.delivered_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'confirmed_at': self.confirmed_at,
+            'shipped_at': self.shipped_at,
+            'delivered_at': self.delivered_at
         }
 
         if include_items:
@@ -128,11 +148,11 @@ class OrderItem(db.Model):
             'product_name': self.product_name,
             'product_sku': self.product_sku,
             'product_image': self.product_image,
-            'unit_price': float(self.unit_price),
+            'unit_price': self.unit_price,
             'quantity': self.quantity,
-            'subtotal': float(self.subtotal),
+            'subtotal': self.subtotal,
             'variant': self.variant,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
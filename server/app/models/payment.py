@@ -7,7 +7,11 @@ import uuid
 class Payment(db.Model):
     """Payment model for order payments"""
     __tablename__ = 'payments'
-    __table_args__ = {'schema': 'hisi'}
+    __table_args__ = (
+        # Keyset (cursor) pagination: seek to the row after the cursor
+        db.Index('ix_hisi_payments_created_at_id', 'created_at', 'id'),
+        {'schema': 'hisi'}
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     order_id = db.Column(db.String(36), db.ForeignKey('hisi.orders.id'), nullable=False, unique=True)
@@ -48,7 +52,7 @@ class Payment(db.Model):
             'order_id': self.order_id,
             'transaction_id': self.transaction_id,
             'flutterwave_transaction_id': self.flutterwave_transaction_id,
-            'amount': float(self.amount),
+            'amount': self.amount,
             'currency': self.currency,
             'payment_method': self.payment_method,
             'status': self.status,
@@ -56,9 +60,9 @@ class Payment(db.Model):
             'customer_phone': self.customer_phone,
             'customer_name': self.customer_name,
             'failure_reason': self.failure_reason,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'completed_at': self.completed_at
         }
 
     def __repr__(self):
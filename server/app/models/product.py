@@ -7,7 +7,11 @@ import uuid
 class Product(db.Model):
     """Product model for Hisi Studio products"""
     __tablename__ = 'products'
-    __table_args__ = {'schema': 'hisi'}
+    __table_args__ = (
+        # Keyset (cursor) pagination: seek to the row after the cursor
+        db.Index('ix_hisi_products_created_at_id', 'created_at', 'id'),
+        {'schema': 'hisi'}
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(255), nullable=False)
@@ -54,49 +58,56 @@ class Product(db.Model):
 
     # Relationships
     category = db.relationship('Category', backref='products', lazy=True)
+    # Indexed copy of accessibility_features, kept in sync on assignment
+    accessibility_feature_rows = db.relationship(
+        'ProductAccessibilityFeature', backref='product', lazy=True, cascade='all, delete-orphan'
+    )
 
     def to_dict(self):
-        """Convert product to dictionary"""
-        discount = None
-        if self.original_price and self.original_price > self.price:
-            discount = round(((float(self.original_price) - float(self.price)) / float(self.original_price)) * 100)
+        """Convert product to dictionary (the serializer's 'detail' projection)"""
+        from app.serializers.product import PRODUCT_PROJECTIONS, serialize_product
 
-        return {
-            'id': self.id,
-            'name': self.name,
-            'slug': self.slug,
-            'description': self.description,
-            'short_description': self.short_description,
-            'price': float(self.price),
-            'original_price': float(self.original_price) if self.original_price else None,
-            'discount_percentage': discount,
-            'currency': self.currency,
-            'sku': self.sku,
-            'stock_quantity': self.stock_quantity,
-            'in_stock': self.stock_quantity > 0,
-            'low_stock': self.stock_quantity <= self.low_stock_threshold and self.stock_quantity > 0,
-            'category_id': self.category_id,
-            'brand': self.brand,
-            'gender': self.gender,
-            'accessibility_features': self.accessibility_features,
-            'images': {
-                'main': self.main_image,
-                'hover': self.hover_image,
-                'gallery': self.images or []
-            },
-            'badge': self.badge,
-            'is_featured': self.is_featured,
-            'is_active': self.is_active,
-            'meta_title': self.meta_title,
-            'meta_description': self.meta_description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return serialize_product(self, PRODUCT_PROJECTIONS['detail'])
 
     def __repr__(self):
         return f"<Product {self.name}>"
 
 
+class ProductAccessibilityFeature(db.Model):
+    """One row per product accessibility feature, for indexed filtering"""
+    __tablename__ = 'product_accessibility_features'
+    __table_args__ = (
+        db.Index('ix_hisi_product_accessibility_features_feature_product', 'feature', 'product_id'),
+        {'schema': 'hisi'}
+    )
+
+    product_id = db.Column(db.String(36), db.ForeignKey('hisi.products.id', ondelete='CASCADE'), primary_key=True)
+    feature = db.Column(db.String(255), primary_key=True)
+
+    def __repr__(self):
+        return f"<ProductAccessibilityFeature {self.product_id} {self.feature}>"
+
+
+def normalize_accessibility_features(features):
+    """Trimmed, de-duplicated feature names in their original order"""
+    if not isinstance(features, list):
+        return []
+    cleaned = (str(feature).strip() for feature in features if feature is not None)
+    return list(dict.fromkeys(feature for feature in cleaned if feature))
+
+
+@db.event.listens_for(Product.accessibility_features, 'set')
+def _sync_accessibility_feature_rows(target, value, oldvalue, initiator):
+    """Mirror the JSON list into product_accessibility_features"""
+    wanted = normalize_accessibility_features(value)
+    existing = {row.feature: row for row in target.accessibility_feature_rows}
+    # Reuse surviving rows so the unit of work never re-inserts a primary key
+    target.accessibility_feature_rows = [
+        existing.get(feature) or ProductAccessibilityFeature(feature=feature)
+        for feature in wanted
+    ]
+
+
 class Category(db.Model):
     """Product category model"""
     __tablename__ = 'categories'
@@ -127,7 +138,7 @@ class Category(db.Model):
             'parent_id': self.parent_id,
             'is_active': self.is_active,
             'display_order': self.display_order,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
     def __repr__(self):
@@ -8,7 +8,11 @@ import uuid
 class Review(db.Model):
     """Customer review model - User-submitted reviews (separate from admin-curated testimonials)"""
     __tablename__ = 'reviews'
-    __table_args__ = {'schema': 'hisi'}
+    __table_args__ = (
+        # Keyset (cursor) pagination: seek to the row after the cursor
+        db.Index('ix_hisi_reviews_created_at_id', 'created_at', 'id'),
+        {'schema': 'hisi'}
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('hisi.users.id'), nullable=False)
@@ -43,7 +47,7 @@ class Review(db.Model):
             'is_approved': self.is_approved,
             'is_featured': self.is_featured,
             'product_id': self.product_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
         }
         
         if include_user and self.user:
@@ -63,3 +67,47 @@ class Review(db.Model):
 
     def __repr__(self):
         return f"<Review by {self.user_id} - {self.rating} stars>"
+
+
+class ProductRatingSummary(db.Model):
+    """
+    Running totals of approved review ratings
+
+    One row per product, plus a site-wide row with product_id NULL covering
+    every approved review. Maintained by ReviewService when a review's
+    approval changes; rebuilt with 'flask rebuild-rating-summaries'.
+    """
+    __tablename__ = 'product_rating_summary'
+    __table_args__ = (
+        # The unique constraint on product_id treats NULLs as distinct, so
+        # the site-wide row gets its own partial index: at most one row
+        db.Index(
+            'uq_product_rating_summary_site_row', db.text('(product_id IS NULL)'), unique=True,
+            postgresql_where=db.text('product_id IS NULL'), sqlite_where=db.text('product_id IS NULL')
+        ),
+        {'schema': 'hisi'}
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    product_id = db.Column(
+        db.String(36), db.ForeignKey('hisi.products.id', ondelete='CASCADE'), nullable=True, unique=True
+    )
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    star_1 = db.Column(db.Integer, nullable=False, default=0)
+    star_2 = db.Column(db.Integer, nullable=False, default=0)
+    star_3 = db.Column(db.Integer, nullable=False, default=0)
+    star_4 = db.Column(db.Integer, nullable=False, default=0)
+    star_5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        """Convert summary to the /reviews/stats payload"""
+        return {
+            'total_reviews': self.review_count,
+            'average_rating': round(self.rating_sum / self.review_count, 1) if self.review_count else 0,
+            'rating_distribution': {i: getattr(self, f'star_{i}') for i in range(1, 6)}
+        }
+
+    def __repr__(self):
+        return f"<ProductRatingSummary {self.product_id or 'site'} {self.review_count}>"
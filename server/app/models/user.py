@@ -1,4 +1,5 @@
 from app.extensions import db
+from flask import current_app
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
@@ -23,11 +24,13 @@ class User(db.Model):
     last_login = db.Column(db.DateTime, nullable=True)
 
     def set_password(self, password):
-        """Hash and set password"""
-        self.password_hash =generate_password_hash(password)
+        """Hash and set password (inline; request handlers use the passwords service)"""
+        self.password_hash = generate_password_hash(
+            password, method=current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+        )
 
     def check_password(self, password):
-        """Check if password matches hash"""
+        """Check if password matches hash (inline; request handlers use the passwords service)"""
         return check_password_hash(self.password_hash, password)
     
     def is_admin(self):
@@ -59,9 +62,9 @@ class User(db.Model):
             'permissions': self.permissions,
             'is_verified': self.is_verified,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'last_login': self.last_login
         }
     
     def __repr__(self):
@@ -1,13 +1,17 @@
 """Admin routes - Dashboard, Analytics, Management"""
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import User, Order, Product, ContactMessage, Notification
 from app.utils.admin_decorators import admin_required, super_admin_required, permission_required, PERMISSIONS
 from app.utils.responses import success_response, error_response, forbidden_response
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.analytics_service import AnalyticsService
+from app.services.authz_service import current_authz
+from app.services.write_behind_service import write_behind
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import and_, or_
 import json
 import uuid
 
@@ -48,8 +52,7 @@ def verify_admin():
 def get_dashboard_overview():
     """Get dashboard overview with key metrics"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         # Date range filter
         date_filter = request.args.get('period', 'today')  # today, week, month, quarter, year
@@ -57,31 +60,11 @@ def get_dashboard_overview():
         
         # Super admin sees all data, content manager sees limited data
         if user.is_super_admin():
-            # Total revenue
-            total_revenue = db.session.query(func.sum(Order.total)).filter(
-                and_(
-                    Order.created_at >= start_date,
-                    Order.created_at <= end_date,
-                    Order.status != 'cancelled'
-                )
-            ).scalar() or 0
-            
-            # Total orders
-            total_orders = Order.query.filter(
-                and_(
-                    Order.created_at >= start_date,
-                    Order.created_at <= end_date
-                )
-            ).count()
-            
-            # New customers
-            new_customers = User.query.filter(
-                and_(
-                    User.role == 'customer',
-                    User.created_at >= start_date,
-                    User.created_at <= end_date
-                )
-            ).count()
+            # Orders, revenue and new customers (closed days from the daily rollup)
+            totals = AnalyticsService.order_totals(start_date, end_date)
+            total_revenue = totals['net_revenue']
+            total_orders = totals['orders']
+            new_customers = totals['new_customers']
             
             # Pending orders
             pending_orders = Order.query.filter(
@@ -178,9 +161,12 @@ def mark_notification_read(notification_id):
         if not notification:
             return error_response("Notification not found", status_code=404)
         
-        notification.is_read = True
-        notification.read_at = datetime.utcnow()
-        db.session.commit()
+        # is_read drives unread counts, so it is written now; only the
+        # bookkeeping timestamp of the first read is batched
+        if not notification.is_read:
+            notification.is_read = True
+            db.session.commit()
+            write_behind.defer(notification, read_at=datetime.utcnow())
         
         return success_response(data=notification.to_dict())
         
@@ -537,104 +523,16 @@ def get_analytics():
         period = request.args.get('period', 'month')
         start_date, end_date = get_date_range(period)
         
-        # Sales data over time
-        sales_data = []
-        if period in ['today', 'week']:
-            # Hourly data
-            for i in range(24):
-                hour_start = start_date.replace(hour=i)
-                hour_end = hour_start.replace(hour=i+1) if i < 23 else end_date
-                
-                orders = Order.query.filter(
-                    and_(Order.created_at >= hour_start, Order.created_at < hour_end)
-                ).all()
-                
-                sales_data.append({
-                    'date': f"{i:02d}:00",
-                    'revenue': sum(o.total for o in orders),
-                    'orders': len(orders)
-                })
-        else:
-            # Daily data
-            current = start_date
-            while current <= end_date:
-                next_day = current + timedelta(days=1)
-                
-                orders = Order.query.filter(
-                    and_(Order.created_at >= current, Order.created_at < next_day)
-                ).all()
-                
-                sales_data.append({
-                    'date': current.strftime('%m/%d'),
-                    'revenue': sum(o.total for o in orders),
-                    'orders': len(orders)
-                })
-                
-                current = next_day
-        
-        # Customer data
-        customer_data = []
-        current = start_date
-        while current <= end_date:
-            next_day = current + timedelta(days=1)
-            
-            new_customers = User.query.filter(
-                and_(
-                    User.created_at >= current,
-                    User.created_at < next_day,
-                    User.role == 'customer'
-                )
-            ).count()
-            
-            # Returning customers (those who made multiple orders)
-            returning = db.session.query(Order.user_id).filter(
-                and_(Order.created_at >= current, Order.created_at < next_day)
-            ).group_by(Order.user_id).having(func.count(Order.id) > 1).count()
-            
-            customer_data.append({
-                'date': current.strftime('%m/%d'),
-                'new': new_customers,
-                'returning': returning
-            })
-            
-            current = next_day
-        
-        # Product performance
-        from sqlalchemy import desc
-        product_sales = db.session.query(
-            Product.name,
-            func.sum(Order.total).label('revenue'),
-            func.count(Order.id).label('units')
-        ).join(Order).filter(
-            and_(Order.created_at >= start_date, Order.created_at <= end_date)
-        ).group_by(Product.name).order_by(desc('revenue')).limit(5).all()
-        
-        product_data = []
-        for product in product_sales:
-            product_data.append({
-                'name': product.name,
-                'value': float(product.revenue or 0),
-                'units': product.units,
-                'avgPrice': float(product.revenue / product.units) if product.units > 0 else 0,
-                'growth': 0  # Calculate growth vs previous period
-            })
+        # One grouped query per series, whatever the period length
+        unit = 'hour' if period == 'today' else 'day'
+        sales_data = AnalyticsService.sales_series(start_date, end_date, unit)
+        customer_data = AnalyticsService.customer_series(start_date, end_date, unit)
+        product_data = AnalyticsService.top_products(start_date, end_date)
         
         # Summary metrics
-        total_orders = Order.query.filter(
-            and_(Order.created_at >= start_date, Order.created_at <= end_date)
-        ).count()
-        
-        total_revenue = db.session.query(func.sum(Order.total)).filter(
-            and_(Order.created_at >= start_date, Order.created_at <= end_date)
-        ).scalar() or 0
-        
-        new_customers_count = User.query.filter(
-            and_(
-                User.created_at >= start_date,
-                User.created_at <= end_date,
-                User.role == 'customer'
-            )
-        ).count()
+        total_orders = sum(point['orders'] for point in sales_data)
+        total_revenue = sum(point['revenue'] for point in sales_data)
+        new_customers_count = sum(point['new'] for point in customer_data)
         
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
         
@@ -669,36 +567,10 @@ def export_analytics():
         
         start_date, end_date = get_date_range(period)
         
-        # Get orders for the period
-        orders = Order.query.filter(
-            and_(Order.created_at >= start_date, Order.created_at <= end_date)
-        ).all()
-        
-        if format_type == 'csv':
-            import csv
-            from io import StringIO
-            
-            output = StringIO()
-            writer = csv.writer(output)
-            
-            # Write headers
-            writer.writerow(['Order ID', 'Date', 'Customer', 'Total', 'Status'])
-            
-            # Write data
-            for order in orders:
-                writer.writerow([
-                    order.id,
-                    order.created_at.strftime('%Y-%m-%d %H:%M'),
-                    f"{order.user.first_name} {order.user.last_name}" if order.user else 'N/A',
-                    order.total,
-                    order.status
-                ])
-            
-            from flask import make_response
-            response = make_response(output.getvalue())
-            response.headers['Content-Type'] = 'text/csv'
-            response.headers['Content-Disposition'] = f'attachment; filename=analytics-{period}.csv'
-            return response
+        if format_type in EXPORT_FORMATS:
+            # Orders for the period, streamed row batch by row batch
+            columns = ExportService.resolve_columns('orders', 'id,created_at,customer,total,status')
+            return export_response('orders', columns, format_type, f'analytics-{period}', start_date, end_date)
         
         else:  # PDF
             # For PDF, you would use a library like reportlab
@@ -707,3 +579,36 @@ def export_analytics():
         
     except Exception as e:
         return error_response(str(e), status_code=500)
+
+
+@bp.route('/export/<dataset>', methods=['GET'])
+@super_admin_required
+def export_dataset(dataset):
+    """Stream a dataset (orders, payments, customers, newsletter_subscribers) as CSV or NDJSON"""
+    try:
+        format_type = request.args.get('format', 'csv')
+        if format_type not in EXPORT_FORMATS:
+            return error_response(f"Unknown format. Must be one of: {', '.join(EXPORT_FORMATS)}", status_code=400)
+        
+        try:
+            columns = ExportService.resolve_columns(dataset, request.args.get('columns'))
+        except ValueError as e:
+            return error_response(str(e), status_code=400)
+        
+        # Whole dataset unless a period is given
+        period = request.args.get('period')
+        start_date, end_date = get_date_range(period) if period else (None, None)
+        
+        return export_response(dataset, columns, format_type, dataset, start_date, end_date)
+        
+    except Exception as e:
+        return error_response(str(e), status_code=500)
+
+
+def export_response(dataset, columns, format_type, filename, start_date=None, end_date=None):
+    """Streaming attachment response for an export"""
+    extension = 'csv' if format_type == 'csv' else 'ndjson'
+    rows = ExportService.stream(dataset, columns, format_type, start_date, end_date)
+    response = Response(stream_with_context(rows), mimetype=EXPORT_FORMATS[format_type])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{extension}'
+    return response
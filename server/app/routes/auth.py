@@ -3,16 +3,29 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import (
     create_access_token, create_refresh_token,
-    jwt_required, get_jwt_identity
+    jwt_required, get_jwt_identity, get_jwt, decode_token
 )
 from app.extensions import db
 from app.models import User
+from app.services.authz_service import AuthzService
+from app.services.password_service import passwords, PasswordHasherBusy
+from app.services.write_behind_service import write_behind
+from app.services.token_blocklist_service import token_blocklist
+from app.middleware.rate_limiter import rate_limit
 from datetime import datetime
 
 bp = Blueprint('auth', __name__, url_prefix='/api/v1/auth')
 
 
+def hasher_busy_response(error):
+    """503 for a full password hashing queue"""
+    return jsonify({'error': 'Too many sign-in requests, please try again shortly'}), 503, {
+        'Retry-After': str(error.retry_after)
+    }
+
+
 @bp.route('/register', methods=['POST'])
+@rate_limit(identity_field='email')
 def register():
     """Register a new user"""
     try:
@@ -36,13 +49,13 @@ def register():
             phone=data.get('phone'),
             role='customer'
         )
-        user.set_password(data['password'])
+        user.password_hash = passwords.hash(data['password'])
 
         db.session.add(user)
         db.session.commit()
 
         # Generate tokens
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=AuthzService.claims_for(user))
         refresh_token = create_refresh_token(identity=user.id)
 
         return jsonify({
@@ -52,12 +65,15 @@ def register():
             'refresh_token': refresh_token
         }), 201
 
+    except PasswordHasherBusy as e:
+        return hasher_busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 @bp.route('/login', methods=['POST'])
+@rate_limit(identity_field='email')
 def login():
     """Login user"""
     try:
@@ -69,19 +85,27 @@ def login():
 
         # Find user
         user = User.query.filter_by(email=data['email'].lower()).first()
-        if not user or not user.check_password(data['password']):
+        if not user:
+            return jsonify({'error': 'Invalid email or password'}), 401
+
+        matches, new_hash = passwords.verify(user.password_hash, data['password'])
+        if not matches:
             return jsonify({'error': 'Invalid email or password'}), 401
 
         # Check if user is active
         if not user.is_active:
             return jsonify({'error': 'Account is deactivated'}), 403
 
-        # Update last login
-        user.last_login = datetime.utcnow()
-        db.session.commit()
+        # Upgrade a hash made with outdated parameters
+        if new_hash:
+            user.password_hash = new_hash
+            db.session.commit()
+
+        # Update last login (batched)
+        write_behind.defer(user, last_login=datetime.utcnow())
 
         # Generate tokens
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=AuthzService.claims_for(user))
         refresh_token = create_refresh_token(identity=user.id)
 
         return jsonify({
@@ -91,6 +115,8 @@ def login():
             'refresh_token': refresh_token
         }), 200
 
+    except PasswordHasherBusy as e:
+        return hasher_busy_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -101,7 +127,15 @@ def refresh():
     """Refresh access token"""
     try:
         user_id = get_jwt_identity()
-        access_token = create_access_token(identity=user_id)
+
+        # Fresh role and permissions claims from the users table
+        record = AuthzService.load(user_id)
+        if record is None:
+            return jsonify({'error': 'User not found'}), 404
+        if not record['active']:
+            return jsonify({'error': 'Account is deactivated'}), 403
+
+        access_token = create_access_token(identity=user_id, additional_claims=AuthzService.claims_for(record=record))
 
         return jsonify({
             'access_token': access_token
@@ -111,6 +145,33 @@ def refresh():
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the presented token, and the refresh token in the body if given"""
+    try:
+        data = request.get_json(silent=True) or {}
+        refresh_token = None
+        if data.get('refresh_token'):
+            try:
+                refresh_token = decode_token(data['refresh_token'])
+            except Exception:
+                return jsonify({'error': 'Invalid refresh token'}), 400
+            if refresh_token.get('type') != 'refresh' or refresh_token['sub'] != get_jwt_identity():
+                return jsonify({'error': 'Invalid refresh token'}), 400
+
+        token_blocklist.revoke(get_jwt())
+        if refresh_token:
+            token_blocklist.revoke(refresh_token)
+
+        return jsonify({
+            'message': 'Logged out successfully'
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
@@ -179,17 +240,21 @@ def change_password():
             return jsonify({'error': 'Current and new password are required'}), 400
 
         # Verify current password
-        if not user.check_password(data['current_password']):
+        matches, _ = passwords.verify(user.password_hash, data['current_password'])
+        if not matches:
             return jsonify({'error': 'Current password is incorrect'}), 401
 
         # Update password
-        user.set_password(data['new_password'])
+        user.password_hash = passwords.hash(data['new_password'])
         db.session.commit()
 
         return jsonify({
             'message': 'Password changed successfully'
         }), 200
 
+    except PasswordHasherBusy as e:
+        db.session.rollback()
+        return hasher_busy_response(e)
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -1,10 +1,11 @@
 """Cart routes"""
 
 from flask import Blueprint, request, jsonify, session
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt, verify_jwt_in_request
 from app.extensions import db
-from app.models import Cart, CartItem
+from app.models import CartItem
 from app.services.cart_service import CartService
+from app.services.guest_cart_service import GuestCartService, GuestCartUnavailable
 from app.utils.responses import success_response, error_response, created_response
 
 bp = Blueprint('cart', __name__, url_prefix='/api/v1/cart')
@@ -13,14 +14,19 @@ bp = Blueprint('cart', __name__, url_prefix='/api/v1/cart')
 def get_cart_identifier():
     """Get cart identifier (user_id or session_id)"""
     try:
+        verify_jwt_in_request(optional=True)
         user_id = get_jwt_identity()
+    except Exception:
+        user_id = None
+
+    if user_id:
         return {'user_id': user_id}, None
-    except:
-        # Guest user - use session
-        if 'cart_session_id' not in session:
-            import uuid
-            session['cart_session_id'] = str(uuid.uuid4())
-        return {'session_id': session['cart_session_id']}, None
+
+    # Guest user - use session
+    if 'cart_session_id' not in session:
+        import uuid
+        session['cart_session_id'] = str(uuid.uuid4())
+    return {'session_id': session['cart_session_id']}, None
 
 
 @bp.route('', methods=['GET'])
@@ -31,11 +37,17 @@ def get_cart():
         if error:
             return error_response(error, status_code=400)
 
+        # Guest carts are read from the guest cart store without touching SQL
+        if 'session_id' in cart_id:
+            return success_response(data=GuestCartService.to_dict(cart_id['session_id']))
+
         cart = CartService.get_or_create_cart(**cart_id)
         if not cart:
             return error_response("Unable to get cart", status_code=500)
 
         return success_response(data=cart.to_dict())
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -63,6 +75,12 @@ def add_to_cart():
         if error:
             return error_response(error, status_code=400)
 
+        if 'session_id' in cart_id:
+            _, error = GuestCartService.add_to_cart(cart_id['session_id'], product_id, quantity)
+            if error:
+                return error_response(error, status_code=400)
+            return created_response(data=GuestCartService.to_dict(cart_id['session_id']), message="Item added to cart")
+
         cart = CartService.get_or_create_cart(**cart_id)
 
         # Add to cart
@@ -71,8 +89,10 @@ def add_to_cart():
             return error_response(error, status_code=400)
 
         # Return updated cart
-        cart = Cart.query.get(cart.id)  # Refresh
+        cart = CartService.load_cart(cart_id=cart.id)
         return created_response(data=cart.to_dict(), message="Item added to cart")
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -92,13 +112,25 @@ def update_cart_item(item_id):
         except ValueError:
             return error_response("Invalid quantity", status_code=400)
 
+        cart_id, error = get_cart_identifier()
+        if error:
+            return error_response(error, status_code=400)
+
+        if 'session_id' in cart_id:
+            _, error = GuestCartService.update_cart_item(cart_id['session_id'], item_id, quantity)
+            if error:
+                return error_response(error, status_code=400)
+            return success_response(data=GuestCartService.to_dict(cart_id['session_id']), message="Cart updated")
+
         cart_item, error = CartService.update_cart_item(item_id, quantity)
         if error:
             return error_response(error, status_code=400)
 
         # Return updated cart
-        cart = Cart.query.get(cart_item.cart_id)
+        cart = CartService.load_cart(cart_id=cart_item.cart_id)
         return success_response(data=cart.to_dict(), message="Cart updated")
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -107,6 +139,16 @@ def update_cart_item(item_id):
 def remove_from_cart(item_id):
     """Remove item from cart"""
     try:
+        cart_id, error = get_cart_identifier()
+        if error:
+            return error_response(error, status_code=400)
+
+        if 'session_id' in cart_id:
+            _, error = GuestCartService.remove_from_cart(cart_id['session_id'], item_id)
+            if error:
+                return error_response(error, status_code=404)
+            return success_response(data=GuestCartService.to_dict(cart_id['session_id']), message="Item removed from cart")
+
         cart_item = CartItem.query.get(item_id)
         if not cart_item:
             return error_response("Cart item not found", status_code=404)
@@ -117,8 +159,10 @@ def remove_from_cart(item_id):
             return error_response(error, status_code=400)
 
         # Return updated cart
-        cart = Cart.query.get(cart_id)
+        cart = CartService.load_cart(cart_id=cart_id)
         return success_response(data=cart.to_dict() if cart else None, message="Item removed from cart")
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -131,12 +175,18 @@ def clear_cart():
         if error:
             return error_response(error, status_code=400)
 
+        if 'session_id' in cart_id:
+            GuestCartService.clear_cart(cart_id['session_id'])
+            return success_response(message="Cart cleared")
+
         cart = CartService.get_or_create_cart(**cart_id)
         success, error = CartService.clear_cart(cart.id)
         if error:
             return error_response(error, status_code=400)
 
         return success_response(message="Cart cleared")
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -162,6 +212,8 @@ def merge_carts():
         # Return merged cart
         cart = CartService.get_or_create_cart(user_id=user_id)
         return success_response(data=cart.to_dict(), message="Carts merged successfully")
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -174,12 +226,19 @@ def validate_cart():
         if error:
             return error_response(error, status_code=400)
 
-        cart = CartService.get_or_create_cart(**cart_id)
-        valid, errors = CartService.validate_cart_stock(cart)
+        if 'session_id' in cart_id:
+            valid, errors = GuestCartService.validate_cart_stock(cart_id['session_id'])
+            cart_data = GuestCartService.to_dict(cart_id['session_id'])
+        else:
+            cart = CartService.get_or_create_cart(**cart_id)
+            valid, errors = CartService.validate_cart_stock(cart)
+            cart_data = cart.to_dict()
 
         if not valid:
             return error_response("Cart validation failed", errors=errors, status_code=400)
 
-        return success_response(message="Cart is valid", data=cart.to_dict())
+        return success_response(message="Cart is valid", data=cart_data)
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
@@ -3,11 +3,12 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.models import Page, BlogPost, SiteSetting, User
+from app.models import Page, BlogPost, SiteSetting
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response, paginated_response
 )
+from app.services.authz_service import current_authz
 from datetime import datetime
 
 bp = Blueprint('cms', __name__, url_prefix='/api/v1')
@@ -42,8 +43,7 @@ def get_page(slug):
 def admin_get_pages():
     """Get all pages (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -58,8 +58,7 @@ def admin_get_pages():
 def admin_create_page():
     """Create page (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -98,8 +97,7 @@ def admin_create_page():
 def admin_update_page(page_id):
     """Update page (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -138,8 +136,7 @@ def admin_update_page(page_id):
 def admin_delete_page(page_id):
     """Delete page (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -196,7 +193,7 @@ def admin_create_blog_post():
     """Create blog post (admin)"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -237,8 +234,7 @@ def admin_create_blog_post():
 def admin_update_blog_post(post_id):
     """Update blog post (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -272,8 +268,7 @@ def admin_update_blog_post(post_id):
 def admin_delete_blog_post(post_id):
     """Delete blog post (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -307,8 +302,7 @@ def get_settings():
 def admin_get_settings():
     """Get all settings (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
@@ -323,8 +317,7 @@ def admin_get_settings():
 def admin_update_settings():
     """Update settings (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if not user.is_admin():
             return forbidden_response("Admin access required")
 
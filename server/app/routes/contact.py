@@ -1,14 +1,16 @@
 """Contact routes - Contact forms, Consultations, FAQs, Testimonials"""
 
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.extensions import db
-from app.models import ContactMessage, Consultation, FAQ, Testimonial, User, Order, SiteSetting
+from app.models import ContactMessage, Consultation, FAQ, Testimonial, Order, SiteSetting
 from app.services.email_service import email_service
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response
 )
+from app.services.authz_service import current_authz
+from app.middleware.rate_limiter import rate_limit
 from datetime import datetime
 from sqlalchemy import func
 import re
@@ -95,8 +97,7 @@ def admin_update_contact_info():
     try:
         import json
         
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -156,6 +157,7 @@ def validate_phone(phone):
 # ========== CONTACT MESSAGES ==========
 
 @bp.route('/contact', methods=['POST'])
+@rate_limit(identity_field='email')
 def submit_contact_form():
     """Submit contact form (public)"""
     try:
@@ -236,8 +238,7 @@ def submit_contact_form():
 def admin_get_contact_messages():
     """Get all contact messages (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -266,8 +267,7 @@ def admin_get_contact_messages():
 def admin_get_contact_message(message_id):
     """Get specific contact message (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -286,8 +286,7 @@ def admin_get_contact_message(message_id):
 def admin_update_contact_message(message_id):
     """Update contact message status/notes (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -321,8 +320,7 @@ def admin_update_contact_message(message_id):
 def admin_delete_contact_message(message_id):
     """Delete contact message (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -343,6 +341,7 @@ def admin_delete_contact_message(message_id):
 # ========== CONSULTATIONS ==========
 
 @bp.route('/consultations', methods=['POST'])
+@rate_limit(identity_field='email')
 def book_consultation():
     """Book a consultation (public)"""
     try:
@@ -428,8 +427,7 @@ def book_consultation():
 def admin_get_consultations():
     """Get all consultations (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -455,8 +453,7 @@ def admin_get_consultations():
 def admin_update_consultation(consultation_id):
     """Update consultation status (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -486,8 +483,7 @@ def admin_update_consultation(consultation_id):
 def admin_delete_consultation(consultation_id):
     """Delete/cancel consultation (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -531,8 +527,7 @@ def get_faqs():
 def admin_get_faqs():
     """Get all FAQs (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -549,8 +544,7 @@ def admin_get_faqs():
 def admin_create_faq():
     """Create FAQ (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -582,8 +576,7 @@ def admin_create_faq():
 def admin_update_faq(faq_id):
     """Update FAQ (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -619,8 +612,7 @@ def admin_update_faq(faq_id):
 def admin_delete_faq(faq_id):
     """Delete FAQ (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -664,8 +656,7 @@ def get_testimonials():
 def admin_get_testimonials():
     """Get all testimonials (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -682,8 +673,7 @@ def admin_get_testimonials():
 def admin_create_testimonial():
     """Create testimonial (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -719,8 +709,7 @@ def admin_create_testimonial():
 def admin_update_testimonial(testimonial_id):
     """Update testimonial (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -752,8 +741,7 @@ def admin_update_testimonial(testimonial_id):
 def admin_delete_testimonial(testimonial_id):
     """Delete testimonial (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
         
@@ -1,14 +1,17 @@
 """Newsletter routes"""
 
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.extensions import db
-from app.models import NewsletterSubscriber, ContactMessage, User
+from app.models import NewsletterSubscriber, ContactMessage
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response, paginated_response
 )
 from app.utils.validators import validate_email
+from app.utils.pagination import keyset_paginate
+from app.services.authz_service import current_authz
+from app.middleware.rate_limiter import rate_limit
 from datetime import datetime
 
 bp = Blueprint('newsletter', __name__, url_prefix='/api/v1')
@@ -17,6 +20,7 @@ bp = Blueprint('newsletter', __name__, url_prefix='/api/v1')
 # ========== NEWSLETTER ==========
 
 @bp.route('/newsletter/subscribe', methods=['POST'])
+@rate_limit(identity_field='email')
 def subscribe_newsletter():
     """Subscribe to newsletter"""
     try:
@@ -82,8 +86,7 @@ def unsubscribe_newsletter():
 def admin_get_subscribers():
     """Get all newsletter subscribers (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
 
@@ -98,6 +101,25 @@ def admin_get_subscribers():
         elif status == 'unsubscribed':
             query = query.filter_by(is_subscribed=False)
 
+        cursor = request.args.get('cursor')  # Presence selects cursor pagination
+        if cursor is not None:
+            try:
+                keyset = keyset_paginate(
+                    query, NewsletterSubscriber, cursor, per_page,
+                    sort_column=NewsletterSubscriber.subscribed_at
+                )
+            except ValueError as e:
+                return error_response(str(e), status_code=400)
+
+            return paginated_response(
+                items=[sub.to_dict() for sub in keyset.items],
+                page=None,
+                per_page=per_page,
+                total=None,
+                next_cursor=keyset.next_cursor,
+                prev_cursor=keyset.prev_cursor
+            )
+
         query = query.order_by(NewsletterSubscriber.subscribed_at.desc())
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
@@ -114,6 +136,7 @@ def admin_get_subscribers():
 # ========== CONTACT ==========
 
 @bp.route('/contact', methods=['POST'])
+@rate_limit(identity_field='email')
 def submit_contact():
     """Submit contact form"""
     try:
@@ -156,8 +179,7 @@ def submit_contact():
 def admin_get_messages():
     """Get all contact messages (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
 
@@ -190,8 +212,7 @@ def admin_get_messages():
 def admin_get_message(message_id):
     """Get specific contact message (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
 
@@ -209,8 +230,7 @@ def admin_get_message(message_id):
 def admin_mark_message_read(message_id):
     """Mark message as read (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
 
@@ -218,8 +238,9 @@ def admin_mark_message_read(message_id):
         if not message:
             return not_found_response("Message not found")
 
-        message.is_read = True
-        db.session.commit()
+        if not message.is_read:
+            message.is_read = True
+            db.session.commit()
 
         return success_response(
             data=message.to_dict(),
@@ -235,8 +256,7 @@ def admin_mark_message_read(message_id):
 def admin_delete_message(message_id):
     """Delete contact message (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         if user.role != 'admin':
             return forbidden_response("Admin access required")
 
@@ -1,15 +1,19 @@
 """Order routes"""
 
-from flask import Blueprint, request
+from flask import Blueprint, request, session
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models import Order, User, Cart, UserAddress
 from app.services.order_service import OrderService
 from app.services.cart_service import CartService
+from app.services.guest_cart_service import GuestCartUnavailable
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response, paginated_response
 )
+from app.utils.pagination import keyset_paginate
+from app.serializers import resolve_order_view, order_load_options, serialize_order
+from app.services.authz_service import current_authz
 
 bp = Blueprint('orders', __name__, url_prefix='/api/v1/orders')
 
@@ -50,6 +54,11 @@ def create_order():
         else:
             billing_address = shipping_address
 
+        # Bring in anything added to the guest cart before signing in
+        if 'cart_session_id' in session:
+            CartService.merge_guest_cart_to_user(session['cart_session_id'], user_id)
+            session.pop('cart_session_id', None)
+
         # Get user's cart
         cart = CartService.get_or_create_cart(user_id=user_id)
         if not cart or not cart.items:
@@ -76,6 +85,8 @@ def create_order():
             data=order.to_dict(include_items=True),
             message="Order created successfully"
         )
+    except GuestCartUnavailable as e:
+        return error_response(str(e), status_code=503)
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -119,7 +130,7 @@ def get_order(order_id):
     """Get order details"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
 
         order = Order.query.get(order_id)
         if not order:
@@ -170,8 +181,7 @@ def cancel_order(order_id):
 def admin_get_orders():
     """Get all orders (admin only)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
 
         if user.role != 'admin':
             return forbidden_response("Admin access required")
@@ -183,9 +193,14 @@ def admin_get_orders():
         # Filters
         status = request.args.get('status')
         payment_status = request.args.get('payment_status')
-        search = request.args.get('search')  # Search by order number or customer email
+        search = request.args.get('search')  # Order number, customer email or name
+
+        try:
+            view = resolve_order_view(request.args.get('view'))  # 'table' or 'detail'
+        except ValueError as e:
+            return error_response(str(e), status_code=400)
 
-        query = Order.query
+        query = Order.query.options(*order_load_options(view))
 
         if status:
             query = query.filter_by(status=status)
@@ -194,18 +209,38 @@ def admin_get_orders():
             query = query.filter_by(payment_status=payment_status)
 
         if search:
-            query = query.join(User).filter(
+            # Trigram indexes serve these substring matches without a users join
+            pattern = f'%{search}%'
+            query = query.filter(
                 db.or_(
-                    Order.order_number.ilike(f'%{search}%'),
-                    User.email.ilike(f'%{search}%')
+                    Order.order_number.ilike(pattern),
+                    Order.customer_email.ilike(pattern),
+                    Order.customer_name.ilike(pattern)
                 )
             )
 
+        cursor = request.args.get('cursor')  # Presence selects cursor pagination
+        if cursor is not None:
+            try:
+                keyset = keyset_paginate(query, Order, cursor, per_page)
+            except ValueError as e:
+                return error_response(str(e), status_code=400)
+
+            return paginated_response(
+                items=[serialize_order(order, view) for order in keyset.items],
+                page=None,
+                per_page=per_page,
+                total=None,
+                message="Orders retrieved successfully",
+                next_cursor=keyset.next_cursor,
+                prev_cursor=keyset.prev_cursor
+            )
+
         query = query.order_by(Order.created_at.desc())
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
         return paginated_response(
-            items=[order.to_dict(include_items=True) for order in pagination.items],
+            items=[serialize_order(order, view) for order in pagination.items],
             page=page,
             per_page=per_page,
             total=pagination.total,
@@ -220,8 +255,7 @@ def admin_get_orders():
 def admin_update_order_status(order_id):
     """Update order status (admin only)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
 
         if user.role != 'admin':
             return forbidden_response("Admin access required")
@@ -250,8 +284,7 @@ def admin_update_order_status(order_id):
 def admin_add_tracking(order_id):
     """Add tracking number (admin only)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
 
         if user.role != 'admin':
             return forbidden_response("Admin access required")
@@ -2,11 +2,12 @@
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.extensions import db
 from app.models import Order, Payment
 from app.services.payment_service import PaymentService
+from app.services.analytics_service import AnalyticsService
 from app.middleware.auth_middleware import admin_required
 from app.utils.responses import success_response, error_response, created_response
+from app.utils.pagination import keyset_paginate
 from functools import wraps
 
 bp = Blueprint('payments', __name__, url_prefix='/api/v1/payments')
@@ -272,6 +273,25 @@ def admin_list_payments(current_user):
         if order_id:
             query = query.filter_by(order_id=order_id)
 
+        # Cursor mode: no OFFSET and no COUNT(*)
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            try:
+                keyset = keyset_paginate(query, Payment, cursor, per_page)
+            except ValueError as e:
+                return error_response(str(e), status_code=400)
+
+            return success_response(data={
+                'payments': [payment.to_dict() for payment in keyset.items],
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': keyset.next_cursor,
+                    'prev_cursor': keyset.prev_cursor,
+                    'has_next': keyset.next_cursor is not None,
+                    'has_prev': keyset.prev_cursor is not None
+                }
+            })
+
         # Order by created date (newest first)
         query = query.order_by(Payment.created_at.desc())
 
@@ -385,29 +405,14 @@ def admin_payment_stats(current_user):
     GET /api/v1/payments/admin/stats
     """
     try:
-        from sqlalchemy import func
-
-        # Total payments
-        total_payments = Payment.query.count()
-
-        # Successful payments
-        successful_payments = Payment.query.filter_by(status='successful').count()
-
-        # Total revenue
-        total_revenue = db.session.query(func.sum(Payment.amount)).filter_by(
-            status='successful'
-        ).scalar() or 0
-
-        # Pending payments
-        pending_payments = Payment.query.filter_by(status='pending').count()
-
-        # Failed payments
-        failed_payments = Payment.query.filter_by(status='failed').count()
-
-        # Refunded amount
-        refunded_amount = db.session.query(func.sum(Payment.amount)).filter_by(
-            status='refunded'
-        ).scalar() or 0
+        # Closed days come from the daily rollup, today from the payments table
+        totals = AnalyticsService.payment_totals()
+        total_payments = totals['payments']
+        successful_payments = totals['successful_payments']
+        pending_payments = totals['pending_payments']
+        failed_payments = totals['failed_payments']
+        total_revenue = totals['successful_amount']
+        refunded_amount = totals['refunded_amount']
 
         stats = {
             'total_payments': total_payments,
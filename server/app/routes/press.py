@@ -1,16 +1,17 @@
 """Press API routes - Public and Admin endpoints for Press page content"""
 
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.extensions import db
 from app.models import (
-    User, PressHero, MediaCoverage, PressRelease, Exhibition,
+    PressHero, MediaCoverage, PressRelease, Exhibition,
     SpeakingEngagement, Collaboration, MediaKitItem, MediaKitConfig, PressContact
 )
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response
 )
+from app.services.authz_service import current_authz
 from datetime import datetime
 import json
 import uuid
@@ -22,8 +23,7 @@ bp = Blueprint('press', __name__, url_prefix='/api/v1')
 
 def verify_admin_access():
     """Verify current user has admin access"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_authz()
     if not user or not user.is_admin():
         return None
     return user
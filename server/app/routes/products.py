@@ -3,13 +3,30 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.models import Product, Category, User
+from app.models import Product, Category, ProductAccessibilityFeature, Review, User
 from app.utils.admin_decorators import admin_required
+from app.services.search_service import SearchService
+from app.services.cache_service import cache, catalog_cached
+from app.services.category_service import CategoryService
+from app.services.facet_service import FacetService
+from app.services.review_service import ReviewService, PRODUCT_BUNDLE_NAMESPACE
+from app.utils.pagination import keyset_paginate
+from app.serializers import (
+    PRODUCT_PROJECTIONS, resolve_product_fields, product_load_options, serialize_product
+)
+from sqlalchemy.orm import joinedload
 
 bp = Blueprint('products', __name__, url_prefix='/api/v1/products')
 
+# Product page bundle sizes
+BUNDLE_REVIEWS_PER_PAGE = 10
+BUNDLE_RELATED_LIMIT = 8
+
 
 @bp.route('', methods=['GET'])
+@catalog_cached('products', defaults={
+    'page': '1', 'per_page': '12', 'sort_by': 'created_at', 'sort_order': 'desc'
+})
 def get_products():
     """Get all products with optional filtering"""
     try:
@@ -21,28 +38,38 @@ def get_products():
         search = request.args.get('search', type=str)
         min_price = request.args.get('min_price', type=float)
         max_price = request.args.get('max_price', type=float)
-        sort_by = request.args.get('sort_by', 'created_at', type=str)
+        gender = request.args.get('gender', type=str)
+        brand = request.args.get('brand', type=str)
+        badge = request.args.get('badge', type=str)
+        accessibility = request.args.get('accessibility', type=str)  # Comma-separated, all must match
+        include_facets = request.args.get('facets', 'false').lower() == 'true'
+        sort_by = request.args.get('sort_by', 'created_at', type=str)  # created_at, price, name, relevance
         sort_order = request.args.get('sort_order', 'desc', type=str)
+        cursor = request.args.get('cursor', type=str)  # Presence selects cursor pagination
+
+        try:
+            field_names = resolve_product_fields(request.args.get('view'), request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if cursor is not None and sort_by != 'created_at':
+            return jsonify({'error': 'Cursor pagination only supports sort_by=created_at'}), 400
 
-        # Build query
-        query = Product.query.filter_by(is_active=True)
+        # Build query (only the columns the requested fields need)
+        query = Product.query.filter_by(is_active=True).options(product_load_options(field_names))
 
         # Apply filters
         if category:
-            cat = Category.query.filter_by(slug=category).first()
-            if cat:
-                query = query.filter_by(category_id=cat.id)
+            # Matches the category and every subcategory beneath it
+            category_ids = CategoryService.get_descendant_ids(category)
+            if category_ids:
+                query = query.filter(Product.category_id.in_(category_ids))
 
         if featured == 'true':
             query = query.filter_by(is_featured=True)
 
         if search:
-            query = query.filter(
-                db.or_(
-                    Product.name.ilike(f'%{search}%'),
-                    Product.description.ilike(f'%{search}%')
-                )
-            )
+            query = SearchService.apply_search(query, search, rank=(sort_by == 'relevance'))
 
         if min_price is not None:
             query = query.filter(Product.price >= min_price)
@@ -50,8 +77,39 @@ def get_products():
         if max_price is not None:
             query = query.filter(Product.price <= max_price)
 
+        if gender:
+            query = query.filter_by(gender=gender)
+
+        if brand:
+            query = query.filter_by(brand=brand)
+
+        if badge:
+            query = query.filter_by(badge=badge)
+
+        if accessibility:
+            features = list(dict.fromkeys(f.strip() for f in accessibility.split(',') if f.strip()))
+            if features:
+                # Served by the (feature, product_id) index on the join table
+                matching = db.select(ProductAccessibilityFeature.product_id).where(
+                    ProductAccessibilityFeature.feature.in_(features)
+                ).group_by(ProductAccessibilityFeature.product_id).having(
+                    db.func.count() == len(features)
+                )
+                query = query.filter(Product.id.in_(matching))
+
+        facets = None
+        if include_facets:
+            filtered = any([category, featured == 'true', search, min_price is not None,
+                            max_price is not None, gender, brand, badge, accessibility])
+            product_ids = None
+            if filtered:
+                product_ids = [row.id for row in query.order_by(None).with_entities(Product.id)]
+            facets = FacetService.compute(product_ids)
+
         # Apply sorting
-        if sort_by == 'price':
+        if sort_by == 'relevance' and search:
+            pass  # Ordered by search rank
+        elif sort_by == 'price':
             if sort_order == 'asc':
                 query = query.order_by(Product.price.asc())
             else:
@@ -67,11 +125,34 @@ def get_products():
             else:
                 query = query.order_by(Product.created_at.desc())
 
+        if cursor is not None:
+            try:
+                keyset = keyset_paginate(
+                    query, Product, cursor, per_page,
+                    descending=(sort_order != 'asc')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+
+            result = {
+                'products': [serialize_product(product, field_names) for product in keyset.items],
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': keyset.next_cursor,
+                    'prev_cursor': keyset.prev_cursor,
+                    'has_next': keyset.next_cursor is not None,
+                    'has_prev': keyset.prev_cursor is not None
+                }
+            }
+            if facets is not None:
+                result['facets'] = facets
+            return jsonify(result), 200
+
         # Paginate
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
 
-        return jsonify({
-            'products': [product.to_dict() for product in pagination.items],
+        result = {
+            'products': [serialize_product(product, field_names) for product in pagination.items],
             'pagination': {
                 'page': pagination.page,
                 'per_page': pagination.per_page,
@@ -80,7 +161,10 @@ def get_products():
                 'has_next': pagination.has_next,
                 'has_prev': pagination.has_prev
             }
-        }), 200
+        }
+        if facets is not None:
+            result['facets'] = facets
+        return jsonify(result), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -90,13 +174,20 @@ def get_products():
 def get_product(product_id):
     """Get a single product by ID"""
     try:
-        product = Product.query.filter_by(id=product_id, is_active=True).first()
+        try:
+            field_names = resolve_product_fields(request.args.get('view'), request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        product = Product.query.filter_by(id=product_id, is_active=True).options(
+            product_load_options(field_names)
+        ).first()
 
         if not product:
             return jsonify({'error': 'Product not found'}), 404
 
         return jsonify({
-            'product': product.to_dict()
+            'product': serialize_product(product, field_names)
         }), 200
 
     except Exception as e:
@@ -107,13 +198,74 @@ def get_product(product_id):
 def get_product_by_slug(slug):
     """Get a single product by slug"""
     try:
-        product = Product.query.filter_by(slug=slug, is_active=True).first()
+        try:
+            field_names = resolve_product_fields(request.args.get('view'), request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        product = Product.query.filter_by(slug=slug, is_active=True).options(
+            product_load_options(field_names)
+        ).first()
 
         if not product:
             return jsonify({'error': 'Product not found'}), 404
 
         return jsonify({
-            'product': product.to_dict()
+            'product': serialize_product(product, field_names)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/<product_id>/bundle', methods=['GET'])
+@catalog_cached(PRODUCT_BUNDLE_NAMESPACE, vary_on_query=False)
+def get_product_bundle(product_id):
+    """
+    Everything the product page needs in one request
+
+    Returns the product, its rating summary, the first page of approved
+    reviews and active products from the same category. Cached per product;
+    product edits and review moderation invalidate the entry.
+    """
+    try:
+        detail_fields = PRODUCT_PROJECTIONS['detail']
+        product = Product.query.filter_by(id=product_id, is_active=True).options(
+            product_load_options(detail_fields)
+        ).first()
+
+        if not product:
+            return jsonify({'error': 'Product not found'}), 404
+
+        rating_summary = ReviewService.get_rating_summary(product.id)
+
+        reviews = Review.query.filter_by(product_id=product.id, is_approved=True).options(
+            joinedload(Review.user)
+        ).order_by(Review.created_at.desc()).limit(BUNDLE_REVIEWS_PER_PAGE).all()
+
+        related = []
+        if product.category_id:
+            card_fields = PRODUCT_PROJECTIONS['card']
+            related = Product.query.filter(
+                Product.category_id == product.category_id,
+                Product.is_active == True,
+                Product.id != product.id
+            ).options(
+                product_load_options(card_fields)
+            ).order_by(
+                Product.is_featured.desc(), Product.created_at.desc()
+            ).limit(BUNDLE_RELATED_LIMIT).all()
+            related = [serialize_product(p, card_fields) for p in related]
+
+        return jsonify({
+            'product': serialize_product(product, detail_fields),
+            'rating_summary': rating_summary,
+            'reviews': {
+                'items': [review.to_dict() for review in reviews],
+                'per_page': BUNDLE_REVIEWS_PER_PAGE,
+                'total': rating_summary['total_reviews']
+            },
+            'related_products': related
         }), 200
 
     except Exception as e:
@@ -161,6 +313,8 @@ def create_product():
 
         db.session.add(product)
         db.session.commit()
+        SearchService.on_product_saved(product)
+        cache.bump_catalog_version()
 
         return jsonify({
             'message': 'Product created successfully',
@@ -197,6 +351,8 @@ def update_product(product_id):
                 setattr(product, field, data[field])
 
         db.session.commit()
+        SearchService.on_product_saved(product)
+        cache.bump_catalog_version()
 
         return jsonify({
             'message': 'Product updated successfully',
@@ -219,6 +375,8 @@ def delete_product(product_id):
 
         db.session.delete(product)
         db.session.commit()
+        SearchService.on_product_deleted(product_id)
+        cache.bump_catalog_version()
 
         return jsonify({
             'message': 'Product deleted successfully'
@@ -242,3 +400,16 @@ def get_categories():
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/categories/tree', methods=['GET'])
+@catalog_cached('categories_tree')
+def get_category_tree():
+    """Get active categories as a nested tree"""
+    try:
+        return jsonify({
+            'categories': CategoryService.get_tree().to_list()
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -3,11 +3,14 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, jwt_required
 from app.extensions import db
-from app.models import Review, User, Product
+from app.models import Review, Product
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response, paginated_response
 )
+from app.utils.pagination import keyset_paginate
+from app.services.review_service import ReviewService
+from app.services.authz_service import current_authz
 from datetime import datetime
 
 bp = Blueprint('reviews', __name__, url_prefix='/api/v1')
@@ -32,6 +35,22 @@ def get_reviews():
         if featured_only:
             query = query.filter_by(is_featured=True)
         
+        cursor = request.args.get('cursor')  # Presence selects cursor pagination
+        if cursor is not None:
+            try:
+                keyset = keyset_paginate(query, Review, cursor, per_page)
+            except ValueError as e:
+                return error_response(str(e), status_code=400)
+            
+            return paginated_response(
+                items=[review.to_dict() for review in keyset.items],
+                page=None,
+                per_page=per_page,
+                total=None,
+                next_cursor=keyset.next_cursor,
+                prev_cursor=keyset.prev_cursor
+            )
+        
         query = query.order_by(Review.created_at.desc())
         pagination = query.paginate(page=page, per_page=per_page, error_out=False)
         
@@ -51,30 +70,7 @@ def get_reviews_stats():
     try:
         product_id = request.args.get('product_id')
         
-        query = Review.query.filter_by(is_approved=True)
-        
-        if product_id:
-            query = query.filter_by(product_id=product_id)
-        
-        reviews = query.all()
-        total = len(reviews)
-        
-        if total == 0:
-            return success_response(data={
-                'total_reviews': 0,
-                'average_rating': 0,
-                'rating_distribution': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-            })
-        
-        ratings = [r.rating for r in reviews]
-        avg_rating = sum(ratings) / total
-        distribution = {i: ratings.count(i) for i in range(1, 6)}
-        
-        return success_response(data={
-            'total_reviews': total,
-            'average_rating': round(avg_rating, 1),
-            'rating_distribution': distribution
-        })
+        return success_response(data=ReviewService.get_rating_summary(product_id))
     except Exception as e:
         return error_response(str(e), status_code=500)
 
@@ -87,7 +83,7 @@ def create_review():
     """Create a new review (authenticated users only)"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user:
             return forbidden_response("User not found")
@@ -138,8 +134,7 @@ def create_review():
 def admin_get_reviews():
     """Get all reviews (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -173,8 +168,7 @@ def admin_get_reviews():
 def admin_update_review(review_id):
     """Update/moderate a review (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -187,9 +181,12 @@ def admin_update_review(review_id):
         
         # Update moderation fields
         if 'is_approved' in data:
-            review.is_approved = data['is_approved']
+            was_approved = review.is_approved
+            review.is_approved = bool(data['is_approved'])
             if review.is_approved and not review.approved_at:
                 review.approved_at = datetime.utcnow()
+            if review.is_approved != was_approved:
+                ReviewService.record_approval_change(review, review.is_approved)
         
         if 'is_featured' in data:
             review.is_featured = data['is_featured']
@@ -198,6 +195,7 @@ def admin_update_review(review_id):
             review.admin_notes = data['admin_notes']
         
         db.session.commit()
+        ReviewService.invalidate_product(review.product_id)
         
         return success_response(data=review.to_dict(), message="Review updated successfully")
     except Exception as e:
@@ -210,8 +208,7 @@ def admin_update_review(review_id):
 def admin_delete_review(review_id):
     """Delete a review (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -220,8 +217,12 @@ def admin_delete_review(review_id):
         if not review:
             return not_found_response("Review not found")
         
+        product_id = review.product_id
+        if review.is_approved:
+            ReviewService.record_approval_change(review, False)
         db.session.delete(review)
         db.session.commit()
+        ReviewService.invalidate_product(product_id)
         
         return success_response(message="Review deleted successfully")
     except Exception as e:
@@ -3,11 +3,12 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.models import SectionContent, User
+from app.models import SectionContent
 from app.utils.responses import (
     success_response, error_response, created_response,
     not_found_response, forbidden_response
 )
+from app.services.authz_service import current_authz
 import json
 
 bp = Blueprint('section_content', __name__, url_prefix='/api/v1')
@@ -59,8 +60,7 @@ def get_section_content(page_name, section_name):
 def admin_get_all_sections():
     """Get all section content (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -102,8 +102,7 @@ def admin_get_all_sections():
 def admin_get_available_pages():
     """Get list of available pages and sections (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -139,7 +138,7 @@ def admin_create_section_content():
     """Create section content (admin)"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -196,7 +195,7 @@ def admin_update_section_content(content_id):
     """Update section content (admin)"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -241,8 +240,7 @@ def admin_update_section_content(content_id):
 def admin_delete_section_content(content_id):
     """Delete section content (admin)"""
     try:
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
@@ -266,7 +264,7 @@ def admin_bulk_update_section_content():
     """Bulk update section content (admin)"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user or not user.is_admin():
             return forbidden_response("Admin access required")
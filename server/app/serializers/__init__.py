@@ -0,0 +1,19 @@
+"""Serializers package - Named projections for API payloads"""
+
+from app.serializers.product import (
+    PRODUCT_PROJECTIONS, resolve_product_fields, product_load_options, serialize_product
+)
+from app.serializers.order import (
+    ORDER_PROJECTIONS, resolve_order_view, order_load_options, serialize_order
+)
+
+__all__ = [
+    "PRODUCT_PROJECTIONS",
+    "resolve_product_fields",
+    "product_load_options",
+    "serialize_product",
+    "ORDER_PROJECTIONS",
+    "resolve_order_view",
+    "order_load_options",
+    "serialize_order"
+]
@@ -0,0 +1,77 @@
+"""Order serializer - Projections for admin order listings
+
+Like the product serializer, each output field declares the Order columns
+it reads. Fields built from order items also set the items relationship,
+which is then prefetched with one selectinload() query per page instead of
+one lazy load per order.
+"""
+
+from app.models import Order, OrderItem
+from sqlalchemy.orm import load_only, selectinload
+
+
+# Output field -> (columns read, needs items, getter)
+ORDER_FIELDS = {
+    'id': (('id',), False, lambda o: o.id),
+    'order_number': (('order_number',), False, lambda o: o.order_number),
+    'user_id': (('user_id',), False, lambda o: o.user_id),
+    'customer_email': (('customer_email',), False, lambda o: o.customer_email),
+    'customer_name': (('customer_name',), False, lambda o: o.customer_name),
+    'status': (('status',), False, lambda o: o.status),
+    'payment_status': (('payment_status',), False, lambda o: o.payment_status),
+    'payment_method': (('payment_method',), False, lambda o: o.payment_method),
+    'total': (('total',), False, lambda o: o.total),
+    'currency': (('currency',), False, lambda o: o.currency),
+    'item_count': ((), True, lambda o: sum(item.quantity for item in o.items)),
+    'created_at': (('created_at',), False, lambda o: o.created_at),
+}
+
+ORDER_PROJECTIONS = {
+    # Admin order table: one row per order, no addresses or line details
+    'table': [
+        'id', 'order_number', 'customer_email', 'customer_name', 'status',
+        'payment_status', 'total', 'currency', 'item_count', 'created_at'
+    ],
+    # Order.to_dict(include_items=True)
+    'detail': None,
+}
+
+
+def resolve_order_view(view=None):
+    """
+    Validate an order view name, default 'detail'
+
+    Raises:
+        ValueError: On an unknown view
+    """
+    view = view or 'detail'
+    if view not in ORDER_PROJECTIONS:
+        raise ValueError(f"Unknown view. Must be one of: {', '.join(ORDER_PROJECTIONS)}")
+    return view
+
+
+def order_load_options(view):
+    """Loader options for an Order query serialized with view"""
+    field_names = ORDER_PROJECTIONS[view]
+    if field_names is None:
+        return [selectinload(Order.items)]
+
+    columns = dict.fromkeys(('id', 'created_at'))  # Identity and keyset key
+    needs_items = False
+    for name in field_names:
+        field_columns, field_needs_items, _ = ORDER_FIELDS[name]
+        columns.update(dict.fromkeys(field_columns))
+        needs_items = needs_items or field_needs_items
+
+    options = [load_only(*(getattr(Order, column) for column in columns))]
+    if needs_items:
+        options.append(selectinload(Order.items).load_only(OrderItem.order_id, OrderItem.quantity))
+    return options
+
+
+def serialize_order(order, view):
+    """Serialize an order with the named view"""
+    field_names = ORDER_PROJECTIONS[view]
+    if field_names is None:
+        return order.to_dict(include_items=True)
+    return {name: ORDER_FIELDS[name][2](order) for name in field_names}
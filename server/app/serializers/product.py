@@ -0,0 +1,108 @@
+"""Product serializer - Projections and field selection for Product payloads
+
+Each output field declares the columns it reads, so a projection can be
+loaded with load_only() and only those columns leave the database.
+"""
+
+from app.models import Product
+from sqlalchemy.orm import load_only
+
+
+def _discount(product):
+    if product.original_price and product.original_price > product.price:
+        return round(((float(product.original_price) - float(product.price)) / float(product.original_price)) * 100)
+    return None
+
+
+# Output field -> (columns read, getter)
+PRODUCT_FIELDS = {
+    'id': (('id',), lambda p: p.id),
+    'name': (('name',), lambda p: p.name),
+    'slug': (('slug',), lambda p: p.slug),
+    'description': (('description',), lambda p: p.description),
+    'short_description': (('short_description',), lambda p: p.short_description),
+    'price': (('price',), lambda p: p.price),
+    'original_price': (('original_price',), lambda p: p.original_price or None),  # 0 means no original price
+    'discount_percentage': (('price', 'original_price'), _discount),
+    'currency': (('currency',), lambda p: p.currency),
+    'sku': (('sku',), lambda p: p.sku),
+    'stock_quantity': (('stock_quantity',), lambda p: p.stock_quantity),
+    'low_stock_threshold': (('low_stock_threshold',), lambda p: p.low_stock_threshold),
+    'in_stock': (('stock_quantity',), lambda p: p.stock_quantity > 0),
+    'low_stock': (
+        ('stock_quantity', 'low_stock_threshold'),
+        lambda p: p.stock_quantity <= p.low_stock_threshold and p.stock_quantity > 0
+    ),
+    'category_id': (('category_id',), lambda p: p.category_id),
+    'brand': (('brand',), lambda p: p.brand),
+    'gender': (('gender',), lambda p: p.gender),
+    'accessibility_features': (('accessibility_features',), lambda p: p.accessibility_features),
+    'images': (
+        ('main_image', 'hover_image', 'images'),
+        lambda p: {'main': p.main_image, 'hover': p.hover_image, 'gallery': p.images or []}
+    ),
+    'badge': (('badge',), lambda p: p.badge),
+    'is_featured': (('is_featured',), lambda p: p.is_featured),
+    'is_active': (('is_active',), lambda p: p.is_active),
+    'meta_title': (('meta_title',), lambda p: p.meta_title),
+    'meta_description': (('meta_description',), lambda p: p.meta_description),
+    'created_at': (('created_at',), lambda p: p.created_at),
+    'updated_at': (('updated_at',), lambda p: p.updated_at),
+}
+
+# 'detail' is also what Product.to_dict() returns
+PRODUCT_PROJECTIONS = {
+    'card': [
+        'id', 'name', 'slug', 'price', 'original_price', 'discount_percentage',
+        'currency', 'in_stock', 'images', 'badge', 'is_featured'
+    ],
+    'detail': [
+        'id', 'name', 'slug', 'description', 'short_description', 'price',
+        'original_price', 'discount_percentage', 'currency', 'sku', 'stock_quantity',
+        'in_stock', 'low_stock', 'category_id', 'brand', 'gender',
+        'accessibility_features', 'images', 'badge', 'is_featured', 'is_active',
+        'meta_title', 'meta_description', 'created_at', 'updated_at'
+    ],
+}
+PRODUCT_PROJECTIONS['admin'] = PRODUCT_PROJECTIONS['detail'] + ['low_stock_threshold']
+
+# Always loaded: identity and the keyset pagination key
+ALWAYS_LOADED = ('id', 'created_at')
+
+
+def resolve_product_fields(view=None, fields=None):
+    """
+    Output field names for a request
+
+    Args:
+        view: Projection name ('card', 'detail', 'admin'), default 'detail'
+        fields: Comma-separated field names; overrides view when given
+
+    Raises:
+        ValueError: On an unknown view or field
+    """
+    if fields:
+        names = list(dict.fromkeys(f.strip() for f in fields.split(',') if f.strip()))
+        unknown = [name for name in names if name not in PRODUCT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if names:
+            return names
+
+    view = view or 'detail'
+    if view not in PRODUCT_PROJECTIONS:
+        raise ValueError(f"Unknown view. Must be one of: {', '.join(PRODUCT_PROJECTIONS)}")
+    return PRODUCT_PROJECTIONS[view]
+
+
+def product_load_options(field_names):
+    """load_only() option restricting a Product query to the columns field_names read"""
+    columns = dict.fromkeys(ALWAYS_LOADED)
+    for name in field_names:
+        columns.update(dict.fromkeys(PRODUCT_FIELDS[name][0]))
+    return load_only(*(getattr(Product, column) for column in columns))
+
+
+def serialize_product(product, field_names):
+    """Serialize a product to a dict with only field_names"""
+    return {name: PRODUCT_FIELDS[name][1](product) for name in field_names}
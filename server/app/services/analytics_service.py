@@ -0,0 +1,310 @@
+"""Analytics service - Time-bucketed sales and customer series
+
+Closed days are read from the daily rollup tables (SalesRollupService),
+and closed days not backfilled yet are aggregated live without writing;
+the current day is aggregated from raw orders and users, with one
+GROUP BY over a truncated timestamp (date_trunc on PostgreSQL, strftime on
+SQLite). The number of queries per analytics call is fixed whatever the
+period length. Buckets without rows are filled with zeros in Python.
+
+Daily series count whole days, so a period starting mid-day includes
+that entire first day.
+"""
+
+from app.extensions import db
+from app.models import Order, OrderItem, Payment, User, DailySalesRollup, DailyProductSalesRollup
+from app.services.sales_rollup_service import SalesRollupService
+from datetime import datetime, time, timedelta
+
+BUCKET_STEPS = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+BUCKET_LABELS = {
+    'hour': '%H:00',
+    'day': '%m/%d',
+}
+
+_SQLITE_FORMATS = {
+    'hour': '%Y-%m-%d %H:00:00',
+    'day': '%Y-%m-%d 00:00:00',
+}
+
+
+class AnalyticsService:
+    """Service for admin analytics"""
+
+    @staticmethod
+    def _bucket(column, unit):
+        if db.engine.dialect.name == 'postgresql':
+            return db.func.date_trunc(unit, column)
+        return db.func.strftime(_SQLITE_FORMATS[unit], column)
+
+    @staticmethod
+    def _bucket_start(value, unit):
+        """Floor a datetime (or rollup day, or SQLite bucket string) to its bucket"""
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, datetime):
+            value = datetime.combine(value, time.min)
+        value = value.replace(minute=0, second=0, microsecond=0)
+        return value.replace(hour=0) if unit == 'day' else value
+
+    @staticmethod
+    def _fill(rows, start_date, end_date, unit, empty):
+        """Map bucket -> values for every bucket in the period, zeros for gaps"""
+        values = {AnalyticsService._bucket_start(row[0], unit): row[1:] for row in rows}
+
+        series = []
+        current = AnalyticsService._bucket_start(start_date, unit)
+        while current <= end_date:
+            series.append((current, values.get(current, empty)))
+            current += BUCKET_STEPS[unit]
+        return series
+
+    @staticmethod
+    def _split(start_date, end_date):
+        """
+        Split a period at the start of the current day
+
+        Returns:
+            tuple: ((first_day, last_day) of closed days or None,
+                    (metrics, products) of closed days without a rollup row,
+                    (start, end) of the current day's part or None)
+        """
+        today_start = datetime.combine(SalesRollupService.today(), time.min)
+
+        closed, missing = None, ({}, [])
+        if start_date < today_start:
+            closed = (start_date.date(), min(end_date, today_start - timedelta(microseconds=1)).date())
+            missing = SalesRollupService.read_missing(*closed)
+
+        current = (max(start_date, today_start), end_date) if end_date >= today_start else None
+        return closed, missing, current
+
+    @staticmethod
+    def _raw_sales(start_date, end_date, unit):
+        bucket = AnalyticsService._bucket(Order.created_at, unit).label('bucket')
+        return db.session.query(
+            bucket,
+            db.func.coalesce(db.func.sum(Order.total), 0),
+            db.func.count(Order.id)
+        ).filter(
+            Order.created_at >= start_date, Order.created_at <= end_date
+        ).group_by(bucket).all()
+
+    @staticmethod
+    def _raw_customers(start_date, end_date, unit):
+        """(new_rows, returning_rows) grouped by bucket"""
+        bucket = AnalyticsService._bucket(User.created_at, unit).label('bucket')
+        new_rows = db.session.query(bucket, db.func.count(User.id)).filter(
+            User.role == 'customer', User.created_at >= start_date, User.created_at <= end_date
+        ).group_by(bucket).all()
+
+        order_bucket = AnalyticsService._bucket(Order.created_at, unit).label('bucket')
+        repeat_buyers = db.session.query(order_bucket, Order.user_id).filter(
+            Order.created_at >= start_date, Order.created_at <= end_date
+        ).group_by(order_bucket, Order.user_id).having(db.func.count(Order.id) > 1).subquery()
+        returning_rows = db.session.query(
+            repeat_buyers.c.bucket, db.func.count()
+        ).group_by(repeat_buyers.c.bucket).all()
+
+        return new_rows, returning_rows
+
+    @staticmethod
+    def _rollups(closed, *columns):
+        first_day, last_day = closed
+        return db.session.query(DailySalesRollup.day, *columns).filter(
+            DailySalesRollup.day.between(first_day, last_day)
+        ).all()
+
+    @staticmethod
+    def sales_series(start_date, end_date, unit='day'):
+        """
+        Revenue and order count per bucket
+
+        Returns:
+            list: [{'date', 'revenue', 'orders'}] including empty buckets
+        """
+        if unit == 'hour':
+            rows = AnalyticsService._raw_sales(start_date, end_date, unit)
+        else:
+            closed, (missing, _), current = AnalyticsService._split(start_date, end_date)
+            rows = []
+            if closed:
+                rows += AnalyticsService._rollups(closed, DailySalesRollup.gross_revenue, DailySalesRollup.orders)
+                rows += [
+                    (day, values.get('gross_revenue') or 0, values.get('orders') or 0) for day, values in missing.items()
+                ]
+            if current:
+                rows += AnalyticsService._raw_sales(*current, unit)
+
+        return [
+            {'date': start.strftime(BUCKET_LABELS[unit]), 'revenue': float(revenue), 'orders': orders}
+            for start, (revenue, orders) in AnalyticsService._fill(rows, start_date, end_date, unit, (0, 0))
+        ]
+
+    @staticmethod
+    def customer_series(start_date, end_date, unit='day'):
+        """
+        New customers and returning customers (more than one order in the
+        bucket) per bucket
+
+        Returns:
+            list: [{'date', 'new', 'returning'}] including empty buckets
+        """
+        if unit == 'hour':
+            new_rows, returning_rows = AnalyticsService._raw_customers(start_date, end_date, unit)
+        else:
+            closed, (missing, _), current = AnalyticsService._split(start_date, end_date)
+            new_rows, returning_rows = [], []
+            if closed:
+                for row in AnalyticsService._rollups(
+                    closed, DailySalesRollup.new_customers, DailySalesRollup.returning_customers
+                ):
+                    new_rows.append((row.day, row.new_customers))
+                    returning_rows.append((row.day, row.returning_customers))
+                for day, values in missing.items():
+                    new_rows.append((day, values.get('new_customers') or 0))
+                    returning_rows.append((day, values.get('returning_customers') or 0))
+            if current:
+                raw_new, raw_returning = AnalyticsService._raw_customers(*current, unit)
+                new_rows += raw_new
+                returning_rows += raw_returning
+
+        new = dict(AnalyticsService._fill(new_rows, start_date, end_date, unit, (0,)))
+        returning = AnalyticsService._fill(returning_rows, start_date, end_date, unit, (0,))
+        return [
+            {'date': start.strftime(BUCKET_LABELS[unit]), 'new': new[start][0], 'returning': count}
+            for start, (count,) in returning
+        ]
+
+    @staticmethod
+    def top_products(start_date, end_date, limit=5):
+        """
+        Best-selling products by revenue from order lines
+
+        Returns:
+            list: [{'name', 'value', 'units', 'avgPrice', 'growth'}]
+        """
+        closed, (_, missing_products), current = AnalyticsService._split(start_date, end_date)
+        totals = {}  # product_id -> [name, revenue, units]
+
+        def add(rows):
+            for product_id, name, revenue, units in rows:
+                entry = totals.setdefault(product_id, [name, 0, 0])
+                entry[1] += revenue or 0
+                entry[2] += units or 0
+
+        if closed:
+            add(db.session.query(
+                DailyProductSalesRollup.product_id,
+                db.func.max(DailyProductSalesRollup.product_name),
+                db.func.sum(DailyProductSalesRollup.revenue),
+                db.func.sum(DailyProductSalesRollup.units)
+            ).filter(
+                DailyProductSalesRollup.day.between(*closed)
+            ).group_by(DailyProductSalesRollup.product_id).all())
+            add((row['product_id'], row['product_name'], row['revenue'], row['units']) for row in missing_products)
+        if current:
+            add(db.session.query(
+                OrderItem.product_id,
+                db.func.max(OrderItem.product_name),
+                db.func.sum(OrderItem.subtotal),
+                db.func.sum(OrderItem.quantity)
+            ).join(Order, Order.id == OrderItem.order_id).filter(
+                Order.created_at >= current[0], Order.created_at <= current[1]
+            ).group_by(OrderItem.product_id).all())
+
+        ranked = sorted(totals.values(), key=lambda entry: entry[1], reverse=True)[:limit]
+        return [{
+            'name': name,
+            'value': float(revenue),
+            'units': units,
+            'avgPrice': float(revenue / units) if units else 0,
+            'growth': 0  # Calculate growth vs previous period
+        } for name, revenue, units in ranked]
+
+    @staticmethod
+    def order_totals(start_date, end_date):
+        """
+        Orders, revenue and new customers over a period
+
+        Returns:
+            dict: orders, gross_revenue, net_revenue (excluding cancelled), new_customers
+        """
+        closed, (missing, _), current = AnalyticsService._split(start_date, end_date)
+        totals = {'orders': 0, 'gross_revenue': 0, 'net_revenue': 0, 'new_customers': 0}
+
+        if closed:
+            row = db.session.query(
+                db.func.sum(DailySalesRollup.orders),
+                db.func.sum(DailySalesRollup.gross_revenue),
+                db.func.sum(DailySalesRollup.net_revenue),
+                db.func.sum(DailySalesRollup.new_customers)
+            ).filter(DailySalesRollup.day.between(*closed)).one()
+            for name, value in zip(totals, row):
+                totals[name] += value or 0
+            for values in missing.values():
+                for name in totals:
+                    totals[name] += values.get(name) or 0
+
+        if current:
+            start, end = current
+            row = db.session.query(
+                db.func.count(Order.id),
+                db.func.sum(Order.total),
+                db.func.sum(db.case((Order.status != 'cancelled', Order.total), else_=0))
+            ).filter(Order.created_at >= start, Order.created_at <= end).one()
+            for name, value in zip(('orders', 'gross_revenue', 'net_revenue'), row):
+                totals[name] += value or 0
+            totals['new_customers'] += User.query.filter(
+                User.role == 'customer', User.created_at >= start, User.created_at <= end
+            ).count()
+
+        return totals
+
+    @staticmethod
+    def payment_totals():
+        """
+        All-time payment counts and amounts
+
+        Returns:
+            dict: payments, successful_payments, pending_payments,
+                failed_payments, successful_amount, refunded_amount
+        """
+        names = (
+            'payments', 'successful_payments', 'pending_payments', 'failed_payments',
+            'successful_amount', 'refunded_amount'
+        )
+        totals = dict.fromkeys(names, 0)
+
+        oldest = db.session.query(db.func.min(Payment.created_at)).scalar()
+        if oldest is None:
+            return totals
+
+        closed, (missing, _), current = AnalyticsService._split(oldest, datetime.utcnow())
+        if closed:
+            row = db.session.query(
+                *(db.func.sum(getattr(DailySalesRollup, name)) for name in names)
+            ).filter(DailySalesRollup.day.between(*closed)).one()
+            for name, value in zip(names, row):
+                totals[name] += value or 0
+            for values in missing.values():
+                for name in names:
+                    totals[name] += values.get(name) or 0
+
+        if current:
+            row = db.session.query(
+                db.func.count(Payment.id),
+                db.func.sum(db.case((Payment.status == 'successful', 1), else_=0)),
+                db.func.sum(db.case((Payment.status == 'pending', 1), else_=0)),
+                db.func.sum(db.case((Payment.status == 'failed', 1), else_=0)),
+                db.func.sum(db.case((Payment.status == 'successful', Payment.amount), else_=0)),
+                db.func.sum(db.case((Payment.status == 'refunded', Payment.amount), else_=0))
+            ).filter(Payment.created_at >= current[0]).one()
+            for name, value in zip(names, row):
+                totals[name] += value or 0
+
+        return totals
@@ -0,0 +1,264 @@
+"""Authorization service - Role checks from JWT claims, checked against a version marker
+
+Access tokens carry the user's authorization as claims:
+
+    {"role": "content_manager", "perms": ["manage_media"], "authz": "<digest>"}
+
+where the digest covers role, permissions and is_active. The authz store
+keeps each user's current digest, a small version marker. A request whose
+token digest matches the stored one is authorized from its claims without
+loading the user.
+
+Anything else reads the users table: a missing marker (never set, expired,
+or unreadable because Redis failed), a digest that differs (the token was
+issued before a change, and gets the current rights), or a token without
+claims. The read stores the fresh marker for AUTHZ_CACHE_TTL seconds. A
+change to a user's role, permissions or is_active, or deleting the user,
+deletes the marker after commit.
+
+Backends (AUTHZ_BACKEND, defaults to redis):
+    redis:  One key per user shared by all workers, so a change reaches every
+            worker at once. A Redis error reads the users table instead
+    memory: In-process dict with TTL, per worker (local development and
+            tests only: other workers keep a changed marker until it expires)
+"""
+
+from app.extensions import db
+from app.models import User
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy.orm import Session, object_session
+import hashlib
+import json
+import threading
+import time
+
+# User columns that make up an authorization record
+AUTHZ_ATTRIBUTES = ('role', 'permissions', 'is_active')
+
+
+class MemoryAuthzBackend:
+    """
+    Thread-safe in-process marker store with TTL
+
+    Entries are never evicted for space, only when they expire; expired
+    ones are swept at most once per sweep_interval seconds on writes.
+    """
+
+    def __init__(self, sweep_interval=60):
+        self.sweep_interval = sweep_interval
+        self._records = {}  # user_id -> (expires_at, digest)
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._records.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._records[user_id]
+                return None
+            return entry[1]
+
+    def set(self, user_id, value, ttl):
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                for key in [key for key, (expires_at, _) in self._records.items() if expires_at <= now]:
+                    del self._records[key]
+                self._next_sweep = now + self.sweep_interval
+            self._records[user_id] = (now + ttl, value)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._records.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+class RedisAuthzBackend:
+    """Markers as Redis strings shared by all workers"""
+
+    def __init__(self, url, prefix='hisi:authz:user:'):
+        import redis
+
+        self._redis = redis
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def get(self, user_id):
+        try:
+            return self.client.get(self.prefix + user_id)
+        except self._redis.RedisError as e:
+            print(f"Authz marker get failed: {str(e)}")
+            return None  # Read from the users table
+
+    def set(self, user_id, value, ttl):
+        try:
+            self.client.set(self.prefix + user_id, value, ex=ttl)
+        except self._redis.RedisError as e:
+            print(f"Authz marker set failed: {str(e)}")
+
+    def delete(self, user_id):
+        try:
+            self.client.delete(self.prefix + user_id)
+        except self._redis.RedisError as e:
+            print(f"Authz marker delete failed: {str(e)}")
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self.client.delete(*keys)
+        except self._redis.RedisError as e:
+            print(f"Authz marker clear failed: {str(e)}")
+
+
+class AuthzStore:
+    """Facade over the configured authz marker backend"""
+
+    def __init__(self):
+        self.backend = MemoryAuthzBackend()
+        self.ttl = 60
+
+    def init_app(self, app):
+        """Select the backend from AUTHZ_BACKEND"""
+        backend = app.config.get('AUTHZ_BACKEND') or 'redis'
+        self.ttl = app.config.get('AUTHZ_CACHE_TTL', 60)
+
+        if backend == 'redis':
+            self.backend = RedisAuthzBackend(app.config['REDIS_URL'])
+        else:
+            self.backend = MemoryAuthzBackend()
+
+        app.extensions['authz_store'] = self
+
+    def get(self, user_id):
+        """(digest, found); digest is None for a deleted user"""
+        value = self.backend.get(user_id)
+        if value is None:
+            return None, False
+        return json.loads(value), True
+
+    def set(self, user_id, digest):
+        self.backend.set(user_id, json.dumps(digest), self.ttl)
+
+    def delete(self, user_id):
+        self.backend.delete(user_id)
+
+
+authz_store = AuthzStore()
+
+
+class Authz:
+    """A user's authorization, with the same checks as User"""
+
+    def __init__(self, user_id, role, permissions=None, is_active=True):
+        self.id = user_id
+        self.role = role
+        self.permissions = permissions or []
+        self.is_active = is_active
+
+    def is_admin(self):
+        """Check if user is any type of admin"""
+        return self.role in ['content_manager', 'super_admin']
+
+    def is_super_admin(self):
+        """Check if user is super admin"""
+        return self.role == 'super_admin'
+
+    def has_permission(self, permission):
+        """Check if user has a specific permission"""
+        if self.is_super_admin():
+            return True  # Super admin has all permissions
+        return permission in self.permissions
+
+
+class AuthzService:
+    """Service for JWT authorization claims and their version markers"""
+
+    @staticmethod
+    def _record(user):
+        """Authorization record of a user (None if deleted)"""
+        if user is None:
+            return None
+        role, permissions, is_active = user.role, sorted(user.permissions or []), bool(user.is_active)
+        payload = json.dumps([role, permissions, is_active], separators=(',', ':'))
+        return {
+            'role': role,
+            'perms': permissions,
+            'active': is_active,
+            'authz': hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        }
+
+    @staticmethod
+    def claims_for(user=None, record=None):
+        """additional_claims for create_access_token, from a user or a loaded record"""
+        record = record or AuthzService._record(user)
+        return {'role': record['role'], 'perms': record['perms'], 'authz': record['authz']}
+
+    @staticmethod
+    def load(user_id):
+        """Authorization record of a user from the users table; refreshes the stored marker"""
+        record = AuthzService._record(db.session.get(User, user_id))
+        authz_store.set(user_id, record['authz'] if record else None)
+        return record
+
+    @staticmethod
+    def current():
+        """
+        Authorization of the request's JWT
+
+        Returns:
+            Authz: Or None if the user no longer exists
+        """
+        verify_jwt_in_request()
+        user_id = get_jwt_identity()
+        claims = get_jwt()
+
+        digest, found = authz_store.get(user_id)
+        if found:
+            if digest is None:
+                return None  # Deleted
+            if claims.get('authz') == digest:
+                # Unchanged since the token was issued, and tokens are only
+                # issued to active users
+                return Authz(user_id, claims['role'], claims.get('perms', []), True)
+
+        record = AuthzService.load(user_id)
+        if record is None:
+            return None
+        return Authz(user_id, record['role'], record['perms'], record['active'])
+
+
+def current_authz():
+    """Authorization of the current request (see AuthzService.current)"""
+    return AuthzService.current()
+
+
+@db.event.listens_for(User, 'after_update')
+def _mark_authz_changed(mapper, connection, target):
+    state = db.inspect(target)
+    if state.session is not None and any(state.attrs[name].history.has_changes() for name in AUTHZ_ATTRIBUTES):
+        state.session.info.setdefault('authz_changed', set()).add(target.id)
+
+
+@db.event.listens_for(User, 'after_delete')
+def _mark_authz_deleted(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('authz_changed', set()).add(target.id)
+
+
+@db.event.listens_for(Session, 'after_commit')
+def _forget_changed_authz(session):
+    # Deleted, not rewritten: the next request reads the committed row
+    for user_id in session.info.pop('authz_changed', None) or ():
+        authz_store.delete(user_id)
+
+
+@db.event.listens_for(Session, 'after_rollback')
+def _discard_authz_changes(session):
+    session.info.pop('authz_changed', None)
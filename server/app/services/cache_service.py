@@ -0,0 +1,216 @@
+"""Cache service - Pluggable response cache for public catalog endpoints
+
+Backends:
+    memory: In-process LRU with per-entry TTL (default, per worker)
+    redis:  Shared Redis instance from REDIS_URL (docker-compose 'redis' service)
+
+Catalog responses are keyed by a catalog version counter, so bumping the
+version after a product write makes every cached listing unreachable at once.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+import hashlib
+import threading
+import time
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU cache with TTL"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._counters = {}  # Never evicted, so versions cannot reset
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._counters.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisBackend:
+    """Redis-backed cache shared by all workers"""
+
+    def __init__(self, url, prefix='hisi:'):
+        import redis
+
+        self._redis = redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        try:
+            value = self.client.get(self.prefix + key)
+        except self._redis.RedisError as e:
+            print(f"Cache get failed: {str(e)}")
+            return None
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        try:
+            self.client.set(self.prefix + key, value, ex=ttl)
+        except self._redis.RedisError as e:
+            print(f"Cache set failed: {str(e)}")
+
+    def delete(self, key):
+        try:
+            self.client.delete(self.prefix + key)
+        except self._redis.RedisError as e:
+            print(f"Cache delete failed: {str(e)}")
+
+    def incr(self, key):
+        try:
+            return self.client.incr(self.prefix + key)
+        except self._redis.RedisError as e:
+            print(f"Cache incr failed: {str(e)}")
+            return None
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self.client.delete(*keys)
+        except self._redis.RedisError as e:
+            print(f"Cache clear failed: {str(e)}")
+
+
+class CacheService:
+    """Facade over the configured cache backend"""
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.default_ttl = 300
+
+    def init_app(self, app):
+        """Select the backend from CACHE_BACKEND"""
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 300)
+
+        if backend == 'redis':
+            self.backend = RedisBackend(app.config['REDIS_URL'])
+        else:
+            self.backend = MemoryBackend(max_entries=app.config.get('CACHE_MAX_ENTRIES', 1024))
+
+        app.extensions['cache'] = self
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(key, value, ttl or self.default_ttl)
+
+    def delete(self, key):
+        self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+
+    def catalog_version(self):
+        """Current catalog version (0 until the first product write)"""
+        return int(self.backend.get(CATALOG_VERSION_KEY) or 0)
+
+    def bump_catalog_version(self):
+        """Invalidate every cached catalog response"""
+        return self.backend.incr(CATALOG_VERSION_KEY)
+
+
+cache = CacheService()
+
+
+def normalize_query_args(args, defaults=None):
+    """
+    Canonical query string for cache keys
+
+    Fills in defaults and sorts keys so that '?page=1&category=tops' and
+    '?category=tops' share one entry. Empty values are kept because some
+    flags are presence-only (e.g. '?cursor=' selects cursor pagination).
+    """
+    params = dict(defaults or {})
+    for key in args:
+        params[key] = ','.join(sorted(v.strip() for v in args.getlist(key)))
+    return '&'.join(f'{key}={params[key]}' for key in sorted(params))
+
+
+def catalog_cache_key(namespace, view_args, query=''):
+    """Cache key of a catalog_cached response for the current catalog version"""
+    view_args = ':'.join(f'{k}={view_args[k]}' for k in sorted(view_args))
+    return f"{namespace}:v{cache.catalog_version()}:{view_args}:{query}"
+
+
+def catalog_cached(namespace, defaults=None, ttl=None, vary_on_query=True):
+    """
+    Cache a public catalog endpoint's JSON response
+
+    Responses are keyed by namespace, catalog version, view args and the
+    normalized query string. They carry an ETag (hash of the body, stored
+    alongside it) and answer a matching If-None-Match with 304.
+    Only 200 responses are stored.
+
+    With vary_on_query=False the query string is ignored, so a single entry
+    can be evicted with cache.delete(catalog_cache_key(namespace, view_args)).
+
+    Usage: @catalog_cached('products', defaults={'page': '1'})
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            query = normalize_query_args(request.args, defaults) if vary_on_query else ''
+            key = catalog_cache_key(namespace, kwargs, query)
+
+            cached = cache.get(key)
+            if cached is None:
+                result = current_app.make_response(fn(*args, **kwargs))
+                if result.status_code != 200:
+                    return result
+                body = result.get_data(as_text=True)
+                etag = hashlib.sha1(body.encode('utf-8')).hexdigest()
+                cache.set(key, f'{etag}\n{body}', ttl or current_app.config.get('CATALOG_CACHE_TTL'))
+            else:
+                etag, body = cached.split('\n', 1)
+
+            if etag in request.if_none_match:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.response_class(body, status=200, mimetype='application/json')
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        return wrapper
+    return decorator
@@ -2,20 +2,49 @@
 
 from app.extensions import db
 from app.models import Cart, CartItem, Product
+from app.services.guest_cart_service import guest_carts, GuestCartUnavailable
+from app.utils.sql import upsert_insert
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+import uuid
 
 
 class CartService:
     """Service for managing shopping carts"""
 
+    @staticmethod
+    def load_cart(cart_id=None, user_id=None, session_id=None):
+        """
+        Load a cart with its items and their products
+
+        Two queries regardless of cart size: the cart, then its items
+        joined to their products. to_dict(), totals and stock validation
+        then run without further lazy loads.
+        """
+        query = Cart.query.options(
+            selectinload(Cart.items).joinedload(CartItem.product)
+        )
+        if cart_id:
+            query = query.filter_by(id=cart_id)
+        elif user_id:
+            query = query.filter_by(user_id=user_id)
+        elif session_id:
+            query = query.filter_by(session_id=session_id)
+        else:
+            return None
+
+        # populate_existing so a cart already in the session picks up changes
+        return query.populate_existing().first()
+
     @staticmethod
     def get_or_create_cart(user_id=None, session_id=None):
         """Get existing cart or create new one"""
         try:
             if user_id:
-                cart = Cart.query.filter_by(user_id=user_id).first()
+                cart = CartService.load_cart(user_id=user_id)
             elif session_id:
-                cart = Cart.query.filter_by(session_id=session_id).first()
+                cart = CartService.load_cart(session_id=session_id)
             else:
                 return None
 
@@ -68,6 +97,7 @@ class CartService:
                 db.session.add(cart_item)
 
             db.session.commit()
+            Cart.forget_totals(cart.id)
             return cart_item, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -91,6 +121,7 @@ class CartService:
 
             cart_item.quantity = quantity
             db.session.commit()
+            Cart.forget_totals(cart_item.cart_id)
             return cart_item, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -104,8 +135,10 @@ class CartService:
             if not cart_item:
                 return False, "Cart item not found"
 
+            cart_id = cart_item.cart_id
             db.session.delete(cart_item)
             db.session.commit()
+            Cart.forget_totals(cart_id)
             return True, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -117,6 +150,7 @@ class CartService:
         try:
             CartItem.query.filter_by(cart_id=cart_id).delete()
             db.session.commit()
+            Cart.forget_totals(cart_id)
             return True, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -124,34 +158,85 @@ class CartService:
 
     @staticmethod
     def merge_guest_cart_to_user(session_id, user_id):
-        """Merge guest cart into user cart after login"""
+        """
+        Merge guest cart into user cart after login
+
+        Guest lines come from the guest cart store and from any SQL guest
+        cart left for the session. All of them are written with one
+        INSERT ... ON CONFLICT (cart_id, product_id) DO UPDATE that adds
+        quantities, clamped to each product's stock.
+        """
         try:
-            # Get guest cart
-            guest_cart = Cart.query.filter_by(session_id=session_id).first()
-            if not guest_cart or not guest_cart.items:
+            # Guest lines: product_id -> [quantity, price when added]
+            lines = {}
+            for product_id, (quantity, price) in guest_carts.items(session_id).items():
+                lines[product_id] = [quantity, price]
+
+            legacy_cart_ids = db.select(Cart.id).where(Cart.session_id == session_id, Cart.user_id.is_(None))
+            legacy_items = db.session.query(
+                CartItem.product_id, CartItem.quantity, CartItem.price_at_addition
+            ).filter(CartItem.cart_id.in_(legacy_cart_ids)).all()
+            for product_id, quantity, price in legacy_items:
+                line = lines.setdefault(product_id, [0, price])
+                line[0] += quantity
+
+            if not lines:
                 return True, None
 
             # Get or create user cart
             user_cart = CartService.get_or_create_cart(user_id=user_id)
 
-            # Merge items
-            for guest_item in guest_cart.items:
-                # Check if product already in user cart
-                existing_item = CartItem.query.filter_by(
-                    cart_id=user_cart.id,
-                    product_id=guest_item.product_id
-                ).first()
-
-                if existing_item:
-                    # Update quantity
-                    existing_item.quantity += guest_item.quantity
-                else:
-                    # Move item to user cart
-                    guest_item.cart_id = user_cart.id
-
-            # Delete guest cart
-            db.session.delete(guest_cart)
+            products = {
+                row.id: row for row in db.session.query(
+                    Product.id, Product.price, Product.stock_quantity
+                ).filter(Product.id.in_(lines), Product.is_active == True)
+            }
+
+            now = datetime.utcnow()
+            rows = []
+            for product_id, (quantity, price) in lines.items():
+                product = products.get(product_id)
+                if not product or product.stock_quantity <= 0:
+                    continue
+                rows.append({
+                    'id': str(uuid.uuid4()),
+                    'cart_id': user_cart.id,
+                    'product_id': product_id,
+                    'quantity': min(quantity, product.stock_quantity),
+                    'price_at_addition': price if price is not None else product.price,
+                    'created_at': now,
+                    'updated_at': now
+                })
+
+            if rows:
+                table = CartItem.__table__
+                statement = upsert_insert(table).values(rows)
+                # Stock read above, keyed by the conflicting row's product. A
+                # subquery on excluded would not correlate: SQLAlchemy renders
+                # excluded as a table in its FROM list.
+                stock = db.case(
+                    {row['product_id']: products[row['product_id']].stock_quantity for row in rows},
+                    value=statement.excluded.product_id
+                )
+                merged = table.c.quantity + statement.excluded.quantity
+                db.session.execute(statement.on_conflict_do_update(
+                    index_elements=[table.c.cart_id, table.c.product_id],
+                    set_={
+                        'quantity': db.case((merged > stock, stock), else_=merged),
+                        'updated_at': now
+                    }
+                ))
+
+            # Delete legacy SQL guest carts
+            CartItem.query.filter(CartItem.cart_id.in_(legacy_cart_ids)).delete(synchronize_session=False)
+            Cart.query.filter(Cart.session_id == session_id, Cart.user_id.is_(None)).delete(synchronize_session=False)
+
             db.session.commit()
+            Cart.forget_totals(user_cart.id)
+            try:
+                guest_carts.clear(session_id)
+            except GuestCartUnavailable:
+                pass  # Merged already; the route drops the session's cart id
             return True, None
         except SQLAlchemyError as e:
             db.session.rollback()
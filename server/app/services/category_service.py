@@ -0,0 +1,129 @@
+"""Category service - In-memory category tree index
+
+The whole categories table is small, so it is loaded in one query and
+indexed in memory for O(1) slug -> id and slug -> subtree lookups. The index
+is tied to the catalog version from the cache service: any committed
+category write bumps the version, and every worker rebuilds on its next
+lookup. With the memory cache backend the version is per worker, so the
+index is also rebuilt once it is CATALOG_SNAPSHOT_TTL seconds old; other
+workers see an edit within that time.
+"""
+
+from app.extensions import db
+from app.models import Category
+from app.services.cache_service import cache
+from flask import current_app
+from sqlalchemy.orm import Session, object_session
+import threading
+import time
+
+
+class CategoryTree:
+    """Immutable snapshot of the category hierarchy"""
+
+    def __init__(self, categories):
+        self.by_id = {c.id: c for c in categories}
+        self.id_by_slug = {c.slug: c.id for c in categories}
+
+        self.children = {c.id: [] for c in categories}
+        self.roots = []
+        for category in sorted(categories, key=lambda c: (c.display_order or 0, c.name)):
+            if category.parent_id in self.children:
+                self.children[category.parent_id].append(category.id)
+            else:
+                self.roots.append(category.id)
+
+        self.descendants_by_slug = {
+            c.slug: frozenset(self._collect(c.id)) for c in categories
+        }
+
+    def _collect(self, root_id):
+        """Ids of root_id and everything below it (cycle-safe)"""
+        seen = set()
+        stack = [root_id]
+        while stack:
+            category_id = stack.pop()
+            if category_id in seen:
+                continue
+            seen.add(category_id)
+            stack.extend(self.children.get(category_id, ()))
+        return seen
+
+    def to_list(self, active_only=True):
+        """Nested tree of category dicts with 'children'"""
+        def build(category_id):
+            category = self.by_id[category_id]
+            node = category.to_dict()
+            node['children'] = [
+                build(child_id) for child_id in self.children[category_id]
+                if not active_only or self.by_id[child_id].is_active
+            ]
+            return node
+
+        return [
+            build(root_id) for root_id in self.roots
+            if not active_only or self.by_id[root_id].is_active
+        ]
+
+
+class CategoryService:
+    """Service for category lookups"""
+
+    _tree = None
+    _version = None
+    _built_at = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _stale(version):
+        ttl = current_app.config.get('CATALOG_SNAPSHOT_TTL', 60)
+        return (
+            CategoryService._tree is None
+            or CategoryService._version != version
+            or time.monotonic() - CategoryService._built_at >= ttl
+        )
+
+    @staticmethod
+    def get_tree():
+        """Current category tree, rebuilt when the catalog version changes or it expires"""
+        version = cache.catalog_version()
+        if CategoryService._stale(version):
+            with CategoryService._lock:
+                if CategoryService._stale(version):
+                    # Private session so the snapshot is detached from the request
+                    with Session(db.engine) as session:
+                        categories = session.scalars(db.select(Category)).all()
+                    CategoryService._tree = CategoryTree(categories)
+                    CategoryService._version = version
+                    CategoryService._built_at = time.monotonic()
+        return CategoryService._tree
+
+    @staticmethod
+    def get_id(slug):
+        """Category id for a slug, or None"""
+        return CategoryService.get_tree().id_by_slug.get(slug)
+
+    @staticmethod
+    def get_descendant_ids(slug):
+        """Ids of the category and all of its descendants (empty if unknown)"""
+        return CategoryService.get_tree().descendants_by_slug.get(slug, frozenset())
+
+
+@db.event.listens_for(Category, 'after_insert')
+@db.event.listens_for(Category, 'after_update')
+@db.event.listens_for(Category, 'after_delete')
+def _mark_categories_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info['categories_changed'] = True
+
+
+@db.event.listens_for(Session, 'after_commit')
+def _invalidate_category_tree(session):
+    if session.info.pop('categories_changed', False):
+        cache.bump_catalog_version()
+
+
+@db.event.listens_for(Session, 'after_rollback')
+def _discard_category_changes(session):
+    session.info.pop('categories_changed', None)
@@ -0,0 +1,195 @@
+"""Export service - Streaming CSV/NDJSON exports of admin datasets
+
+An export is one SELECT of plain columns (related user columns are joined
+in, never lazy-loaded per row) executed with yield_per, which streams
+results from a server-side cursor on PostgreSQL. Rows are encoded and
+yielded a batch at a time, so memory stays flat however long the period
+and the first bytes reach the client before the query has finished.
+
+Datasets map column names to (header, SQL expression); callers pick any
+subset of columns. Adding a dataset is one more EXPORT_DATASETS entry.
+"""
+
+from app.extensions import db
+from app.models import Order, Payment, User, NewsletterSubscriber
+from flask import current_app
+from datetime import datetime
+import csv
+import io
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+EXPORT_BATCH_SIZE = 1000
+
+
+# Orders per user, joined into the customers export
+_ORDER_COUNTS = db.select(
+    Order.user_id, db.func.count(Order.id).label('order_count')
+).group_by(Order.user_id).subquery()
+
+# Name from the user row, for orders placed before customer_name was stored
+_FULL_NAME = db.func.trim(db.func.coalesce(User.first_name, '') + ' ' + db.func.coalesce(User.last_name, ''))
+
+
+def _orders_query(columns):
+    return db.select(*columns).select_from(Order).outerjoin(User, User.id == Order.user_id)
+
+
+def _payments_query(columns):
+    return db.select(*columns).select_from(Payment).join(Order, Order.id == Payment.order_id)
+
+
+def _customers_query(columns):
+    return db.select(*columns).select_from(User).outerjoin(
+        _ORDER_COUNTS, _ORDER_COUNTS.c.user_id == User.id
+    ).where(User.role == 'customer')
+
+
+def _subscribers_query(columns):
+    return db.select(*columns).select_from(NewsletterSubscriber)
+
+
+# Dataset -> query builder, date column for period filters, and
+# column name -> (header, SQL expression); dict order is the default column order
+EXPORT_DATASETS = {
+    'orders': {
+        'query': _orders_query,
+        'date_column': Order.created_at,
+        'columns': {
+            'id': ('Order ID', Order.id),
+            'order_number': ('Order Number', Order.order_number),
+            'created_at': ('Date', Order.created_at),
+            'customer': ('Customer', db.func.coalesce(Order.customer_name, _FULL_NAME)),
+            'customer_email': ('Customer Email', db.func.coalesce(Order.customer_email, User.email)),
+            'status': ('Status', Order.status),
+            'payment_status': ('Payment Status', Order.payment_status),
+            'subtotal': ('Subtotal', Order.subtotal),
+            'shipping_cost': ('Shipping', Order.shipping_cost),
+            'total': ('Total', Order.total),
+            'currency': ('Currency', Order.currency),
+        },
+    },
+    'payments': {
+        'query': _payments_query,
+        'date_column': Payment.created_at,
+        'columns': {
+            'id': ('Payment ID', Payment.id),
+            'transaction_id': ('Transaction ID', Payment.transaction_id),
+            'order_number': ('Order Number', Order.order_number),
+            'created_at': ('Date', Payment.created_at),
+            'customer_email': ('Customer Email', Payment.customer_email),
+            'customer_name': ('Customer', Payment.customer_name),
+            'payment_method': ('Method', Payment.payment_method),
+            'status': ('Status', Payment.status),
+            'amount': ('Amount', Payment.amount),
+            'currency': ('Currency', Payment.currency),
+            'completed_at': ('Completed', Payment.completed_at),
+        },
+    },
+    'customers': {
+        'query': _customers_query,
+        'date_column': User.created_at,
+        'columns': {
+            'id': ('Customer ID', User.id),
+            'email': ('Email', User.email),
+            'first_name': ('First Name', User.first_name),
+            'last_name': ('Last Name', User.last_name),
+            'created_at': ('Joined', User.created_at),
+            'order_count': ('Orders', db.func.coalesce(_ORDER_COUNTS.c.order_count, 0)),
+        },
+    },
+    'newsletter_subscribers': {
+        'query': _subscribers_query,
+        'date_column': NewsletterSubscriber.subscribed_at,
+        'columns': {
+            'email': ('Email', NewsletterSubscriber.email),
+            'is_subscribed': ('Subscribed', NewsletterSubscriber.is_subscribed),
+            'subscribed_at': ('Subscribed At', NewsletterSubscriber.subscribed_at),
+            'unsubscribed_at': ('Unsubscribed At', NewsletterSubscriber.unsubscribed_at),
+        },
+    },
+}
+
+
+class ExportService:
+    """Service for streaming dataset exports"""
+
+    @staticmethod
+    def resolve_columns(dataset, columns=None):
+        """
+        Column names for an export
+
+        Args:
+            dataset: EXPORT_DATASETS key
+            columns: Comma-separated column names; all columns when omitted
+
+        Raises:
+            ValueError: On an unknown dataset or column
+        """
+        if dataset not in EXPORT_DATASETS:
+            raise ValueError(f"Unknown dataset. Must be one of: {', '.join(EXPORT_DATASETS)}")
+
+        available = EXPORT_DATASETS[dataset]['columns']
+        if not columns:
+            return list(available)
+
+        names = list(dict.fromkeys(c.strip() for c in columns.split(',') if c.strip()))
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        return names or list(available)
+
+    @staticmethod
+    def build_query(dataset, column_names, start_date=None, end_date=None):
+        """SELECT for the given columns, newest first, optionally within a period"""
+        spec = EXPORT_DATASETS[dataset]
+        columns = [spec['columns'][name][1].label(name) for name in column_names]
+        query = spec['query'](columns)
+
+        date_column = spec['date_column']
+        if start_date is not None:
+            query = query.where(date_column >= start_date)
+        if end_date is not None:
+            query = query.where(date_column <= end_date)
+        return query.order_by(date_column.desc())
+
+    @staticmethod
+    def _csv_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ', timespec='seconds')
+        return value
+
+    @staticmethod
+    def stream(dataset, column_names, fmt='csv', start_date=None, end_date=None):
+        """
+        Generate an export chunk by chunk
+
+        Must run inside the app context (wrap with stream_with_context).
+
+        Yields:
+            str: Header line(s), then one chunk per batch of rows
+        """
+        query = ExportService.build_query(dataset, column_names, start_date, end_date)
+        result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if fmt == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            headers = EXPORT_DATASETS[dataset]['columns']
+            writer.writerow([headers[name][0] for name in column_names])
+            yield buffer.getvalue()
+
+            for batch in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([ExportService._csv_value(value) for value in row] for row in batch)
+                yield buffer.getvalue()
+        else:
+            dumps = current_app.json.dumps
+            for batch in result.partitions():
+                yield ''.join(dumps(dict(row._mapping)) + '\n' for row in batch)
@@ -0,0 +1,179 @@
+"""Facet service - Facet counts for the product catalog
+
+Counts come from a columnar snapshot of active products (one list per facet
+column), rebuilt once per catalog version, and at least every
+CATALOG_SNAPSHOT_TTL seconds (the memory backend's version is per worker,
+so other workers' edits only show up that way). A request only has to fetch the
+ids matching its filters; every facet is then counted in a single pass over
+the snapshot instead of one query per facet.
+"""
+
+from app.extensions import db
+from app.models import Product
+from app.services.cache_service import cache
+from app.services.category_service import CategoryService
+from collections import Counter
+from flask import current_app
+import threading
+import time
+
+# Price bands in the store currency: (min inclusive, max exclusive or None)
+PRICE_BANDS = [
+    (0, 5000),
+    (5000, 10000),
+    (10000, 25000),
+    (25000, 50000),
+    (50000, None),
+]
+
+
+def price_band_label(low, high):
+    return f'{low}+' if high is None else f'{low}-{high}'
+
+
+class CatalogSnapshot:
+    """Columnar copy of the facet columns of all active products"""
+
+    def __init__(self, rows):
+        self.position = {}
+        self.category_id = []
+        self.gender = []
+        self.brand = []
+        self.badge = []
+        self.price_band = []
+        self.accessibility = []
+
+        for row in rows:
+            self.position[row.id] = len(self.category_id)
+            self.category_id.append(row.category_id)
+            self.gender.append(row.gender)
+            self.brand.append(row.brand)
+            self.badge.append(row.badge)
+            self.price_band.append(self._band(float(row.price)))
+            self.accessibility.append(tuple(dict.fromkeys(row.accessibility_features or ())))
+
+    @staticmethod
+    def _band(price):
+        for index, (low, high) in enumerate(PRICE_BANDS):
+            if price >= low and (high is None or price < high):
+                return index
+        return None
+
+
+class FacetService:
+    """Service for computing catalog facet counts"""
+
+    _snapshot = None
+    _version = None
+    _built_at = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _stale(version):
+        ttl = current_app.config.get('CATALOG_SNAPSHOT_TTL', 60)
+        return (
+            FacetService._snapshot is None
+            or FacetService._version != version
+            or time.monotonic() - FacetService._built_at >= ttl
+        )
+
+    @staticmethod
+    def get_snapshot():
+        """Current snapshot, rebuilt when the catalog version changes or it expires"""
+        version = cache.catalog_version()
+        if FacetService._stale(version):
+            with FacetService._lock:
+                if FacetService._stale(version):
+                    rows = db.session.query(
+                        Product.id, Product.category_id, Product.gender, Product.brand,
+                        Product.badge, Product.price, Product.accessibility_features
+                    ).filter(Product.is_active == True).all()
+                    FacetService._snapshot = CatalogSnapshot(rows)
+                    FacetService._version = version
+                    FacetService._built_at = time.monotonic()
+        return FacetService._snapshot
+
+    @staticmethod
+    def compute(product_ids=None):
+        """
+        Facet counts for a set of matching products
+
+        Args:
+            product_ids: Ids matching the current filters, or None for the
+                whole active catalog
+
+        Returns:
+            dict: facet name -> list of {'value', 'count', ...}, most common first
+        """
+        snapshot = FacetService.get_snapshot()
+        if product_ids is None:
+            positions = range(len(snapshot.category_id))
+        else:
+            positions = [snapshot.position[pid] for pid in product_ids if pid in snapshot.position]
+
+        counts = {
+            'category': Counter(),
+            'gender': Counter(),
+            'brand': Counter(),
+            'badge': Counter(),
+            'price': Counter(),
+            'accessibility': Counter(),
+        }
+        for pos in positions:
+            counts['category'][snapshot.category_id[pos]] += 1
+            counts['gender'][snapshot.gender[pos]] += 1
+            counts['brand'][snapshot.brand[pos]] += 1
+            counts['badge'][snapshot.badge[pos]] += 1
+            counts['price'][snapshot.price_band[pos]] += 1
+            counts['accessibility'].update(snapshot.accessibility[pos])
+
+        return {
+            'category': FacetService._category_facet(counts['category']),
+            'gender': FacetService._value_facet(counts['gender']),
+            'brand': FacetService._value_facet(counts['brand']),
+            'badge': FacetService._value_facet(counts['badge']),
+            'price': FacetService._price_facet(counts['price']),
+            'accessibility': FacetService._value_facet(counts['accessibility']),
+        }
+
+    @staticmethod
+    def _value_facet(counter):
+        return [
+            {'value': value, 'count': count}
+            for value, count in counter.most_common()
+            if value is not None
+        ]
+
+    @staticmethod
+    def _price_facet(counter):
+        facet = []
+        for index, (low, high) in enumerate(PRICE_BANDS):
+            if counter[index]:
+                facet.append({
+                    'value': price_band_label(low, high),
+                    'min': low,
+                    'max': high,
+                    'count': counter[index]
+                })
+        return facet
+
+    @staticmethod
+    def _category_facet(counter):
+        """Counts per category slug, rolled up so parents include their subtree"""
+        tree = CategoryService.get_tree()
+        rolled_up = Counter()
+        for category_id, count in counter.items():
+            seen = set()
+            while category_id in tree.by_id and category_id not in seen:
+                seen.add(category_id)
+                rolled_up[category_id] += count
+                category_id = tree.by_id[category_id].parent_id
+
+        return [
+            {
+                'value': tree.by_id[category_id].slug,
+                'label': tree.by_id[category_id].name,
+                'count': count
+            }
+            for category_id, count in rolled_up.most_common()
+        ]
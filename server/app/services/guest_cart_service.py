@@ -0,0 +1,350 @@
+"""Guest cart service - Anonymous carts kept outside the database
+
+Guest carts live in a key-value store keyed by the Flask session's
+cart_session_id and expire after GUEST_CART_TTL seconds of inactivity.
+Browsing and filling a cart costs no SQL writes; a guest cart only reaches
+hisi.cart_items when CartService merges it into a user's cart at login or
+checkout.
+
+Backends (GUEST_CART_BACKEND, defaults to redis):
+    redis:  One Redis hash per session, fields 'q:<product_id>' (quantity)
+            and 'p:<product_id>' (price when added)
+    memory: In-process dict, per worker (local development and tests only:
+            a guest's cart is lost when requests reach another worker)
+
+Redis errors are printed and raised as GuestCartUnavailable, which the
+cart and checkout routes answer with 503: unlike a cache miss there is no
+other copy of a guest cart to fall back on.
+"""
+
+from app.extensions import db
+from app.models import Cart, CartItem, Product
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta
+from decimal import Decimal
+import threading
+import time
+
+
+class GuestCartUnavailable(Exception):
+    """Raised when the guest cart store cannot be reached"""
+
+    def __init__(self):
+        super().__init__('Cart is temporarily unavailable, please try again shortly')
+
+
+class MemoryGuestCartBackend:
+    """
+    Thread-safe in-process guest cart store with TTL
+
+    Expired carts are dropped when read, and abandoned ones are swept from
+    the whole store at most once per sweep_interval seconds on writes.
+    """
+
+    def __init__(self, ttl, sweep_interval=60):
+        self.ttl = ttl
+        self.sweep_interval = min(ttl, sweep_interval)
+        self._carts = {}  # session_id -> (expires_at, {field: value})
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + self.sweep_interval
+
+    def _sweep(self, now):
+        """Delete expired carts (caller holds the lock)"""
+        if now < self._next_sweep:
+            return
+        for session_id in [key for key, (expires_at, _) in self._carts.items() if expires_at <= now]:
+            del self._carts[session_id]
+        self._next_sweep = now + self.sweep_interval
+
+    def _fields(self, session_id, create=False):
+        entry = self._carts.get(session_id)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._carts[session_id]
+            entry = None
+        if entry is None:
+            if not create:
+                return None
+            entry = (0, {})
+        fields = entry[1]
+        if create:
+            now = time.monotonic()
+            self._sweep(now)
+            self._carts[session_id] = (now + self.ttl, fields)
+        return fields
+
+    def get_all(self, session_id):
+        with self._lock:
+            return dict(self._fields(session_id) or {})
+
+    def incr(self, session_id, field, amount):
+        with self._lock:
+            fields = self._fields(session_id, create=True)
+            fields[field] = int(fields.get(field, 0)) + amount
+            return fields[field]
+
+    def set(self, session_id, mapping, only_if_missing=False):
+        with self._lock:
+            fields = self._fields(session_id, create=True)
+            for field, value in mapping.items():
+                if not only_if_missing or field not in fields:
+                    fields[field] = value
+
+    def delete_fields(self, session_id, *fields):
+        with self._lock:
+            stored = self._fields(session_id)
+            if stored is not None:
+                for field in fields:
+                    stored.pop(field, None)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._carts.pop(session_id, None)
+
+
+class RedisGuestCartBackend:
+    """Guest carts as Redis hashes shared by all workers"""
+
+    def __init__(self, url, ttl, prefix='hisi:guest_cart:'):
+        import redis
+
+        self._redis = redis
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get_all(self, session_id):
+        try:
+            return self.client.hgetall(self.prefix + session_id)
+        except self._redis.RedisError as e:
+            print(f"Guest cart read failed: {str(e)}")
+            raise GuestCartUnavailable() from e
+
+    def incr(self, session_id, field, amount):
+        key = self.prefix + session_id
+        try:
+            pipe = self.client.pipeline()
+            pipe.hincrby(key, field, amount)
+            pipe.expire(key, self.ttl)
+            return pipe.execute()[0]
+        except self._redis.RedisError as e:
+            print(f"Guest cart update failed: {str(e)}")
+            raise GuestCartUnavailable() from e
+
+    def set(self, session_id, mapping, only_if_missing=False):
+        key = self.prefix + session_id
+        try:
+            pipe = self.client.pipeline()
+            for field, value in mapping.items():
+                if only_if_missing:
+                    pipe.hsetnx(key, field, value)
+                else:
+                    pipe.hset(key, field, value)
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except self._redis.RedisError as e:
+            print(f"Guest cart update failed: {str(e)}")
+            raise GuestCartUnavailable() from e
+
+    def delete_fields(self, session_id, *fields):
+        if not fields:
+            return
+        try:
+            self.client.hdel(self.prefix + session_id, *fields)
+        except self._redis.RedisError as e:
+            print(f"Guest cart update failed: {str(e)}")
+            raise GuestCartUnavailable() from e
+
+    def delete(self, session_id):
+        try:
+            self.client.delete(self.prefix + session_id)
+        except self._redis.RedisError as e:
+            print(f"Guest cart delete failed: {str(e)}")
+            raise GuestCartUnavailable() from e
+
+
+class GuestCartStore:
+    """Facade over the configured guest cart backend"""
+
+    def __init__(self):
+        self.backend = MemoryGuestCartBackend(ttl=604800)
+
+    def init_app(self, app):
+        """Select the backend from GUEST_CART_BACKEND"""
+        backend = app.config.get('GUEST_CART_BACKEND') or 'redis'
+        ttl = app.config.get('GUEST_CART_TTL', 604800)
+
+        if backend == 'redis':
+            self.backend = RedisGuestCartBackend(app.config['REDIS_URL'], ttl)
+        else:
+            self.backend = MemoryGuestCartBackend(ttl)
+
+        app.extensions['guest_carts'] = self
+
+    def items(self, session_id):
+        """{product_id: (quantity, price)} of a guest cart"""
+        fields = self.backend.get_all(session_id)
+        items = {}
+        for field, value in fields.items():
+            if field.startswith('q:') and int(value) > 0:
+                product_id = field[2:]
+                price = fields.get(f'p:{product_id}')
+                items[product_id] = (int(value), Decimal(price) if price is not None else None)
+        return items
+
+    def add(self, session_id, product_id, quantity, price):
+        self.backend.set(session_id, {f'p:{product_id}': str(price)}, only_if_missing=True)
+        return self.backend.incr(session_id, f'q:{product_id}', quantity)
+
+    def set_quantity(self, session_id, product_id, quantity):
+        self.backend.set(session_id, {f'q:{product_id}': quantity})
+
+    def remove(self, session_id, product_id):
+        self.backend.delete_fields(session_id, f'q:{product_id}', f'p:{product_id}')
+
+    def clear(self, session_id):
+        self.backend.delete(session_id)
+
+
+guest_carts = GuestCartStore()
+
+
+class GuestCartService:
+    """Service for guest carts held in the guest cart store"""
+
+    @staticmethod
+    def _products(product_ids):
+        if not product_ids:
+            return {}
+        return {p.id: p for p in Product.query.filter(Product.id.in_(product_ids)).all()}
+
+    @staticmethod
+    def add_to_cart(session_id, product_id, quantity=1):
+        """Add product to a guest cart; returns (quantity, error)"""
+        product = db.session.get(Product, product_id)
+        if not product:
+            return None, "Product not found"
+
+        if not product.is_active:
+            return None, "Product is not available"
+
+        current = guest_carts.items(session_id).get(product_id, (0, None))[0]
+        if product.stock_quantity < current + quantity:
+            if current:
+                return None, f"Cannot add more. Only {product.stock_quantity} items available"
+            return None, f"Only {product.stock_quantity} items available"
+
+        return guest_carts.add(session_id, product_id, quantity, product.price), None
+
+    @staticmethod
+    def update_cart_item(session_id, product_id, quantity):
+        """Set the quantity of a guest cart line; returns (quantity, error)"""
+        if product_id not in guest_carts.items(session_id):
+            return None, "Cart item not found"
+
+        if quantity <= 0:
+            return None, "Quantity must be greater than 0"
+
+        product = db.session.get(Product, product_id)
+        if not product:
+            return None, "Product not found"
+
+        if product.stock_quantity < quantity:
+            return None, f"Only {product.stock_quantity} items available"
+
+        guest_carts.set_quantity(session_id, product_id, quantity)
+        return quantity, None
+
+    @staticmethod
+    def remove_from_cart(session_id, product_id):
+        """Remove a guest cart line; returns (success, error)"""
+        if product_id not in guest_carts.items(session_id):
+            return False, "Cart item not found"
+
+        guest_carts.remove(session_id, product_id)
+        return True, None
+
+    @staticmethod
+    def clear_cart(session_id):
+        guest_carts.clear(session_id)
+        return True, None
+
+    @staticmethod
+    def validate_cart_stock(session_id):
+        """Validate that all guest cart items are in stock"""
+        items = guest_carts.items(session_id)
+        products = GuestCartService._products(list(items))
+        errors = []
+        for product_id, (quantity, _) in items.items():
+            product = products.get(product_id)
+            if not product or not product.is_active:
+                name = product.name if product else 'A product'
+                errors.append(f"{name} is no longer available")
+            elif product.stock_quantity < quantity:
+                errors.append(
+                    f"{product.name}: Only {product.stock_quantity} available, "
+                    f"but {quantity} in cart"
+                )
+
+        return len(errors) == 0, errors
+
+    @staticmethod
+    def to_dict(session_id):
+        """Guest cart in the same shape as Cart.to_dict()"""
+        items = guest_carts.items(session_id)
+        products = GuestCartService._products(list(items))
+
+        lines = []
+        for product_id, (quantity, price) in items.items():
+            product = products.get(product_id)
+            if product is None:
+                continue  # Product deleted since it was added
+            price = price if price is not None else product.price
+            lines.append({
+                'id': product_id,  # Guest lines are addressed by product id
+                'cart_id': None,
+                'product_id': product_id,
+                'product': {
+                    'id': product.id,
+                    'name': product.name,
+                    'slug': product.slug,
+                    'main_image': product.main_image,
+                    'current_price': product.price,
+                    'stock_quantity': product.stock_quantity,
+                    'accessibility_features': product.accessibility_features
+                },
+                'quantity': quantity,
+                'price': price,
+                'subtotal': price * quantity,
+                'created_at': None
+            })
+
+        return {
+            'id': None,
+            'user_id': None,
+            'item_count': sum(line['quantity'] for line in lines),
+            'total': sum(line['subtotal'] for line in lines),
+            'created_at': None,
+            'updated_at': None,
+            'items': lines
+        }
+
+    @staticmethod
+    def sweep_abandoned(days):
+        """
+        Delete SQL guest carts untouched for the given number of days
+
+        Returns:
+            int: Number of carts deleted
+        """
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=days)
+            abandoned = db.select(Cart.id).where(Cart.user_id.is_(None), Cart.updated_at < cutoff)
+            CartItem.query.filter(CartItem.cart_id.in_(abandoned)).delete(synchronize_session=False)
+            count = Cart.query.filter(
+                Cart.user_id.is_(None), Cart.updated_at < cutoff
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            return count
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
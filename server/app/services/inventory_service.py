@@ -0,0 +1,222 @@
+"""Inventory service - Atomic stock reservation for checkout
+
+Stock is never read, checked and written back from Python. Reserving an
+order's lines is one conditional UPDATE:
+
+    UPDATE products
+    SET stock_quantity = stock_quantity - CASE id WHEN :p1 THEN :q1 ... END
+    WHERE id IN (:p1, ...) AND stock_quantity >= CASE id WHEN :p1 THEN :q1 ... END
+
+If fewer rows match than there are products, at least one line is short
+and the statement is rolled back to a savepoint. Row locks taken by the
+UPDATE serialize concurrent checkouts per product only, so two buyers of
+the last unit cannot both succeed while unrelated checkouts run in parallel.
+
+Each reserved line is recorded as a StockReservation. Releasing claims the
+rows with a conditional status UPDATE first, so a cancel racing the expiry
+sweep returns stock exactly once.
+"""
+
+from app.extensions import db
+from app.models import Product, StockReservation
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta
+import uuid
+
+
+class InventoryService:
+    """Service for reserving and releasing product stock"""
+
+    @staticmethod
+    def _quantities(lines):
+        """Sum (product_id, quantity) pairs per product"""
+        quantities = {}
+        for product_id, quantity in lines:
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        return quantities
+
+    @staticmethod
+    def _quantity_case(quantities):
+        return db.case(quantities, value=Product.id, else_=0)
+
+    @staticmethod
+    def _take(quantities):
+        """The conditional UPDATE; True only if every product had enough stock"""
+        needed = InventoryService._quantity_case(quantities)
+        result = db.session.execute(
+            db.update(Product)
+            .where(Product.id.in_(quantities), Product.stock_quantity >= needed)
+            .values(stock_quantity=Product.stock_quantity - needed)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == len(quantities)
+
+    @staticmethod
+    def decrement_stock(lines):
+        """
+        Take stock for several products in one conditional UPDATE
+
+        Does not commit. On failure nothing has been decremented.
+
+        Args:
+            lines: Iterable of (product_id, quantity)
+
+        Returns:
+            tuple: (success, short_product_ids)
+        """
+        quantities = InventoryService._quantities(lines)
+        if not quantities:
+            return True, []
+
+        with db.session.begin_nested() as savepoint:
+            if InventoryService._take(quantities):
+                return True, []
+            # Undo the lines that did match before reporting the short ones
+            savepoint.rollback()
+
+        short = db.session.query(Product.id).filter(
+            Product.id.in_(quantities),
+            Product.stock_quantity < InventoryService._quantity_case(quantities)
+        ).all()
+        return False, [row.id for row in short]
+
+    @staticmethod
+    def increment_stock(lines):
+        """Return stock for several products in one UPDATE (does not commit)"""
+        quantities = InventoryService._quantities(lines)
+        if not quantities:
+            return
+
+        db.session.execute(
+            db.update(Product)
+            .where(Product.id.in_(quantities))
+            .values(stock_quantity=Product.stock_quantity + InventoryService._quantity_case(quantities))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def reserve(order, lines):
+        """
+        Take stock for an order and record the reservations
+
+        Does not commit, so the reservation shares the order's transaction.
+
+        Args:
+            order: Flushed Order
+            lines: Iterable of (product_id, quantity)
+
+        Returns:
+            tuple: (success, short_product_ids)
+        """
+        quantities = InventoryService._quantities(lines)
+        success, short = InventoryService.decrement_stock(quantities.items())
+        if not success:
+            return False, short
+
+        minutes = current_app.config.get('STOCK_RESERVATION_MINUTES', 30)
+        now = datetime.utcnow()
+        db.session.execute(db.insert(StockReservation.__table__).values([
+            {
+                'id': str(uuid.uuid4()),
+                'order_id': order.id,
+                'product_id': product_id,
+                'quantity': quantity,
+                'status': 'active',
+                'expires_at': now + timedelta(minutes=minutes),
+                'created_at': now
+            }
+            for product_id, quantity in quantities.items()
+        ]))
+        return True, []
+
+    @staticmethod
+    def _claim(condition, from_statuses, to_status):
+        """
+        Move matching reservations to to_status and return what was claimed
+
+        The status check is part of the UPDATE, so concurrent callers can
+        never claim the same reservation twice.
+        """
+        rows = db.session.execute(
+            db.update(StockReservation)
+            .where(condition, StockReservation.status.in_(from_statuses))
+            .values(status=to_status, released_at=None if to_status == 'committed' else datetime.utcnow())
+            .returning(StockReservation.product_id, StockReservation.quantity)
+            .execution_options(synchronize_session=False)
+        ).all()
+        return [(row.product_id, row.quantity) for row in rows]
+
+    @staticmethod
+    def release_order(order_id, include_committed=False):
+        """
+        Return an order's reserved stock (does not commit)
+
+        Args:
+            order_id: Order ID
+            include_committed: Also return stock for paid reservations
+                (order cancellation); payment failure only releases active ones
+
+        Returns:
+            bool: True if the order had reservations to release
+        """
+        statuses = ['active', 'committed'] if include_committed else ['active']
+        claimed = InventoryService._claim(StockReservation.order_id == order_id, statuses, 'released')
+        InventoryService.increment_stock(claimed)
+        return bool(claimed)
+
+    @staticmethod
+    def has_reservations(order_id):
+        """Whether the order was placed through the reservation engine"""
+        return db.session.query(
+            StockReservation.query.filter_by(order_id=order_id).exists()
+        ).scalar()
+
+    @staticmethod
+    def commit_order(order_id):
+        """
+        Keep an order's stock after payment (does not commit)
+
+        Active reservations become permanent. Reservations that expired or
+        were released before the payment arrived are taken again if stock
+        allows.
+
+        Returns:
+            tuple: (success, short_product_ids); on failure the lapsed
+                reservations are left as they were and nothing is taken
+        """
+        InventoryService._claim(StockReservation.order_id == order_id, ['active'], 'committed')
+
+        with db.session.begin_nested() as savepoint:
+            lapsed = InventoryService._claim(
+                StockReservation.order_id == order_id, ['expired', 'released'], 'committed'
+            )
+            if not lapsed:
+                return True, []
+
+            success, short = InventoryService.decrement_stock(lapsed)
+            if success:
+                return True, []
+            # Leave the lapsed reservations as they were
+            savepoint.rollback()
+
+        print(f"Order {order_id} was paid after its stock reservation lapsed and stock is now short")
+        return False, short
+
+    @staticmethod
+    def release_expired(now=None):
+        """
+        Return stock held by unpaid reservations past their expiry
+
+        Returns:
+            int: Number of reservations expired
+        """
+        try:
+            now = now or datetime.utcnow()
+            claimed = InventoryService._claim(StockReservation.expires_at <= now, ['active'], 'expired')
+            InventoryService.increment_stock(claimed)
+            db.session.commit()
+            return len(claimed)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
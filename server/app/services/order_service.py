@@ -1,37 +1,72 @@
 """Order service - Business logic for orders"""
 
 from app.extensions import db
-from app.models import Order, OrderItem, Product, Cart
+from app.models import Order, OrderItem, Cart, CartItem, User
+from app.models.order import order_number_seq
+from app.services.inventory_service import InventoryService
 from datetime import datetime
+from decimal import Decimal
 from sqlalchemy.exc import SQLAlchemyError
 import uuid
-import random
 
 
 class OrderService:
     """Service for managing orders"""
 
+    @staticmethod
+    def customer_fields(user):
+        """
+        Customer columns copied onto a user's orders
+
+        Admin order search matches these on the orders table alone, so they
+        are kept in step with the user's email and name (see
+        _sync_order_customer_fields).
+        """
+        return {
+            'customer_email': user.email,
+            'customer_name': ' '.join(filter(None, [user.first_name, user.last_name])) or None
+        }
+
     @staticmethod
     def generate_order_number():
-        """Generate unique order number"""
+        """
+        Generate unique order number, e.g. HS-20260125-000042
+
+        The suffix comes from the hisi.order_number_seq sequence, so numbers
+        are unique without retries and increase in insertion order. The date
+        part is informational only.
+        """
         prefix = "HS"
         timestamp = datetime.utcnow().strftime("%Y%m%d")
-        random_num = random.randint(1000, 9999)
-        return f"{prefix}-{timestamp}-{random_num}"
+
+        if db.session.get_bind().dialect.name == 'postgresql':
+            number = db.session.execute(db.select(order_number_seq.next_value())).scalar()
+        else:
+            # No sequences (SQLite in development): continue after the highest
+            # suffix issued so far. Not safe under concurrency: two
+            # transactions can read the same maximum before either inserts,
+            # and the second INSERT then fails on the unique order_number
+            highest = db.session.query(
+                db.func.max(db.cast(db.func.substr(Order.order_number, 13), db.Integer))
+            ).scalar()
+            number = (highest or 0) + 1
+
+        return f"{prefix}-{timestamp}-{number:06d}"
 
     @staticmethod
     def create_order_from_cart(cart, user, shipping_address, billing_address=None, notes=None):
-        """Create order from cart items"""
+        """
+        Create order from cart items
+
+        The statement count does not grow with the number of lines: one
+        order number lookup and one INSERT for the order, one conditional stock UPDATE plus one INSERT
+        for the reservations, one multi-row INSERT for the items and one
+        DELETE for the cart lines.
+        """
         try:
             if not cart.items:
                 return None, "Cart is empty"
 
-            # Validate stock
-            for item in cart.items:
-                product = item.product
-                if product.stock_quantity < item.quantity:
-                    return None, f"{product.name} is out of stock"
-
             # Calculate totals
             subtotal = cart.get_total()
             shipping_cost = OrderService.calculate_shipping(shipping_address)
@@ -43,6 +78,7 @@ class OrderService:
             order = Order(
                 order_number=OrderService.generate_order_number(),
                 user_id=user.id,
+                **OrderService.customer_fields(user),
                 status='pending',
                 payment_status='pending',
                 subtotal=subtotal,
@@ -58,28 +94,40 @@ class OrderService:
             db.session.add(order)
             db.session.flush()  # Get order ID
 
-            # Create order items
-            for cart_item in cart.items:
-                order_item = OrderItem(
-                    order_id=order.id,
-                    product_id=cart_item.product_id,
-                    product_name=cart_item.product.name,
-                    product_sku=cart_item.product.sku,
-                    product_image=cart_item.product.main_image,
-                    unit_price=cart_item.price_at_addition,
-                    quantity=cart_item.quantity,
-                    subtotal=cart_item.get_subtotal()
-                )
-                db.session.add(order_item)
-
-                # Reduce stock
-                cart_item.product.stock_quantity -= cart_item.quantity
-
-            # Clear cart
-            for item in cart.items:
-                db.session.delete(item)
+            # Reserve stock for every line in one conditional UPDATE
+            reserved, short = InventoryService.reserve(
+                order, [(item.product_id, item.quantity) for item in cart.items]
+            )
+            if not reserved:
+                db.session.rollback()
+                names = [item.product.name for item in cart.items if item.product_id in short]
+                return None, f"{', '.join(names) or 'An item'} is out of stock"
+
+            # Create order items in one multi-row INSERT
+            now = datetime.utcnow()
+            db.session.execute(db.insert(OrderItem.__table__).values([
+                {
+                    'id': str(uuid.uuid4()),
+                    'order_id': order.id,
+                    'product_id': cart_item.product_id,
+                    'product_name': cart_item.product.name,
+                    'product_sku': cart_item.product.sku,
+                    'product_image': cart_item.product.main_image,
+                    'unit_price': cart_item.price_at_addition,
+                    'quantity': cart_item.quantity,
+                    'subtotal': cart_item.get_subtotal(),
+                    'created_at': now
+                }
+                for cart_item in cart.items
+            ]))
+
+            # Clear cart in one DELETE
+            cart_id = cart.id  # Read before commit expires the cart
+            CartItem.query.filter_by(cart_id=cart_id).delete(synchronize_session=False)
+            db.session.expire(cart, ['items'])
 
             db.session.commit()
+            Cart.forget_totals(cart_id)
             return order, None
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -90,9 +138,9 @@ class OrderService:
         """Calculate shipping cost based on address"""
         # Simple flat rate for now
         if address.get('country', '').lower() in ['nigeria', 'kenya']:
-            return 1500.00  # Local shipping
+            return Decimal('1500.00')  # Local shipping
         else:
-            return 5000.00  # International shipping
+            return Decimal('5000.00')  # International shipping
 
     @staticmethod
     def update_order_status(order_id, new_status, admin_notes=None):
@@ -102,7 +150,7 @@ class OrderService:
             if not order:
                 return None, "Order not found"
 
-            valid_statuses = ['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled']
+            valid_statuses = ['pending', 'confirmed', 'on_hold', 'processing', 'shipped', 'delivered', 'cancelled']
             if new_status not in valid_statuses:
                 return None, f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
 
@@ -135,11 +183,17 @@ class OrderService:
             if order.status in ['shipped', 'delivered']:
                 return None, "Cannot cancel order that has been shipped or delivered"
 
+            if order.status == 'cancelled':
+                return None, "Order is already cancelled"
+
             # Restore stock
-            for item in order.items:
-                product = Product.query.get(item.product_id)
-                if product:
-                    product.stock_quantity += item.quantity
+            if InventoryService.has_reservations(order.id):
+                InventoryService.release_order(order.id, include_committed=True)
+            else:
+                # Orders placed before stock reservations
+                InventoryService.increment_stock(
+                    (item.product_id, item.quantity) for item in order.items
+                )
 
             order.status = 'cancelled'
             if reason:
@@ -165,3 +219,15 @@ class OrderService:
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
+
+
+@db.event.listens_for(User, 'after_update')
+def _sync_order_customer_fields(mapper, connection, target):
+    state = db.inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ('email', 'first_name', 'last_name')):
+        # Same connection and transaction as the user's UPDATE
+        connection.execute(
+            db.update(Order.__table__)
+            .where(Order.__table__.c.user_id == target.id)
+            .values(**OrderService.customer_fields(target))
+        )
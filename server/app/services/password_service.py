@@ -0,0 +1,119 @@
+"""Password service - Password hashing off the request threads
+
+Hashing and verifying passwords (scrypt/pbkdf2) pins a CPU for tens to
+hundreds of milliseconds. Request handlers hand that work to a small
+dedicated thread pool (PASSWORD_HASH_WORKERS threads; hashlib releases the
+GIL while hashing) instead of doing it inline, so a burst of logins can use
+at most that many cores and catalog requests keep being served.
+
+Backpressure: at most PASSWORD_HASH_QUEUE jobs wait for a free hashing
+thread. Beyond that, submitting raises PasswordHasherBusy straight away and
+the route answers 503 with a Retry-After header, rather than queueing
+requests behind an ever-growing backlog.
+
+Every hash stores its own algorithm and cost in werkzeug's format
+('scrypt:32768:8:1$<salt>$<hash>'). PASSWORD_HASH_METHOD sets the
+parameters for new hashes; a successful verification against a hash with
+other parameters returns a replacement hash, so stored hashes upgrade as
+users log in.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+import threading
+
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing queue is full')
+        self.retry_after = retry_after
+
+
+def hash_method(password_hash):
+    """Algorithm and cost part of a stored hash ('scrypt:32768:8:1')"""
+    return password_hash.split('$', 1)[0]
+
+
+class PasswordHasher:
+    """Bounded thread pool for password hashing"""
+
+    def __init__(self):
+        self.method = DEFAULT_HASH_METHOD
+        self.retry_after = 1
+        self._executor = None
+        self._slots = None
+        # Canonical form of self.method as written in hashes ('scrypt' is
+        # stored as 'scrypt:32768:8:1'), learnt from the first new hash
+        self._current_method = None
+
+    def init_app(self, app):
+        """Size the pool from PASSWORD_HASH_WORKERS and PASSWORD_HASH_QUEUE"""
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        queue = app.config.get('PASSWORD_HASH_QUEUE', 32)
+
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+        self.retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER', 1)
+        self._current_method = None
+        # Threads are only started on the first job, so this is safe to
+        # create before a pre-forking server forks its workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+        app.extensions['passwords'] = self
+
+    def _run(self, fn, *args):
+        """Run fn on the pool and wait for it, or raise PasswordHasherBusy"""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy(self.retry_after)
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def _generate(self, password):
+        password_hash = generate_password_hash(password, method=self.method)
+        self._current_method = hash_method(password_hash)
+        return password_hash
+
+    def _verify(self, password_hash, password):
+        if not check_password_hash(password_hash, password):
+            return False, None
+        if hash_method(password_hash) == self._current_method:
+            return True, None
+
+        new_hash = self._generate(password)
+        if hash_method(new_hash) == hash_method(password_hash):
+            return True, None  # Already current; only self.method's spelling differed
+        return True, new_hash
+
+    def hash(self, password):
+        """
+        Hash a password with PASSWORD_HASH_METHOD
+
+        Raises:
+            PasswordHasherBusy: If the hashing queue is full
+        """
+        return self._run(self._generate, password)
+
+    def verify(self, password_hash, password):
+        """
+        Check a password against a stored hash
+
+        Returns:
+            tuple: (matches, new_hash) where new_hash replaces a hash made
+                with outdated parameters (None when no upgrade is needed)
+
+        Raises:
+            PasswordHasherBusy: If the hashing queue is full
+        """
+        return self._run(self._verify, password_hash, password)
+
+
+passwords = PasswordHasher()
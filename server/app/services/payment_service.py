@@ -1,7 +1,8 @@
 """Payment service - Business logic for payment processing with Flutterwave"""
 
 from app.extensions import db
-from app.models import Payment, Order
+from app.models import Payment, Order, Product, User, Notification
+from app.services.inventory_service import InventoryService
 from flask import current_app
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
@@ -131,6 +132,44 @@ class PaymentService:
             db.session.rollback()
             return None, f"Unexpected error: {str(e)}"
 
+    @staticmethod
+    def confirm_paid_order(order):
+        """
+        Confirm a paid order and keep its stock (does not commit)
+
+        If the stock reservation lapsed before the payment arrived and the
+        stock has since been sold, the order is put 'on_hold' instead of
+        'confirmed', with a note naming the short products, and every admin
+        gets a notification to restock or refund it.
+
+        Returns:
+            bool: True if the order was confirmed
+        """
+        order.payment_status = 'completed'
+        committed, short = InventoryService.commit_order(order.id)
+        if committed:
+            order.status = 'confirmed'
+            order.confirmed_at = datetime.utcnow()
+            return True
+
+        names = [name for name, in db.session.query(Product.name).filter(Product.id.in_(short))]
+        note = f"Paid after the stock reservation lapsed; out of stock: {', '.join(names) or 'unknown'}"
+        order.status = 'on_hold'
+        order.admin_notes = f"{order.admin_notes}\n{note}" if order.admin_notes else note
+
+        admin_ids = db.session.query(User.id).filter(User.role.in_(['admin', 'content_manager', 'super_admin']))
+        db.session.add_all([
+            Notification(
+                user_id=admin_id,
+                type='system',
+                title=f'Paid order {order.order_number} is on hold',
+                message=f'{note}. Restock or refund the order.',
+                link=f'/admin/orders/{order.id}'
+            )
+            for admin_id, in admin_ids
+        ])
+        return False
+
     @staticmethod
     def verify_payment(transaction_id):
         """
@@ -182,21 +221,20 @@ class PaymentService:
                         payment.payment_metadata = transaction_data
 
                         # Update order status
-                        order = payment.order
-                        order.payment_status = 'completed'
-                        order.status = 'confirmed'
-                        order.confirmed_at = datetime.utcnow()
+                        PaymentService.confirm_paid_order(payment.order)
 
                         db.session.commit()
                         return payment, None
                     else:
                         payment.status = 'failed'
                         payment.failure_reason = "Amount mismatch"
+                        InventoryService.release_order(payment.order_id)
                         db.session.commit()
                         return None, "Payment amount does not match order total"
                 else:
                     payment.status = 'failed'
                     payment.failure_reason = transaction_data.get('status')
+                    InventoryService.release_order(payment.order_id)
                     db.session.commit()
                     return None, f"Payment {transaction_data.get('status')}"
             else:
@@ -255,16 +293,15 @@ class PaymentService:
                         payment.payment_metadata = transaction_data
 
                         # Update order
-                        order = payment.order
-                        order.payment_status = 'completed'
-                        order.status = 'confirmed'
-                        order.confirmed_at = datetime.utcnow()
+                        PaymentService.confirm_paid_order(payment.order)
                     else:
                         payment.status = 'failed'
                         payment.failure_reason = "Amount mismatch"
+                        InventoryService.release_order(payment.order_id)
                 elif status == 'failed':
                     payment.status = 'failed'
                     payment.failure_reason = transaction_data.get('processor_response', 'Payment failed')
+                    InventoryService.release_order(payment.order_id)
                 else:
                     payment.status = status
 
@@ -406,9 +443,10 @@ class PaymentService:
             payment.status = 'cancelled'
             payment.failure_reason = reason or "Payment cancelled by user"
 
-            # Update order
+            # Update order and return its held stock
             order = payment.order
             order.payment_status = 'cancelled'
+            InventoryService.release_order(order.id)
 
             db.session.commit()
             return True, None
@@ -0,0 +1,141 @@
+"""Review service - Rating summaries and review cache invalidation
+
+Rating statistics are read from product_rating_summary, a running total
+per product plus a site-wide row (product_id NULL, kept to one row by a
+partial unique index so concurrent first approvals cannot both insert
+it). Approving or unapproving a review applies a +1/-1 delta in the same
+transaction, so a stats read is a single-row lookup regardless of the
+number of reviews.
+"""
+
+from app.extensions import db
+from app.models import Review, ProductRatingSummary
+from app.services.cache_service import cache, catalog_cache_key
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from datetime import datetime
+
+# Namespace of the cached product detail bundle (products.get_product_bundle)
+PRODUCT_BUNDLE_NAMESPACE = 'product_bundle'
+
+
+class ReviewService:
+    """Service for review statistics"""
+
+    @staticmethod
+    def get_rating_summary(product_id=None):
+        """
+        Rating summary of approved reviews
+
+        Args:
+            product_id: Limit to one product, or None for every review
+
+        Returns:
+            dict: total_reviews, average_rating, rating_distribution
+        """
+        summary = ProductRatingSummary.query.filter(
+            ReviewService._match(product_id)
+        ).first()
+        if not summary:
+            return {
+                'total_reviews': 0,
+                'average_rating': 0,
+                'rating_distribution': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+            }
+        return summary.to_dict()
+
+    @staticmethod
+    def record_approval_change(review, approved):
+        """
+        Add or remove a review from the rating summaries
+
+        Call when review.is_approved flips, before committing, so the
+        summary update shares the moderation transaction.
+
+        Args:
+            review: The moderated review
+            approved: True if it became approved, False if it was unapproved
+                or an approved review is being deleted
+        """
+        delta = 1 if approved else -1
+        ReviewService._increment(None, review.rating, delta)
+        if review.product_id:
+            ReviewService._increment(review.product_id, review.rating, delta)
+
+    @staticmethod
+    def _match(product_id):
+        if product_id is None:
+            return ProductRatingSummary.product_id.is_(None)
+        return ProductRatingSummary.product_id == product_id
+
+    @staticmethod
+    def _increment(product_id, rating, delta):
+        """Atomically apply delta to one summary row, creating it if needed"""
+        star = f'star_{rating}'
+        values = {
+            'review_count': ProductRatingSummary.review_count + delta,
+            'rating_sum': ProductRatingSummary.rating_sum + delta * rating,
+            star: getattr(ProductRatingSummary, star) + delta,
+            'updated_at': datetime.utcnow(),
+        }
+        statement = db.update(ProductRatingSummary).where(
+            ReviewService._match(product_id)
+        ).values(**values).execution_options(synchronize_session=False)
+
+        if db.session.execute(statement).rowcount or delta < 0:
+            # A missing row on removal means drift; the rebuild command repairs it
+            return
+
+        try:
+            with db.session.begin_nested():
+                db.session.add(ProductRatingSummary(
+                    product_id=product_id, review_count=1, rating_sum=rating,
+                    **{f'star_{i}': int(i == rating) for i in range(1, 6)}
+                ))
+        except IntegrityError:
+            # Another transaction created the row first
+            db.session.execute(statement)
+
+    @staticmethod
+    def rebuild_rating_summaries():
+        """
+        Recompute every rating summary from the reviews table
+
+        Used for the initial backfill and to repair drift.
+
+        Returns:
+            int: Number of summary rows written
+        """
+        try:
+            rows = db.session.query(
+                Review.product_id, Review.rating, db.func.count(Review.id)
+            ).filter(
+                Review.is_approved == True
+            ).group_by(Review.product_id, Review.rating).all()
+
+            summaries = {None: ProductRatingSummary(product_id=None)}
+            for product_id, rating, count in rows:
+                if rating not in range(1, 6):
+                    continue
+                targets = [None] if product_id is None else [None, product_id]
+                for target in targets:
+                    summary = summaries.get(target)
+                    if summary is None:
+                        summary = summaries[target] = ProductRatingSummary(product_id=target)
+                    summary.review_count = (summary.review_count or 0) + count
+                    summary.rating_sum = (summary.rating_sum or 0) + rating * count
+                    star = f'star_{rating}'
+                    setattr(summary, star, (getattr(summary, star) or 0) + count)
+
+            ProductRatingSummary.query.delete()
+            db.session.add_all(summaries.values())
+            db.session.commit()
+            return len(summaries)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def invalidate_product(product_id):
+        """Drop cached data derived from a product's reviews"""
+        if product_id:
+            cache.delete(catalog_cache_key(PRODUCT_BUNDLE_NAMESPACE, {'product_id': product_id}))
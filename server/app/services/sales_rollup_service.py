@@ -0,0 +1,311 @@
+"""Sales rollup service - Daily sales totals for closed days
+
+hisi.daily_sales_rollup holds one row per closed UTC day (orders, revenue,
+new/returning customers, payment counts and amounts) and
+hisi.daily_product_sales_rollup the units and revenue per product and day.
+Analytics read closed days from these tables and aggregate raw orders and
+payments for the current day only.
+
+Rows are maintained incrementally:
+    - Days are backfilled by the rebuild-sales-rollups CLI command (run it
+      after deploying, then daily from cron so yesterday gets its row).
+    - Inserting, updating or deleting an order or payment created on a
+      closed day (cancellation, refund, late payment) re-aggregates that
+      day inside the same transaction, just before it commits. On
+      PostgreSQL the day's row is locked first, so two transactions
+      changing the same day refresh it one after the other and the second
+      aggregates over the first one's committed rows.
+
+Reads never write: closed days that have no row yet are aggregated live
+(read_missing) until the backfill reaches them.
+
+Refreshing any number of days costs a fixed number of statements: five
+grouped SELECTs over the raw tables, then upserts keyed by day.
+"""
+
+from app.extensions import db
+from app.models import Order, OrderItem, Payment, User, DailySalesRollup, DailyProductSalesRollup
+from app.utils.sql import upsert_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, object_session
+from datetime import date, datetime, time, timedelta
+import uuid
+
+ROLLUP_METRICS = (
+    'orders', 'gross_revenue', 'net_revenue', 'new_customers', 'returning_customers',
+    'payments', 'successful_payments', 'pending_payments', 'failed_payments',
+    'successful_amount', 'refunded_amount'
+)
+
+# Days refreshed per batch of statements (keeps bind parameter counts low)
+REFRESH_BATCH_DAYS = 100
+
+
+def _as_date(value):
+    """date() of a SQL day value (a date on PostgreSQL, a string on SQLite)"""
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _count_if(condition):
+    return db.func.coalesce(db.func.sum(db.case((condition, 1), else_=0)), 0)
+
+
+def _sum_if(condition, column):
+    return db.func.coalesce(db.func.sum(db.case((condition, column), else_=0)), 0)
+
+
+class SalesRollupService:
+    """Service for building and reading daily sales rollups"""
+
+    @staticmethod
+    def today():
+        """Current UTC day; rollups only exist for days before it"""
+        return datetime.utcnow().date()
+
+    @staticmethod
+    def _aggregate(first_day, last_day):
+        """
+        Aggregate raw orders, users and payments for a range of days
+
+        Returns:
+            tuple: ({day: {metric: value}}, [product row dicts])
+        """
+        start = datetime.combine(first_day, time.min)
+        end = datetime.combine(last_day + timedelta(days=1), time.min)
+        metrics = {}
+
+        def merge(rows, names):
+            for row in rows:
+                values = metrics.setdefault(_as_date(row[0]), {})
+                values.update(zip(names, row[1:]))
+
+        order_day = db.func.date(Order.created_at).label('day')
+        in_orders_range = db.and_(Order.created_at >= start, Order.created_at < end)
+        merge(db.session.query(
+            order_day,
+            db.func.count(Order.id),
+            db.func.coalesce(db.func.sum(Order.total), 0),
+            _sum_if(Order.status != 'cancelled', Order.total)
+        ).filter(in_orders_range).group_by(order_day).all(), ('orders', 'gross_revenue', 'net_revenue'))
+
+        user_day = db.func.date(User.created_at).label('day')
+        merge(db.session.query(user_day, db.func.count(User.id)).filter(
+            User.role == 'customer', User.created_at >= start, User.created_at < end
+        ).group_by(user_day).all(), ('new_customers',))
+
+        repeat_buyers = db.session.query(order_day, Order.user_id).filter(in_orders_range).group_by(
+            order_day, Order.user_id
+        ).having(db.func.count(Order.id) > 1).subquery()
+        merge(db.session.query(
+            repeat_buyers.c.day, db.func.count()
+        ).group_by(repeat_buyers.c.day).all(), ('returning_customers',))
+
+        payment_day = db.func.date(Payment.created_at).label('day')
+        merge(db.session.query(
+            payment_day,
+            db.func.count(Payment.id),
+            _count_if(Payment.status == 'successful'),
+            _count_if(Payment.status == 'pending'),
+            _count_if(Payment.status == 'failed'),
+            _sum_if(Payment.status == 'successful', Payment.amount),
+            _sum_if(Payment.status == 'refunded', Payment.amount)
+        ).filter(
+            Payment.created_at >= start, Payment.created_at < end
+        ).group_by(payment_day).all(), (
+            'payments', 'successful_payments', 'pending_payments', 'failed_payments',
+            'successful_amount', 'refunded_amount'
+        ))
+
+        products = [{
+            'day': _as_date(row.day),
+            'product_id': row.product_id,
+            'product_name': row.product_name,
+            'units': row.units,
+            'revenue': row.revenue
+        } for row in db.session.query(
+            order_day,
+            OrderItem.product_id,
+            db.func.max(OrderItem.product_name).label('product_name'),
+            db.func.sum(OrderItem.quantity).label('units'),
+            db.func.sum(OrderItem.subtotal).label('revenue')
+        ).join(Order, Order.id == OrderItem.order_id).filter(in_orders_range).group_by(
+            order_day, OrderItem.product_id
+        ).all()]
+
+        return metrics, products
+
+    @staticmethod
+    def _lock_days(days, now):
+        """
+        Lock the rollup rows of the days until commit (PostgreSQL)
+
+        Under READ COMMITTED every statement after the lock sees whatever
+        the previous holder committed, so the aggregate that follows
+        includes it. Missing rows are inserted first (zeros, overwritten by
+        the refresh) so there is a row to lock. SQLite needs neither: a
+        transaction that writes holds the database lock until it commits.
+        """
+        if db.engine.dialect.name != 'postgresql':
+            return
+        placeholders = [
+            dict(dict.fromkeys(ROLLUP_METRICS, 0), id=str(uuid.uuid4()), day=day, refreshed_at=now)
+            for day in days
+        ]
+        db.session.execute(upsert_insert(DailySalesRollup.__table__).values(placeholders).on_conflict_do_nothing(
+            index_elements=['day']
+        ))
+        db.session.execute(
+            db.select(DailySalesRollup.id).where(DailySalesRollup.day.in_(days)).order_by(
+                DailySalesRollup.day
+            ).with_for_update()
+        )
+
+    @staticmethod
+    def _refresh_batch(days):
+        now = datetime.utcnow()
+        SalesRollupService._lock_days(days, now)
+        metrics, products = SalesRollupService._aggregate(days[0], days[-1])
+        wanted = set(days)
+
+        rows = []
+        for day in days:
+            values = metrics.get(day, {})
+            row = {name: values.get(name) or 0 for name in ROLLUP_METRICS}
+            row.update(id=str(uuid.uuid4()), day=day, refreshed_at=now)
+            rows.append(row)
+
+        statement = upsert_insert(DailySalesRollup.__table__).values(rows)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=['day'],
+            set_={name: statement.excluded[name] for name in ROLLUP_METRICS + ('refreshed_at',)}
+        ))
+
+        product_rows = [
+            dict(row, id=str(uuid.uuid4()), refreshed_at=now) for row in products if row['day'] in wanted
+        ]
+        if product_rows:
+            statement = upsert_insert(DailyProductSalesRollup.__table__).values(product_rows)
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=['day', 'product_id'],
+                set_={name: statement.excluded[name] for name in ('product_name', 'units', 'revenue', 'refreshed_at')}
+            ))
+
+        # Products no longer sold on these days (order deleted)
+        db.session.execute(
+            db.delete(DailyProductSalesRollup).where(
+                DailyProductSalesRollup.day.in_(days), DailyProductSalesRollup.refreshed_at != now
+            ).execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def refresh_days(days):
+        """
+        Re-aggregate the given closed days (does not commit)
+
+        Returns:
+            int: Number of days refreshed
+        """
+        today = SalesRollupService.today()
+        days = sorted(day for day in set(days) if day < today)
+        for i in range(0, len(days), REFRESH_BATCH_DAYS):
+            SalesRollupService._refresh_batch(days[i:i + REFRESH_BATCH_DAYS])
+        return len(days)
+
+    @staticmethod
+    def read_missing(first_day, last_day):
+        """
+        Aggregate, without writing, the closed days in a range that have no
+        rollup row yet
+
+        Costs one SELECT when every day has a row, five more otherwise.
+
+        Returns:
+            tuple: ({day: {metric: value}}, [product row dicts]) for the
+                missing days only
+        """
+        last_day = min(last_day, SalesRollupService.today() - timedelta(days=1))
+        if first_day > last_day:
+            return {}, []
+
+        existing = {_as_date(row.day) for row in db.session.query(DailySalesRollup.day).filter(
+            DailySalesRollup.day.between(first_day, last_day)
+        ).all()}
+        missing = {
+            first_day + timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        } - existing
+        if not missing:
+            return {}, []
+
+        metrics, products = SalesRollupService._aggregate(min(missing), max(missing))
+        return (
+            {day: values for day, values in metrics.items() if day in missing},
+            [row for row in products if row['day'] in missing]
+        )
+
+    @staticmethod
+    def rebuild(first_day=None, last_day=None):
+        """
+        Re-aggregate every closed day from the raw tables
+
+        Args:
+            first_day: Defaults to the day of the oldest order, payment or user
+            last_day: Defaults to yesterday
+
+        Returns:
+            int: Number of days rebuilt
+        """
+        try:
+            if first_day is None:
+                oldest = [
+                    db.session.query(db.func.min(column)).scalar()
+                    for column in (Order.created_at, Payment.created_at, User.created_at)
+                ]
+                oldest = [value for value in oldest if value is not None]
+                if not oldest:
+                    return 0
+                first_day = min(oldest).date()
+            last_day = last_day or SalesRollupService.today() - timedelta(days=1)
+
+            count = SalesRollupService.refresh_days(
+                first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)
+            )
+            db.session.commit()
+            return count
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+
+@db.event.listens_for(Order, 'after_insert')
+@db.event.listens_for(Order, 'after_update')
+@db.event.listens_for(Order, 'after_delete')
+@db.event.listens_for(Payment, 'after_insert')
+@db.event.listens_for(Payment, 'after_update')
+@db.event.listens_for(Payment, 'after_delete')
+def _mark_rollup_day(mapper, connection, target):
+    session = object_session(target)
+    if session is None or target.created_at is None:
+        return
+    day = target.created_at.date()
+    if day < SalesRollupService.today():
+        session.info.setdefault('sales_rollup_days', set()).add(day)
+
+
+@db.event.listens_for(Session, 'before_commit')
+def _refresh_marked_days(session):
+    # Flush first: commit only flushes after this hook, and the flush is
+    # what marks the days
+    session.flush()
+    days = session.info.pop('sales_rollup_days', None)
+    if days:
+        SalesRollupService.refresh_days(days)
+
+
+@db.event.listens_for(Session, 'after_rollback')
+def _discard_marked_days(session):
+    session.info.pop('sales_rollup_days', None)
@@ -0,0 +1,259 @@
+"""Search service - Full-text product search
+
+On PostgreSQL, search runs against the GIN expression indexes created by the
+``add_product_search_indexes`` migration (a weighted tsvector over name and
+descriptions, plus a trigram index on name). Postgres maintains those indexes
+itself on every insert/update/delete.
+
+Other databases (SQLite test runs) fall back to an in-process inverted index
+that is built lazily from the products table and kept in sync by the product
+routes through ``on_product_saved`` / ``on_product_deleted``.
+"""
+
+from app.extensions import db
+from app.models import Product
+from bisect import bisect_left
+from collections import defaultdict
+from sqlalchemy import func, literal_column, case
+import re
+import threading
+
+# Tokens are lower-cased alphanumeric runs; keep in sync with the 'simple'
+# text search configuration used on Postgres
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Field weights used by both backends (name matches rank above descriptions)
+FIELD_WEIGHTS = {
+    'name': 1.0,
+    'short_description': 0.4,
+    'description': 0.4,
+}
+
+# Minimum trigram similarity for fuzzy name matches on Postgres
+# (pg_trgm.similarity_threshold for the '%' operator)
+TRIGRAM_THRESHOLD = 0.3
+
+
+def tokenize(text):
+    """Split text into lower-cased search tokens"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def search_document():
+    """
+    Weighted tsvector expression for a product.
+
+    Must stay identical to the expression indexed by the migration,
+    otherwise Postgres will not use the index.
+    """
+    config = literal_column("'simple'::regconfig")
+    return (
+        func.setweight(func.to_tsvector(config, func.coalesce(Product.name, '')), literal_column("'A'"))
+        .op('||')(func.setweight(
+            func.to_tsvector(config, func.coalesce(Product.short_description, '') + ' ' + func.coalesce(Product.description, '')),
+            literal_column("'B'")
+        ))
+    )
+
+
+class InvertedIndex:
+    """In-process inverted index over active products (non-Postgres fallback)"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)  # token -> {product_id: score}
+        self._documents = {}  # product_id -> set of tokens
+        self._vocabulary = []  # sorted tokens, for prefix lookups
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            rows = db.session.query(
+                Product.id, Product.name, Product.short_description,
+                Product.description, Product.is_active
+            ).all()
+            for row in rows:
+                if row.is_active:
+                    self._add(row.id, row.name, row.short_description, row.description)
+            self._vocabulary = sorted(self._postings)
+            self._loaded = True
+
+    def _add(self, product_id, name, short_description, description):
+        fields = {
+            'name': name,
+            'short_description': short_description,
+            'description': description,
+        }
+        tokens = set()
+        for field, text in fields.items():
+            for token in tokenize(text):
+                postings = self._postings[token]
+                postings[product_id] = postings.get(product_id, 0) + FIELD_WEIGHTS[field]
+                tokens.add(token)
+        self._documents[product_id] = tokens
+
+    def _remove(self, product_id):
+        for token in self._documents.pop(product_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[token]
+
+    def index_product(self, product):
+        """Add or refresh a product in the index"""
+        if not self._loaded:
+            return  # Picked up by the lazy load
+        with self._lock:
+            self._remove(product.id)
+            if product.is_active:
+                self._add(product.id, product.name, product.short_description, product.description)
+            self._vocabulary = sorted(self._postings)
+
+    def remove_product(self, product_id):
+        """Drop a product from the index"""
+        if not self._loaded:
+            return
+        with self._lock:
+            self._remove(product_id)
+            self._vocabulary = sorted(self._postings)
+
+    def _expand(self, term):
+        """Return all indexed tokens starting with term"""
+        start = bisect_left(self._vocabulary, term)
+        matches = []
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def search(self, text):
+        """
+        Search the index.
+
+        Every term must match (AND semantics); each term matches as a prefix.
+
+        Returns:
+            dict: {product_id: score} for matching products
+        """
+        self._ensure_loaded()
+        terms = tokenize(text)
+        if not terms:
+            return {}
+
+        with self._lock:
+            scores = None
+            for term in terms:
+                term_scores = {}
+                for token in self._expand(term):
+                    # Exact token matches outrank prefix expansions
+                    boost = 1.0 if token == term else 0.5
+                    for product_id, weight in self._postings[token].items():
+                        term_scores[product_id] = term_scores.get(product_id, 0) + weight * boost
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        product_id: score + term_scores[product_id]
+                        for product_id, score in scores.items()
+                        if product_id in term_scores
+                    }
+                if not scores:
+                    return {}
+
+            return scores
+
+    def clear(self):
+        """Forget the index; it is rebuilt on the next search"""
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._vocabulary = []
+            self._loaded = False
+
+
+class SearchService:
+    """Service for full-text product search"""
+
+    _index = InvertedIndex()
+
+    @staticmethod
+    def _use_postgres():
+        return db.engine.dialect.name == 'postgresql'
+
+    @staticmethod
+    def build_tsquery(text):
+        """Build a prefix-matching tsquery string: 'mag:* & zip:*'"""
+        return ' & '.join(f'{term}:*' for term in tokenize(text))
+
+    @staticmethod
+    def apply_search(query, text, rank=False):
+        """
+        Restrict a Product query to products matching text
+
+        Args:
+            query: Product query to filter
+            text: Raw search string from the client
+            rank: Order results by relevance (best match first)
+
+        Returns:
+            Filtered (and optionally ordered) query
+        """
+        if not tokenize(text):
+            return query
+
+        if SearchService._use_postgres():
+            tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), SearchService.build_tsquery(text))
+            document = search_document()
+            # 'name % text' (unlike similarity() >= n) can use the trigram
+            # index; its cut-off is pg_trgm.similarity_threshold, set for
+            # this transaction only
+            db.session.execute(
+                db.text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+                {'threshold': str(TRIGRAM_THRESHOLD)}
+            )
+            query = query.filter(
+                db.or_(
+                    document.op('@@')(tsquery),
+                    Product.name.op('%')(text)
+                )
+            )
+            if rank:
+                query = query.order_by(
+                    (func.ts_rank(document, tsquery) + func.similarity(Product.name, text)).desc(),
+                    Product.id
+                )
+            return query
+
+        scores = SearchService._index.search(text)
+        if not scores:
+            return query.filter(db.false())
+
+        query = query.filter(Product.id.in_(list(scores)))
+        if rank:
+            query = query.order_by(
+                case(scores, value=Product.id, else_=0).desc(),
+                Product.id
+            )
+        return query
+
+    @staticmethod
+    def on_product_saved(product):
+        """Keep the fallback index in sync after a product is created or updated"""
+        if not SearchService._use_postgres():
+            SearchService._index.index_product(product)
+
+    @staticmethod
+    def on_product_deleted(product_id):
+        """Keep the fallback index in sync after a product is deleted"""
+        if not SearchService._use_postgres():
+            SearchService._index.remove_product(product_id)
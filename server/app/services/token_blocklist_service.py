@@ -0,0 +1,210 @@
+"""Token blocklist service - Revoked JWTs checked on every request
+
+Logging out revokes the token's jti (and the refresh token's, if given).
+flask_jwt_extended asks the blocklist about every token it accepts, so the
+check has to stay cheap:
+
+    1. An in-process Bloom filter answers "definitely not revoked" for the
+       common case without touching the network.
+    2. Only possible hits (revoked tokens and rare false positives, about
+       TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE) look up the authoritative store.
+
+Stores (TOKEN_BLOCKLIST_BACKEND, defaults to CACHE_BACKEND):
+    memory: In-process dict, per worker (development and tests)
+    redis:  One key per jti with TTL equal to the token's remaining
+            lifetime, plus a sorted set of recent revocations
+            (score = revocation time) that other workers read to update
+            their Bloom filters
+
+Each worker pulls revocations made by other workers at most every
+TOKEN_BLOCKLIST_SYNC_INTERVAL seconds, so an access token revoked elsewhere
+can keep working for up to that long. Refresh tokens always skip the filter
+and check the store directly. Like the response cache, a Redis outage is
+logged and treated as "not revoked".
+"""
+
+from app.extensions import jwt
+import hashlib
+import math
+import threading
+import time
+
+REVOKED_KEY_PREFIX = 'revoked:'
+REVOCATIONS_KEY = 'revocations'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)"""
+
+    def __init__(self, capacity, false_positive_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        added = False
+        for position in self._positions(value):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                self.bits[position >> 3] |= 1 << (position & 7)
+                added = True
+        if added:
+            self.count += 1  # Re-adding a known value does not fill the filter
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class MemoryBlocklistBackend:
+    """Thread-safe in-process revoked jti store with TTL"""
+
+    def __init__(self):
+        self._revoked = {}  # jti -> (revoked_at, expires_at)
+        self._lock = threading.Lock()
+
+    def add(self, jti, ttl):
+        now = time.time()
+        with self._lock:
+            self._revoked[jti] = (now, now + ttl)
+
+    def contains(self, jti):
+        with self._lock:
+            entry = self._revoked.get(jti)
+            if entry is not None and entry[1] <= time.time():
+                del self._revoked[jti]
+                entry = None
+            return entry is not None
+
+    def revoked_since(self, since):
+        """jtis revoked at or after a timestamp and not yet expired"""
+        now = time.time()
+        with self._lock:
+            for jti in [jti for jti, (_, expires_at) in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+            return [jti for jti, (revoked_at, _) in self._revoked.items() if revoked_at >= since]
+
+
+class RedisBlocklistBackend:
+    """Revoked jtis in Redis, shared by all workers"""
+
+    def __init__(self, url, max_ttl, prefix='hisi:'):
+        import redis
+
+        self._redis = redis
+        self.client = redis.Redis.from_url(url)
+        self.max_ttl = max_ttl
+        self.prefix = prefix
+
+    def add(self, jti, ttl):
+        now = time.time()
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self.prefix + REVOKED_KEY_PREFIX + jti, 1, ex=max(1, int(math.ceil(ttl))))
+            pipe.zadd(self.prefix + REVOCATIONS_KEY, {jti: now})
+            # Revocations older than the longest token lifetime can no longer matter
+            pipe.zremrangebyscore(self.prefix + REVOCATIONS_KEY, '-inf', now - self.max_ttl)
+            pipe.execute()
+        except self._redis.RedisError as e:
+            print(f"Token revocation failed: {str(e)}")
+
+    def contains(self, jti):
+        try:
+            return bool(self.client.exists(self.prefix + REVOKED_KEY_PREFIX + jti))
+        except self._redis.RedisError as e:
+            print(f"Token blocklist lookup failed: {str(e)}")
+            return False
+
+    def revoked_since(self, since):
+        try:
+            members = self.client.zrangebyscore(self.prefix + REVOCATIONS_KEY, since, '+inf')
+        except self._redis.RedisError as e:
+            print(f"Token blocklist sync failed: {str(e)}")
+            return []
+        return [member.decode('utf-8') for member in members]
+
+
+class TokenBlocklist:
+    """Revoked JWTs behind an in-process Bloom filter"""
+
+    def __init__(self):
+        self.backend = MemoryBlocklistBackend()
+        self.capacity = 100000
+        self.false_positive_rate = 0.001
+        self.sync_interval = 1
+        self.max_ttl = 604800
+        self._filter = BloomFilter(self.capacity, self.false_positive_rate)
+        self._synced_at = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Select the store from TOKEN_BLOCKLIST_BACKEND and register the jwt loader"""
+        backend = app.config.get('TOKEN_BLOCKLIST_BACKEND') or app.config.get('CACHE_BACKEND', 'memory')
+        self.capacity = app.config.get('TOKEN_BLOCKLIST_CAPACITY', 100000)
+        self.false_positive_rate = app.config.get('TOKEN_BLOCKLIST_FALSE_POSITIVE_RATE', 0.001)
+        self.sync_interval = app.config.get('TOKEN_BLOCKLIST_SYNC_INTERVAL', 1)
+        self.max_ttl = int(max(
+            app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds(),
+            app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds()
+        ))
+
+        if backend == 'redis':
+            self.backend = RedisBlocklistBackend(app.config['REDIS_URL'], self.max_ttl)
+        else:
+            self.backend = MemoryBlocklistBackend()
+
+        self._filter = BloomFilter(self.capacity, self.false_positive_rate)
+        self._synced_at = 0
+
+        jwt.token_in_blocklist_loader(self._in_blocklist)
+        app.extensions['token_blocklist'] = self
+
+    def _sync(self):
+        """Add other workers' recent revocations to the filter"""
+        now = time.time()
+        if now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if now - self._synced_at < self.sync_interval:
+                return
+            if self._filter.count >= self.capacity:
+                # Saturated: rebuild from revocations that can still matter
+                self._filter = BloomFilter(self.capacity, self.false_positive_rate)
+                since = now - self.max_ttl
+            else:
+                # Overlap the previous sync so revocations written meanwhile are not missed
+                since = self._synced_at - self.sync_interval
+            for jti in self.backend.revoked_since(since):
+                self._filter.add(jti)
+            self._synced_at = now
+
+    def revoke(self, jwt_payload):
+        """Revoke a decoded token until it expires"""
+        expires_at = jwt_payload.get('exp')
+        ttl = expires_at - time.time() if expires_at else self.max_ttl
+        if ttl <= 0:
+            return  # Already expired
+        self.backend.add(jwt_payload['jti'], ttl)
+        with self._lock:
+            self._filter.add(jwt_payload['jti'])
+
+    def is_revoked(self, jwt_payload):
+        """Check a decoded token (refresh tokens bypass the filter)"""
+        jti = jwt_payload['jti']
+        if jwt_payload.get('type') == 'refresh':
+            return self.backend.contains(jti)
+        self._sync()
+        if jti not in self._filter:
+            return False
+        return self.backend.contains(jti)
+
+    def _in_blocklist(self, jwt_header, jwt_payload):
+        return self.is_revoked(jwt_payload)
+
+
+token_blocklist = TokenBlocklist()
@@ -0,0 +1,131 @@
+"""Write-behind service - Batched low-priority column updates
+
+Some writes on hot paths only record bookkeeping nobody reads right away:
+users.last_login at login, notifications.read_at when one is opened. Doing
+each as its own transaction costs a commit and a row lock per request.
+These updates are handed to the write_behind buffer instead:
+
+    write_behind.defer(user, last_login=datetime.utcnow())
+
+The buffer keeps the latest values per row in memory and writes them with
+one executemany UPDATE per table, in a single transaction, when:
+    - every WRITE_BEHIND_INTERVAL seconds (background thread), or
+    - WRITE_BEHIND_MAX_PENDING rows are pending, or
+    - the worker process exits (atexit, which gunicorn workers run on a
+      graceful shutdown).
+
+Updates still pending when a worker is killed outright are lost, so only
+columns that can tolerate that belong here. WRITE_BEHIND_INTERVAL=0 writes
+every update immediately (tests, scripts).
+"""
+
+from app.extensions import db
+from sqlalchemy import bindparam
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.attributes import set_committed_value
+import atexit
+import threading
+
+
+class WriteBehindBuffer:
+    """In-process buffer of pending column updates keyed by row"""
+
+    def __init__(self):
+        self.interval = 5
+        self.max_pending = 500
+        self._app = None
+        self._pending = {}  # (model, id) -> {column: value}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        """Read WRITE_BEHIND_INTERVAL / WRITE_BEHIND_MAX_PENDING and flush at exit"""
+        self.interval = app.config.get('WRITE_BEHIND_INTERVAL', 5)
+        self.max_pending = app.config.get('WRITE_BEHIND_MAX_PENDING', 500)
+        if self._app is None:
+            atexit.register(self.flush)
+        self._app = app
+        app.extensions['write_behind'] = self
+
+    def defer(self, instance, **values):
+        """
+        Queue column updates for a persistent row
+
+        The values are also set on the instance without marking it dirty, so
+        the caller's response shows them but its own commit does not write them.
+        """
+        for column, value in values.items():
+            set_committed_value(instance, column, value)
+
+        key = (type(instance), instance.id)
+        with self._lock:
+            self._pending.setdefault(key, {}).update(values)
+            pending = len(self._pending)
+
+        if not self.interval:
+            self.flush()
+        elif pending >= self.max_pending:
+            self._wake.set()
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        # Started on first use, after a pre-forking server has forked
+        if self.interval and (self._thread is None or not self._thread.is_alive()):
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write every pending update
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending or self._app is None:
+                return 0
+
+            # One executemany per table and set of columns
+            batches = {}
+            for (model, row_id), values in pending.items():
+                columns = tuple(sorted(values))
+                batches.setdefault((model, columns), []).append(
+                    dict({f'_{column}': value for column, value in values.items()}, _id=row_id)
+                )
+
+            with self._app.app_context():
+                try:
+                    for (model, columns), rows in batches.items():
+                        table = model.__table__
+                        db.session.execute(
+                            table.update().where(table.c.id == bindparam('_id')).values(
+                                {column: bindparam(f'_{column}') for column in columns}
+                            ),
+                            rows
+                        )
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    print(f"Write-behind flush failed: {str(e)}")
+                    # Keep the updates for the next flush; newer values win
+                    with self._lock:
+                        for key, values in pending.items():
+                            self._pending[key] = dict(values, **self._pending.get(key, {}))
+                    return 0
+
+            return len(pending)
+
+
+write_behind = WriteBehindBuffer()
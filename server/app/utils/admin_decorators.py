@@ -1,9 +1,13 @@
-"""Admin decorators for role-based access control"""
+"""Admin decorators for role-based access control
+
+Role and permissions come from the access token's claims while their
+digest matches the user's marker in the authz store, and from the users
+table otherwise (see app/services/authz_service.py).
+"""
 
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from app.models import User
+from app.services.authz_service import current_authz
 
 def admin_required(fn):
     """
@@ -11,9 +15,7 @@ def admin_required(fn):
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user:
             return jsonify({
@@ -21,6 +23,12 @@ def admin_required(fn):
                 'message': 'User not found'
             }), 404
         
+        if not user.is_active:
+            return jsonify({
+                'success': False,
+                'message': 'Account is deactivated'
+            }), 403
+        
         if not user.is_admin():
             return jsonify({
                 'success': False,
@@ -38,9 +46,7 @@ def super_admin_required(fn):
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_authz()
         
         if not user:
             return jsonify({
@@ -48,6 +54,12 @@ def super_admin_required(fn):
                 'message': 'User not found'
             }), 404
         
+        if not user.is_active:
+            return jsonify({
+                'success': False,
+                'message': 'Account is deactivated'
+            }), 403
+        
         if not user.is_super_admin():
             return jsonify({
                 'success': False,
@@ -67,9 +79,7 @@ def permission_required(permission):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
+            user = current_authz()
             
             if not user:
                 return jsonify({
@@ -77,6 +87,12 @@ def permission_required(permission):
                     'message': 'User not found'
                 }), 404
             
+            if not user.is_active:
+                return jsonify({
+                    'success': False,
+                    'message': 'Account is deactivated'
+                }), 403
+            
             if not user.has_permission(permission):
                 return jsonify({
                     'success': False,
@@ -0,0 +1,71 @@
+"""Fast JSON provider for all API responses
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Both paths encode Decimal as a number, datetime/date as ISO 8601
+and UUID as a string, so models can return raw column values from to_dict()
+instead of converting every field by hand.
+"""
+
+from flask.json.provider import JSONProvider
+from datetime import date, datetime, time
+from decimal import Decimal
+import json
+import uuid
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value):
+    """Encode types the JSON backends do not handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, registered in create_app"""
+
+    # Same meaning as DefaultJSONProvider.compact: None pretty-prints in debug mode
+    compact = None
+    mimetype = 'application/json'
+
+    def _pretty(self):
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return self._dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def _dumps_bytes(self, obj):
+        if orjson is None:
+            indent = 2 if self._pretty() else None
+            separators = None if indent else (',', ':')
+            return json.dumps(
+                obj, default=_default, ensure_ascii=False, indent=indent, separators=separators
+            ).encode('utf-8')
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self._pretty():
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
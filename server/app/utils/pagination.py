@@ -0,0 +1,102 @@
+"""Keyset (cursor) pagination helpers
+
+Cursor mode pages on (created_at, id) instead of OFFSET and skips the
+COUNT(*) query, so every page costs the same regardless of depth.
+"""
+
+from app.extensions import db
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+import base64
+import json
+
+
+class KeysetPage(NamedTuple):
+    items: list
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def encode_cursor(sort_value: datetime, row_id: str, direction: str = 'next') -> str:
+    payload = json.dumps({'s': sort_value.isoformat(), 'i': row_id, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, str]:
+    """
+    Decode a cursor token
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        direction = payload.get('d', 'next')
+        if direction not in ('next', 'prev'):
+            raise ValueError(direction)
+        return datetime.fromisoformat(payload['s']), str(payload['i']), direction
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_paginate(
+        query,
+        model,
+        cursor: Optional[str],
+        per_page: int,
+        sort_column: Any = None,
+        descending: bool = True
+) -> KeysetPage:
+    """
+    Fetch one page of query using keyset pagination
+
+    Args:
+        query: Filtered query (any existing ORDER BY is replaced)
+        model: Model class with an ``id`` column
+        cursor: Token from a previous page, or empty/None for the first page
+        per_page: Page size
+        sort_column: Timestamp column to page on (default: model.created_at)
+        descending: Newest first (default) or oldest first
+
+    Returns:
+        KeysetPage with items and next/prev cursor tokens (None at either end)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    sort_column = sort_column if sort_column is not None else model.created_at
+    key = db.tuple_(sort_column, model.id)
+
+    direction = 'next'
+    query = query.order_by(None)
+    if cursor:
+        sort_value, row_id, direction = decode_cursor(cursor)
+        forward = (direction == 'next') == descending
+        query = query.filter(key < (sort_value, row_id) if forward else key > (sort_value, row_id))
+
+    # Walking backwards reads the index in the opposite order, then flips the page
+    reverse = (direction == 'prev')
+    if descending != reverse:
+        query = query.order_by(sort_column.desc(), model.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), model.id.asc())
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+
+    if not rows:
+        return KeysetPage(items=[], next_cursor=None, prev_cursor=None)
+
+    first, last = rows[0], rows[-1]
+    more_after = has_more if direction == 'next' else True
+    more_before = has_more if direction == 'prev' else bool(cursor)
+
+    return KeysetPage(
+        items=rows,
+        next_cursor=encode_cursor(getattr(last, sort_column.key), last.id, 'next') if more_after else None,
+        prev_cursor=encode_cursor(getattr(first, sort_column.key), first.id, 'prev') if more_before else None
+    )
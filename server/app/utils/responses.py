@@ -67,39 +67,53 @@ def server_error_response(message: str = "Internal server error") -> tuple:
 
 def paginated_response(
         items: list,
-        page: int,
+        page: Optional[int],
         per_page: int,
-        total: int,
-        message: str = "Success"
+        total: Optional[int],
+        message: str = "Success",
+        next_cursor: Optional[str] = None,
+        prev_cursor: Optional[str] = None
 ) -> tuple:
     """
     Paginated response helper
 
     Args:
         items: List of items for current page
-        page: Current page number
+        page: Current page number (None in cursor mode)
         per_page: Items per page
-        total: Total number of items
+        total: Total number of items (None in cursor mode, no count is run)
         message: Success message
+        next_cursor: Cursor for the following page (cursor mode)
+        prev_cursor: Cursor for the preceding page (cursor mode)
 
     Returns:
         JSON response with pagination data
     """
-    total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+    if total is None:
+        pagination = {
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'has_next': next_cursor is not None,
+            'has_prev': prev_cursor is not None
+        }
+    else:
+        total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': total_pages,
+            'has_next': page < total_pages,
+            'has_prev': page > 1
+        }
 
     response = {
         'success': True,
         'message': message,
         'data': {
             'items': items,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
-            }
+            'pagination': pagination
         }
     }
     return jsonify(response), 200
\ No newline at end of file
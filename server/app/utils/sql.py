@@ -0,0 +1,12 @@
+"""SQL helpers shared by services"""
+
+from app.extensions import db
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def upsert_insert(table):
+    """Dialect insert() that supports on_conflict_do_update (PostgreSQL, SQLite)"""
+    if db.engine.dialect.name == 'sqlite':
+        return sqlite_insert(table)
+    return postgresql_insert(table)
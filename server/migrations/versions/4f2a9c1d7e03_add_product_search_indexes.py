@@ -0,0 +1,43 @@
+"""Add product search indexes
+
+Revision ID: 4f2a9c1d7e03
+Revises: cbbf32689581
+Create Date: 2026-01-20 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c1d7e03'
+down_revision = 'cbbf32689581'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    # Weighted full-text document; must match search_document() in
+    # app/services/search_service.py for the planner to use it
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_hisi_products_search_document
+        ON hisi.products
+        USING gin ((
+            setweight(to_tsvector('simple'::regconfig, COALESCE(name, '')), 'A')
+            || setweight(to_tsvector('simple'::regconfig, COALESCE(short_description, '') || ' ' || COALESCE(description, '')), 'B')
+        ));
+    """)
+
+    # Trigram index for fuzzy / misspelled name matches
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_hisi_products_name_trgm
+        ON hisi.products
+        USING gin (name gin_trgm_ops);
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS hisi.ix_hisi_products_name_trgm;")
+    op.execute("DROP INDEX IF EXISTS hisi.ix_hisi_products_search_document;")
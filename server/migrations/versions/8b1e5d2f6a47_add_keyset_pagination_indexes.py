@@ -0,0 +1,33 @@
+"""Add keyset pagination indexes
+
+Revision ID: 8b1e5d2f6a47
+Revises: 4f2a9c1d7e03
+Create Date: 2026-01-21 14:03:55.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e5d2f6a47'
+down_revision = '4f2a9c1d7e03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (created_at, id) lets cursor pages seek straight to the row after the cursor
+    op.create_index('ix_hisi_products_created_at_id', 'products', ['created_at', 'id'], unique=False, schema='hisi')
+    op.create_index('ix_hisi_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False, schema='hisi')
+    op.create_index('ix_hisi_reviews_created_at_id', 'reviews', ['created_at', 'id'], unique=False, schema='hisi')
+    op.create_index('ix_hisi_payments_created_at_id', 'payments', ['created_at', 'id'], unique=False, schema='hisi')
+    op.create_index('ix_hisi_newsletter_subscribers_subscribed_at_id', 'newsletter_subscribers', ['subscribed_at', 'id'], unique=False, schema='hisi')
+
+
+def downgrade():
+    op.drop_index('ix_hisi_newsletter_subscribers_subscribed_at_id', table_name='newsletter_subscribers', schema='hisi')
+    op.drop_index('ix_hisi_payments_created_at_id', table_name='payments', schema='hisi')
+    op.drop_index('ix_hisi_reviews_created_at_id', table_name='reviews', schema='hisi')
+    op.drop_index('ix_hisi_orders_created_at_id', table_name='orders', schema='hisi')
+    op.drop_index('ix_hisi_products_created_at_id', table_name='products', schema='hisi')
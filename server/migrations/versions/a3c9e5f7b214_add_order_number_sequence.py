@@ -0,0 +1,26 @@
+"""Add sequence for order numbers
+
+Revision ID: a3c9e5f7b214
+Revises: f1b7d3e9a582
+Create Date: 2026-01-25 10:14:32.480217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e5f7b214'
+down_revision = 'f1b7d3e9a582'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing numbers end in a random 4-digit suffix; sequence numbers are
+    # zero-padded to 6 digits, so the two can never collide
+    op.execute("CREATE SEQUENCE IF NOT EXISTS hisi.order_number_seq START WITH 1 INCREMENT BY 1;")
+
+
+def downgrade():
+    op.execute("DROP SEQUENCE IF EXISTS hisi.order_number_seq;")
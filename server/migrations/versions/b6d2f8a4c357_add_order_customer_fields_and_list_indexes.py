@@ -0,0 +1,50 @@
+"""Add denormalized customer fields and admin list indexes to orders
+
+Revision ID: b6d2f8a4c357
+Revises: a3c9e5f7b214
+Create Date: 2026-01-25 15:42:08.916354
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2f8a4c357'
+down_revision = 'a3c9e5f7b214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('orders', sa.Column('customer_email', sa.String(length=255), nullable=True), schema='hisi')
+    op.add_column('orders', sa.Column('customer_name', sa.String(length=200), nullable=True), schema='hisi')
+
+    op.execute("""
+        UPDATE hisi.orders o
+        SET customer_email = u.email,
+            customer_name = NULLIF(concat_ws(' ', u.first_name, u.last_name), '')
+        FROM hisi.users u
+        WHERE u.id = o.user_id;
+    """)
+
+    op.create_index('ix_hisi_orders_status_created_at', 'orders', ['status', 'created_at'], unique=False, schema='hisi')
+    op.create_index('ix_hisi_orders_payment_status_created_at', 'orders', ['payment_status', 'created_at'], unique=False, schema='hisi')
+
+    # Trigram indexes for the admin search's ILIKE '%term%' matches
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for column in ('order_number', 'customer_email', 'customer_name'):
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS ix_hisi_orders_{column}_trgm
+            ON hisi.orders
+            USING gin ({column} gin_trgm_ops);
+        """)
+
+
+def downgrade():
+    for column in ('customer_name', 'customer_email', 'order_number'):
+        op.execute(f"DROP INDEX IF EXISTS hisi.ix_hisi_orders_{column}_trgm;")
+    op.drop_index('ix_hisi_orders_payment_status_created_at', table_name='orders', schema='hisi')
+    op.drop_index('ix_hisi_orders_status_created_at', table_name='orders', schema='hisi')
+    op.drop_column('orders', 'customer_name', schema='hisi')
+    op.drop_column('orders', 'customer_email', schema='hisi')
@@ -0,0 +1,44 @@
+"""Add product_accessibility_features table
+
+Revision ID: c3d7a9e1f254
+Revises: 8b1e5d2f6a47
+Create Date: 2026-01-22 11:47:19.530862
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d7a9e1f254'
+down_revision = '8b1e5d2f6a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('product_accessibility_features',
+        sa.Column('product_id', sa.String(length=36), nullable=False),
+        sa.Column('feature', sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['hisi.products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'feature'),
+        schema='hisi'
+    )
+    op.create_index('ix_hisi_product_accessibility_features_feature_product', 'product_accessibility_features', ['feature', 'product_id'], unique=False, schema='hisi')
+
+    # Backfill from the existing JSON arrays
+    op.execute("""
+        INSERT INTO hisi.product_accessibility_features (product_id, feature)
+        SELECT DISTINCT p.id, btrim(f.value)
+        FROM hisi.products p
+        CROSS JOIN LATERAL json_array_elements_text(p.accessibility_features) AS f(value)
+        WHERE p.accessibility_features IS NOT NULL
+          AND json_typeof(p.accessibility_features) = 'array'
+          AND btrim(f.value) <> ''
+        ON CONFLICT DO NOTHING;
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_hisi_product_accessibility_features_feature_product', table_name='product_accessibility_features', schema='hisi')
+    op.drop_table('product_accessibility_features', schema='hisi')
@@ -0,0 +1,57 @@
+"""Add daily sales rollup tables
+
+Revision ID: c8e4a1b9d623
+Revises: b6d2f8a4c357
+Create Date: 2026-01-26 11:05:19.274830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e4a1b9d623'
+down_revision = 'b6d2f8a4c357'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_sales_rollup',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('orders', sa.Integer(), nullable=False),
+        sa.Column('gross_revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('net_revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('new_customers', sa.Integer(), nullable=False),
+        sa.Column('returning_customers', sa.Integer(), nullable=False),
+        sa.Column('payments', sa.Integer(), nullable=False),
+        sa.Column('successful_payments', sa.Integer(), nullable=False),
+        sa.Column('pending_payments', sa.Integer(), nullable=False),
+        sa.Column('failed_payments', sa.Integer(), nullable=False),
+        sa.Column('successful_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('refunded_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day'),
+        schema='hisi'
+    )
+    op.create_table('daily_product_sales_rollup',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.String(length=36), nullable=False),
+        sa.Column('product_name', sa.String(length=255), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'product_id', name='uq_daily_product_sales_rollup_day_product_id'),
+        schema='hisi'
+    )
+    # Rows are backfilled on first read, or all at once with
+    # `flask --app run rebuild-sales-rollups`
+
+
+def downgrade():
+    op.drop_table('daily_product_sales_rollup', schema='hisi')
+    op.drop_table('daily_sales_rollup', schema='hisi')
@@ -0,0 +1,62 @@
+"""Add product_rating_summary table
+
+Revision ID: d5e2b8f4c169
+Revises: c3d7a9e1f254
+Create Date: 2026-01-23 10:12:44.207318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e2b8f4c169'
+down_revision = 'c3d7a9e1f254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('product_rating_summary',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('product_id', sa.String(length=36), nullable=True),
+        sa.Column('review_count', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.Integer(), nullable=False),
+        sa.Column('star_1', sa.Integer(), nullable=False),
+        sa.Column('star_2', sa.Integer(), nullable=False),
+        sa.Column('star_3', sa.Integer(), nullable=False),
+        sa.Column('star_4', sa.Integer(), nullable=False),
+        sa.Column('star_5', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['hisi.products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('product_id'),
+        schema='hisi'
+    )
+
+    # Backfill: one row per reviewed product plus the site-wide row
+    op.execute("""
+        INSERT INTO hisi.product_rating_summary
+            (id, product_id, review_count, rating_sum, star_1, star_2, star_3, star_4, star_5, updated_at)
+        SELECT gen_random_uuid()::text, product_id, count(*), sum(rating),
+               count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+               count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+               count(*) FILTER (WHERE rating = 5), now()
+        FROM hisi.reviews
+        WHERE is_approved AND rating BETWEEN 1 AND 5 AND product_id IS NOT NULL
+        GROUP BY product_id;
+    """)
+    op.execute("""
+        INSERT INTO hisi.product_rating_summary
+            (id, product_id, review_count, rating_sum, star_1, star_2, star_3, star_4, star_5, updated_at)
+        SELECT gen_random_uuid()::text, NULL, count(*), coalesce(sum(rating), 0),
+               count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+               count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+               count(*) FILTER (WHERE rating = 5), now()
+        FROM hisi.reviews
+        WHERE is_approved AND rating BETWEEN 1 AND 5;
+    """)
+
+
+def downgrade():
+    op.drop_table('product_rating_summary', schema='hisi')
@@ -0,0 +1,40 @@
+"""Allow a single site-wide product_rating_summary row
+
+Revision ID: d9f3b5c7e812
+Revises: c8e4a1b9d623
+Create Date: 2026-01-27 09:48:31.516204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f3b5c7e812'
+down_revision = 'c8e4a1b9d623'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Concurrent first approvals may have created several site-wide rows,
+    # each since updated by every delta; recompute a single one
+    op.execute("DELETE FROM hisi.product_rating_summary WHERE product_id IS NULL;")
+    op.execute("""
+        INSERT INTO hisi.product_rating_summary
+            (id, product_id, review_count, rating_sum, star_1, star_2, star_3, star_4, star_5, updated_at)
+        SELECT gen_random_uuid()::text, NULL, count(*), coalesce(sum(rating), 0),
+               count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+               count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+               count(*) FILTER (WHERE rating = 5), now()
+        FROM hisi.reviews
+        WHERE is_approved AND rating BETWEEN 1 AND 5;
+    """)
+    op.create_index(
+        'uq_product_rating_summary_site_row', 'product_rating_summary', [sa.text('(product_id IS NULL)')],
+        unique=True, schema='hisi', postgresql_where=sa.text('product_id IS NULL')
+    )
+
+
+def downgrade():
+    op.drop_index('uq_product_rating_summary_site_row', table_name='product_rating_summary', schema='hisi')
@@ -0,0 +1,41 @@
+"""Add stock_reservations table
+
+Revision ID: e8a4c2d6b731
+Revises: d5e2b8f4c169
+Create Date: 2026-01-23 16:38:02.914556
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a4c2d6b731'
+down_revision = 'd5e2b8f4c169'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_reservations',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('order_id', sa.String(length=36), nullable=False),
+        sa.Column('product_id', sa.String(length=36), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('released_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['hisi.orders.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['hisi.products.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        schema='hisi'
+    )
+    op.create_index(op.f('ix_hisi_stock_reservations_order_id'), 'stock_reservations', ['order_id'], unique=False, schema='hisi')
+    op.create_index('ix_hisi_stock_reservations_status_expires_at', 'stock_reservations', ['status', 'expires_at'], unique=False, schema='hisi')
+
+
+def downgrade():
+    op.drop_index('ix_hisi_stock_reservations_status_expires_at', table_name='stock_reservations', schema='hisi')
+    op.drop_index(op.f('ix_hisi_stock_reservations_order_id'), table_name='stock_reservations', schema='hisi')
+    op.drop_table('stock_reservations', schema='hisi')
@@ -0,0 +1,44 @@
+"""Add unique constraint on cart_items (cart_id, product_id)
+
+Revision ID: f1b7d3e9a582
+Revises: e8a4c2d6b731
+Create Date: 2026-01-24 09:21:57.603118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7d3e9a582'
+down_revision = 'e8a4c2d6b731'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fold duplicate lines into the oldest one before adding the constraint
+    op.execute("""
+        WITH ranked AS (
+            SELECT id,
+                   row_number() OVER (PARTITION BY cart_id, product_id ORDER BY created_at, id) AS position,
+                   sum(quantity) OVER (PARTITION BY cart_id, product_id) AS total_quantity
+            FROM hisi.cart_items
+        )
+        UPDATE hisi.cart_items ci
+        SET quantity = ranked.total_quantity
+        FROM ranked
+        WHERE ci.id = ranked.id AND ranked.position = 1 AND ranked.total_quantity <> ci.quantity;
+    """)
+    op.execute("""
+        DELETE FROM hisi.cart_items ci
+        USING hisi.cart_items keep
+        WHERE ci.cart_id = keep.cart_id
+          AND ci.product_id = keep.product_id
+          AND (keep.created_at, keep.id) < (ci.created_at, ci.id);
+    """)
+    op.create_unique_constraint('uq_cart_items_cart_id_product_id', 'cart_items', ['cart_id', 'product_id'], schema='hisi')
+
+
+def downgrade():
+    op.drop_constraint('uq_cart_items_cart_id_product_id', 'cart_items', schema='hisi', type_='unique')
@@ -0,0 +1,155 @@
+"""
+Benchmark the admin order list (GET /api/v1/orders/admin/orders)
+
+Seeds ORDERS orders (2 items each) for 1,000 customers into a throwaway
+SQLite database, or into an empty scratch database given with
+--database-url, then times each listing variant through the test client
+and counts its SQL statements.
+
+Usage (from server/):
+    python scripts/benchmark_admin_orders.py [--orders 100000] [--repeat 20]
+    python scripts/benchmark_admin_orders.py --database-url postgresql://.../scratch
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--orders', type=int, default=100000)
+parser.add_argument('--repeat', type=int, default=20, help='Requests timed per variant')
+parser.add_argument('--database-url', help='Empty scratch database (default: temporary SQLite file)')
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix='hisi-bench-')
+
+# Read by DevelopmentConfig when it is imported, so set before the app is
+os.environ.update({
+    'DATABASE_URL': args.database_url or f'sqlite:///{db_dir}/main.db',
+    'CACHE_BACKEND': 'memory',
+    'GUEST_CART_BACKEND': 'memory',
+    'AUTHZ_BACKEND': 'memory',
+    'TOKEN_BLOCKLIST_BACKEND': 'memory',
+    'RATE_LIMIT_ENABLED': 'false',
+    'WRITE_BEHIND_INTERVAL': '0',
+    'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import uuid
+
+
+@event.listens_for(Engine, 'connect')
+def _attach_hisi_schema(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute(f"ATTACH DATABASE '{db_dir}/hisi.db' AS hisi")
+
+
+from app import create_app
+from app.extensions import db
+from app.models import Order, OrderItem, Product, User
+
+STATUSES = ['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled']
+PAYMENT_STATUSES = ['pending', 'completed', 'failed']
+
+VARIANTS = [
+    ('first page', 'per_page=50'),
+    ('first page, table view', 'per_page=50&view=table'),
+    ('page 500', 'per_page=50&page=500'),
+    ('cursor page', 'per_page=50&cursor='),
+    ('status filter', 'per_page=50&status=shipped'),
+    ('payment filter, table view', 'per_page=50&payment_status=completed&view=table'),
+    ('search by name', 'per_page=50&search=okafor'),
+    ('search by order number', 'per_page=50&search=HS-20260101-0500'),
+]
+
+
+def seed(count):
+    """Customers, two products and count orders of two items, with Core inserts"""
+    now = datetime.utcnow()
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('CREATE SCHEMA IF NOT EXISTS hisi')
+    db.create_all()
+
+    users = [{
+        'id': str(uuid.uuid4()), 'email': f'customer{n}@example.com', 'password_hash': 'x',
+        'first_name': 'Customer', 'last_name': 'Okafor' if n % 100 == 0 else f'Number{n}',
+        'role': 'customer', 'is_verified': True, 'is_active': True, 'created_at': now, 'updated_at': now
+    } for n in range(1000)]
+    admin = User(email='admin@example.com', first_name='Admin', role='admin')
+    admin.set_password('Password123!')
+    db.session.add(admin)
+
+    products = [Product(name=f'Product {n}', slug=f'product-{n}', sku=f'SKU-{n}', price=1000, stock_quantity=10)
+                for n in range(2)]
+    db.session.add_all(products)
+    db.session.flush()
+    db.session.execute(db.insert(User.__table__), users)
+
+    for start in range(0, count, 5000):
+        orders, items = [], []
+        for n in range(start, min(start + 5000, count)):
+            user = users[n % len(users)]
+            order_id = str(uuid.uuid4())
+            created_at = now - timedelta(minutes=n)
+            orders.append({
+                'id': order_id, 'order_number': f'HS-20260101-{n + 1:06d}', 'user_id': user['id'],
+                'customer_email': user['email'], 'customer_name': f"{user['first_name']} {user['last_name']}",
+                'status': STATUSES[n % len(STATUSES)], 'payment_status': PAYMENT_STATUSES[n % len(PAYMENT_STATUSES)],
+                'subtotal': 2000, 'shipping_cost': 0, 'tax': 0, 'discount': 0, 'total': 2000, 'currency': 'NGN',
+                'created_at': created_at, 'updated_at': created_at
+            })
+            for product in products:
+                items.append({
+                    'id': str(uuid.uuid4()), 'order_id': order_id, 'product_id': product.id,
+                    'product_name': product.name, 'product_sku': product.sku,
+                    'unit_price': 1000, 'quantity': 1, 'subtotal': 1000, 'created_at': created_at
+                })
+        db.session.execute(db.insert(Order.__table__), orders)
+        db.session.execute(db.insert(OrderItem.__table__), items)
+    db.session.commit()
+
+
+def main():
+    app = create_app('development')
+    with app.app_context():
+        started = time.perf_counter()
+        seed(args.orders)
+        print(f"Seeded {args.orders} orders in {time.perf_counter() - started:.1f}s\n")
+        engine = db.engine
+
+    client = app.test_client()
+    response = client.post('/api/v1/auth/login', json={'email': 'admin@example.com', 'password': 'Password123!'})
+    headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    print(f"{'variant':<30} {'rows':>5} {'stmts':>6} {'median ms':>10} {'max ms':>8}")
+    for name, query in VARIANTS:
+        timings = []
+        for _ in range(args.repeat):
+            statements.clear()
+            event.listen(engine, 'before_cursor_execute', record)
+            started = time.perf_counter()
+            response = client.get(f'/api/v1/orders/admin/orders?{query}', headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+            event.remove(engine, 'before_cursor_execute', record)
+            assert response.status_code == 200, response.get_json()
+
+        timings.sort()
+        rows = len(response.get_json()['data']['items'])
+        print(f"{name:<30} {rows:>5} {len(statements):>6} {timings[len(timings) // 2]:>10.1f} {timings[-1]:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark checkout (OrderService.create_order_from_cart)
+
+Compares the bulk path (one multi-row INSERT for the order items, one
+DELETE for the cart lines) with the previous per-line ORM path (one
+OrderItem add and one CartItem delete per line) for carts of 1, 10 and 100
+lines. Both paths take stock with the same conditional UPDATE. Each
+checkout is timed on a throwaway SQLite database, or on an empty scratch
+database given with --database-url. "stmts" counts statements sent to the
+driver and "rows" the executions they make: the ORM batches the per-line
+INSERTs and DELETEs into executemany calls, which the driver runs once per
+row. SQLite runs in-process, so those executions cost no round trip there;
+point --database-url at PostgreSQL to see what they cost over a network.
+
+Usage (from server/):
+    python scripts/benchmark_checkout.py [--repeat 20] [--lines 1 10 100]
+    python scripts/benchmark_checkout.py --database-url postgresql://.../scratch
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--repeat', type=int, default=20, help='Checkouts timed per path and cart size')
+parser.add_argument('--lines', type=int, nargs='+', default=[1, 10, 100], help='Cart sizes')
+parser.add_argument('--database-url', help='Empty scratch database (default: temporary SQLite file)')
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix='hisi-bench-')
+
+# Read by DevelopmentConfig when it is imported, so set before the app is
+os.environ.update({
+    'DATABASE_URL': args.database_url or f'sqlite:///{db_dir}/main.db',
+    'CACHE_BACKEND': 'memory',
+    'GUEST_CART_BACKEND': 'memory',
+    'AUTHZ_BACKEND': 'memory',
+    'TOKEN_BLOCKLIST_BACKEND': 'memory',
+    'RATE_LIMIT_ENABLED': 'false',
+    'WRITE_BEHIND_INTERVAL': '0',
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@event.listens_for(Engine, 'connect')
+def _attach_hisi_schema(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute(f"ATTACH DATABASE '{db_dir}/hisi.db' AS hisi")
+
+
+from app import create_app
+from app.extensions import db
+from app.models import Cart, CartItem, Order, OrderItem, Product, User
+from app.services.cart_service import CartService
+from app.services.inventory_service import InventoryService
+from app.services.order_service import OrderService
+
+ADDRESS = {'full_name': 'Bench User', 'city': 'Nairobi', 'country': 'Kenya'}
+
+
+def per_line_checkout(cart, user, shipping_address):
+    """create_order_from_cart as it was before the bulk writes"""
+    order = Order(
+        order_number=OrderService.generate_order_number(),
+        user_id=user.id,
+        **OrderService.customer_fields(user),
+        status='pending',
+        payment_status='pending',
+        subtotal=cart.get_total(),
+        shipping_cost=OrderService.calculate_shipping(shipping_address),
+        total=cart.get_total() + OrderService.calculate_shipping(shipping_address),
+        currency='NGN',
+        shipping_address=shipping_address,
+        billing_address=shipping_address
+    )
+    db.session.add(order)
+    db.session.flush()
+
+    reserved, _ = InventoryService.reserve(order, [(item.product_id, item.quantity) for item in cart.items])
+    assert reserved
+
+    for cart_item in cart.items:
+        db.session.add(OrderItem(
+            order_id=order.id,
+            product_id=cart_item.product_id,
+            product_name=cart_item.product.name,
+            product_sku=cart_item.product.sku,
+            product_image=cart_item.product.main_image,
+            unit_price=cart_item.price_at_addition,
+            quantity=cart_item.quantity,
+            subtotal=cart_item.get_subtotal()
+        ))
+    for cart_item in cart.items:
+        db.session.delete(cart_item)
+
+    db.session.commit()
+    return order, None
+
+
+def bulk_checkout(cart, user, shipping_address):
+    return OrderService.create_order_from_cart(cart, user, shipping_address)
+
+
+PATHS = [('per-line ORM', per_line_checkout), ('bulk', bulk_checkout)]
+
+
+def seed(max_lines):
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql('CREATE SCHEMA IF NOT EXISTS hisi')
+    db.create_all()
+    user = User(email='bench@example.com', password_hash='x', first_name='Bench', role='customer')
+    products = [
+        Product(name=f'Product {n}', slug=f'product-{n}', sku=f'SKU-{n}', price=1000, stock_quantity=10 ** 6)
+        for n in range(max_lines)
+    ]
+    db.session.add(user)
+    db.session.add_all(products)
+    db.session.commit()
+    return user.id, [product.id for product in products]
+
+
+def fill_cart(user_id, product_ids):
+    """The user's cart with one unit of each product"""
+    cart = Cart.query.filter_by(user_id=user_id).first() or Cart(user_id=user_id)
+    db.session.add(cart)
+    db.session.flush()
+    db.session.add_all([
+        CartItem(cart_id=cart.id, product_id=product_id, quantity=1, price_at_addition=1000)
+        for product_id in product_ids
+    ])
+    db.session.commit()
+    return cart.id
+
+
+def main():
+    app = create_app('development')
+    with app.app_context():
+        user_id, product_ids = seed(max(args.lines))
+        engine = db.engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(len(context.compiled_parameters) if executemany else 1)
+
+    print(f"{'path':<14} {'lines':>5} {'stmts':>6} {'rows':>6} {'median ms':>10} {'max ms':>8}")
+    for lines in args.lines:
+        for name, checkout in PATHS:
+            timings = []
+            for _ in range(args.repeat):
+                with app.app_context():
+                    cart = CartService.load_cart(cart_id=fill_cart(user_id, product_ids[:lines]))
+                    user = db.session.get(User, user_id)
+                    cart.get_totals()
+
+                    statements.clear()
+                    event.listen(engine, 'before_cursor_execute', record)
+                    started = time.perf_counter()
+                    order, error = checkout(cart, user, ADDRESS)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    event.remove(engine, 'before_cursor_execute', record)
+                    assert error is None, error
+
+            timings.sort()
+            print(f"{name:<14} {lines:>5} {len(statements):>6} {sum(statements):>6} "
+                  f"{timings[len(timings) // 2]:>10.1f} {timings[-1]:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
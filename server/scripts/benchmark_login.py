@@ -0,0 +1,122 @@
+"""
+Benchmark login throughput (POST /api/v1/auth/login)
+
+Sends REQUESTS logins from CONCURRENCY client threads through the test
+client, with PASSWORD_HASH_WORKERS fixed at --workers, and reports logins
+per second, latency percentiles and how many were turned away with 503
+(hashing queue full). Uses a throwaway SQLite database.
+
+Usage (from server/):
+    python scripts/benchmark_login.py [--workers 2] [--queue 32] [--concurrency 16] [--requests 200]
+    python scripts/benchmark_login.py --method pbkdf2:sha256:1000000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+parser.add_argument('--workers', type=int, default=2, help='PASSWORD_HASH_WORKERS')
+parser.add_argument('--queue', type=int, default=32, help='PASSWORD_HASH_QUEUE')
+parser.add_argument('--method', default='scrypt:32768:8:1', help='PASSWORD_HASH_METHOD')
+parser.add_argument('--concurrency', type=int, default=16, help='Client threads')
+parser.add_argument('--requests', type=int, default=200, help='Logins in total')
+args = parser.parse_args()
+
+db_dir = tempfile.mkdtemp(prefix='hisi-bench-')
+
+# Read by DevelopmentConfig when it is imported, so set before the app is
+os.environ.update({
+    'DATABASE_URL': f'sqlite:///{db_dir}/main.db',
+    'CACHE_BACKEND': 'memory',
+    'GUEST_CART_BACKEND': 'memory',
+    'AUTHZ_BACKEND': 'memory',
+    'TOKEN_BLOCKLIST_BACKEND': 'memory',
+    'RATE_LIMIT_ENABLED': 'false',
+    'WRITE_BEHIND_INTERVAL': '5',
+    'PASSWORD_HASH_METHOD': args.method,
+    'PASSWORD_HASH_WORKERS': str(args.workers),
+    'PASSWORD_HASH_QUEUE': str(args.queue),
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from werkzeug.security import generate_password_hash
+
+
+@event.listens_for(Engine, 'connect')
+def _attach_hisi_schema(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute(f"ATTACH DATABASE '{db_dir}/hisi.db' AS hisi")
+        dbapi_connection.execute('PRAGMA busy_timeout = 5000')
+
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+
+PASSWORD = 'Password123!'
+
+
+def seed(count):
+    """One user per client thread, all with the same current hash"""
+    db.create_all()
+    password_hash = generate_password_hash(PASSWORD, method=args.method)
+    db.session.add_all([
+        User(email=f'user{n}@example.com', password_hash=password_hash, first_name='Bench', role='customer')
+        for n in range(count)
+    ])
+    db.session.commit()
+
+
+def main():
+    app = create_app('development')
+    with app.app_context():
+        seed(args.concurrency)
+
+    latencies, statuses = [], []
+    lock = threading.Lock()
+    remaining = iter(range(args.requests))
+    start = threading.Barrier(args.concurrency + 1)
+
+    def client_thread(n):
+        client = app.test_client()
+        credentials = {'email': f'user{n}@example.com', 'password': PASSWORD}
+        start.wait()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            started = time.perf_counter()
+            response = client.post('/api/v1/auth/login', json=credentials)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies.append(elapsed)
+                statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=client_thread, args=(n,)) for n in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = statuses.count(200)
+    latencies.sort()
+    print(f"method {args.method}, {args.workers} hashing workers, queue {args.queue}, "
+          f"{args.concurrency} clients, {args.requests} logins")
+    print(f"ok {ok}  busy (503) {statuses.count(503)}  other {len(statuses) - ok - statuses.count(503)}")
+    print(f"{ok / elapsed:.1f} logins/s over {elapsed:.1f}s")
+    print(f"latency ms  p50 {latencies[len(latencies) // 2]:.0f}  "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.0f}  max {latencies[-1]:.0f}")
+
+
+if __name__ == '__main__':
+    main()
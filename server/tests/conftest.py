@@ -0,0 +1,158 @@
+"""Test fixtures - The app on a throwaway SQLite database
+
+Tables live in the 'hisi' schema, which SQLite gets as an attached database
+file next to the main one. Every test starts from empty tables.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix='hisi-tests-')
+
+# Read by DevelopmentConfig when it is imported, so set before the app is
+os.environ.update({
+    'DATABASE_URL': f'sqlite:///{_db_dir}/main.db',
+    'CACHE_BACKEND': 'memory',
+    'GUEST_CART_BACKEND': 'memory',
+    'AUTHZ_BACKEND': 'memory',
+    'TOKEN_BLOCKLIST_BACKEND': 'memory',
+    'RATE_LIMIT_BACKEND': 'memory',
+    'RATE_LIMIT_ENABLED': 'false',
+    'WRITE_BEHIND_INTERVAL': '0',
+    'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+})
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import create_app
+from app.extensions import db
+from app.models import User, Product, Cart, CartItem
+from app.services.cache_service import cache
+from app.services.category_service import CategoryService
+from app.services.facet_service import FacetService
+from app.services.search_service import SearchService
+from app.services.guest_cart_service import guest_carts
+from app.services.authz_service import authz_store
+from app.middleware.rate_limiter import rate_limiter
+
+
+@event.listens_for(Engine, 'connect')
+def _attach_hisi_schema(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.execute(f"ATTACH DATABASE '{_db_dir}/hisi.db' AS hisi")
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    with app.app_context():
+        db.create_all()
+    yield
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    cache.clear()
+    guest_carts.init_app(app)  # Fresh memory store
+    authz_store.backend.clear()
+    rate_limiter.backend.clear()
+    CategoryService._tree = None
+    FacetService._snapshot = None
+    SearchService._index.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class StatementRecorder(list):
+    """SQL statements run on the app's engine while recording"""
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.append(statement)
+
+    def __enter__(self):
+        self.clear()
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+@pytest.fixture
+def statements(app):
+    """Use as 'with statements: ...', then len(statements)"""
+    with app.app_context():
+        engine = db.engine
+    return StatementRecorder(engine)
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(email='customer@example.com', password='Password123!', role='customer', **fields):
+        with app.app_context():
+            user = User(email=email, first_name='Test', last_name='User', role=role, **fields)
+            user.set_password(password)
+            db.session.add(user)
+            db.session.commit()
+            return user.id
+    return make_user
+
+
+@pytest.fixture
+def make_product(app):
+    counter = iter(range(1, 100000))
+
+    def make_product(stock=10, price='1000.00', **fields):
+        n = next(counter)
+        with app.app_context():
+            product = Product(
+                name=fields.pop('name', f'Product {n}'), slug=f'product-{n}', sku=f'SKU-{n}',
+                price=Decimal(price), stock_quantity=stock, **fields
+            )
+            db.session.add(product)
+            db.session.commit()
+            return product.id
+    return make_product
+
+
+@pytest.fixture
+def make_cart(app):
+    def make_cart(user_id, lines):
+        """Cart for a user from {product_id: quantity}"""
+        with app.app_context():
+            cart = Cart(user_id=user_id)
+            db.session.add(cart)
+            db.session.flush()
+            for product_id, quantity in lines.items():
+                product = db.session.get(Product, product_id)
+                db.session.add(CartItem(
+                    cart_id=cart.id, product_id=product_id, quantity=quantity,
+                    price_at_addition=product.price
+                ))
+            db.session.commit()
+            return cart.id
+    return make_cart
+
+
+@pytest.fixture
+def auth_headers(client):
+    def auth_headers(email='customer@example.com', password='Password123!'):
+        response = client.post('/api/v1/auth/login', json={'email': email, 'password': password})
+        assert response.status_code == 200, response.get_json()
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return auth_headers
@@ -0,0 +1,109 @@
+"""Admin analytics (GET /admin/analytics)"""
+
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models import DailySalesRollup, Order, OrderItem
+from app.services.sales_rollup_service import SalesRollupService
+
+PERIODS = ['today', 'week', 'month', 'year']
+
+# Statements of one analytics request once the rollups exist
+STEADY_STATE_STATEMENTS = 10
+
+# Before the backfill, closed days without a row are aggregated live, a
+# fixed number of grouped SELECTs per series whatever the period
+COLD_STATEMENTS = 30
+
+
+@pytest.fixture
+def orders(app, make_user, make_product):
+    """Two orders a day over the last 400 days, and two today"""
+    user_id = make_user()
+    product_id = make_product()
+    now = datetime.utcnow()
+    orders, items = [], []
+    for n in range(802):
+        created_at = now - timedelta(hours=12 * n)
+        order_id = str(uuid.uuid4())
+        orders.append({
+            'id': order_id, 'order_number': f'HS-20260101-{n + 1:06d}', 'user_id': user_id,
+            'status': 'delivered', 'payment_status': 'completed',
+            'subtotal': 1000, 'shipping_cost': 0, 'tax': 0, 'discount': 0, 'total': 1000, 'currency': 'NGN',
+            'created_at': created_at, 'updated_at': created_at
+        })
+        items.append({
+            'id': str(uuid.uuid4()), 'order_id': order_id, 'product_id': product_id,
+            'product_name': 'Product', 'product_sku': 'SKU', 'unit_price': 1000, 'quantity': 1,
+            'subtotal': 1000, 'created_at': created_at
+        })
+    with app.app_context():
+        db.session.execute(db.insert(Order.__table__), orders)
+        db.session.execute(db.insert(OrderItem.__table__), items)
+        db.session.commit()
+
+
+@pytest.fixture
+def admin_headers(make_user, auth_headers):
+    make_user(email='admin@example.com', role='super_admin')
+    return auth_headers(email='admin@example.com')
+
+
+def analytics_statements(client, statements, headers, period):
+    with statements:
+        response = client.get(f'/api/v1/admin/analytics?period={period}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return len(statements), response.get_json()['data']
+
+
+@pytest.fixture
+def backfilled(app, orders):
+    with app.app_context():
+        SalesRollupService.rebuild()
+
+
+def test_analytics_before_the_backfill_are_read_live_without_writing(
+    app, client, statements, orders, admin_headers
+):
+    count, data = analytics_statements(client, statements, admin_headers, 'year')
+
+    assert count <= COLD_STATEMENTS
+    assert 730 <= data['summary']['totalOrders'] <= 733  # 365 days back, whole first day
+    with app.app_context():
+        assert DailySalesRollup.query.count() == 0
+
+
+def test_partly_backfilled_period_matches_the_full_backfill(app, client, statements, orders, admin_headers):
+    with app.app_context():
+        SalesRollupService.rebuild(first_day=SalesRollupService.today() - timedelta(days=30))
+    _, partial = analytics_statements(client, statements, admin_headers, 'year')
+
+    with app.app_context():
+        SalesRollupService.rebuild()
+    _, full = analytics_statements(client, statements, admin_headers, 'year')
+
+    assert partial == full
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_analytics_statements_are_capped_once_rollups_exist(
+    client, statements, backfilled, admin_headers, period
+):
+    analytics_statements(client, statements, admin_headers, 'today')  # Sets the authz marker
+
+    count, data = analytics_statements(client, statements, admin_headers, period)
+
+    assert count <= STEADY_STATE_STATEMENTS
+    assert data['summary']['totalOrders'] > 0
+
+
+def test_change_on_a_closed_day_refreshes_its_row(app, backfilled):
+    day = SalesRollupService.today() - timedelta(days=3)
+    with app.app_context():
+        before = db.session.query(DailySalesRollup).filter_by(day=day).one().net_revenue
+        order = Order.query.filter(db.func.date(Order.created_at) == day.isoformat()).first()
+        order.status = 'cancelled'
+        db.session.commit()
+
+        assert db.session.query(DailySalesRollup).filter_by(day=day).one().net_revenue == before - 1000
@@ -0,0 +1,90 @@
+"""Authorization of admin requests (AuthzService and the authz store)"""
+
+from app.extensions import db
+from app.models import User
+from app.services.authz_service import AuthzService, authz_store
+
+ADMIN_ENDPOINT = '/api/v1/admin/notifications'
+
+
+def update_user(app, user_id, **values):
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        for name, value in values.items():
+            setattr(user, name, value)
+        db.session.commit()
+
+
+def test_role_change_applies_to_issued_tokens(app, client, make_user, auth_headers):
+    user_id = make_user(email='editor@example.com', role='content_manager')
+    headers = auth_headers(email='editor@example.com')
+    assert client.get(ADMIN_ENDPOINT, headers=headers).status_code == 200
+
+    update_user(app, user_id, role='customer')
+
+    assert client.get(ADMIN_ENDPOINT, headers=headers).status_code == 403
+
+
+def test_missing_marker_is_read_from_the_users_table(app, client, make_user, auth_headers):
+    user_id = make_user(email='editor@example.com', role='content_manager')
+    headers = auth_headers(email='editor@example.com')
+    assert client.get(ADMIN_ENDPOINT, headers=headers).status_code == 200
+
+    # Deactivated behind the ORM's back, then the marker drops out of the store
+    with app.app_context():
+        db.session.execute(db.update(User).where(User.id == user_id).values(is_active=False))
+        db.session.commit()
+    authz_store.delete(user_id)
+
+    response = client.get(ADMIN_ENDPOINT, headers=headers)
+    assert response.status_code == 403
+    assert response.get_json()['message'] == 'Account is deactivated'
+
+
+def test_deleted_user_is_refused(app, client, make_user, auth_headers):
+    user_id = make_user(email='editor@example.com', role='content_manager')
+    headers = auth_headers(email='editor@example.com')
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+
+    assert client.get(ADMIN_ENDPOINT, headers=headers).status_code == 404
+
+
+def test_matching_marker_authorizes_from_claims_without_loading_the_user(
+    app, client, statements, make_user, auth_headers
+):
+    make_user(email='editor@example.com', role='content_manager')
+    headers = auth_headers(email='editor@example.com')
+    client.get(ADMIN_ENDPOINT, headers=headers)  # Sets the marker
+
+    with statements:
+        assert client.get(ADMIN_ENDPOINT, headers=headers).status_code == 200
+
+    assert not [statement for statement in statements if 'FROM hisi.users' in statement]
+
+
+def test_stale_claims_get_the_current_rights(app, client, make_user, auth_headers):
+    user_id = make_user(email='editor@example.com', role='content_manager')
+    headers = auth_headers(email='editor@example.com')
+    client.get(ADMIN_ENDPOINT, headers=headers)
+
+    # A change behind the ORM's back keeps the marker; reloading it gives the new digest
+    with app.app_context():
+        db.session.execute(db.update(User).where(User.id == user_id).values(role='customer'))
+        db.session.commit()
+        AuthzService.load(user_id)
+
+    assert client.get(ADMIN_ENDPOINT, headers=headers).status_code == 403
+
+
+def test_store_keeps_markers_without_a_size_limit(app, make_user):
+    user_ids = [make_user(email=f'user{n}@example.com') for n in range(3)]
+    with app.app_context():
+        for user_id in user_ids:
+            AuthzService.load(user_id)
+        for n in range(5000):
+            authz_store.set(f'other-{n}', None)
+
+        assert all(authz_store.get(user_id)[1] for user_id in user_ids)
@@ -0,0 +1,145 @@
+"""Cart loading and guest cart merging (CartService)"""
+
+import time
+from decimal import Decimal
+from app.extensions import db
+from app.models import Cart, CartItem
+from app.services.cart_service import CartService
+from app.services.guest_cart_service import GuestCartUnavailable, MemoryGuestCartBackend, guest_carts
+
+
+def cart_statements(app, statements, cart_id):
+    with app.app_context():
+        with statements:
+            cart = CartService.load_cart(cart_id=cart_id)
+            data = cart.to_dict()
+            totals = cart.get_totals()
+            CartService.validate_cart_stock(cart)
+        db.session.remove()
+    return len(statements), data, totals
+
+
+def test_cart_statements_do_not_grow_with_lines(app, statements, make_user, make_product, make_cart):
+    products = [make_product(stock=100) for _ in range(50)]
+    small = make_cart(make_user(email='small@example.com'), {products[0]: 2})
+    large = make_cart(make_user(email='large@example.com'), {product_id: 2 for product_id in products})
+
+    small_count, small_data, small_totals = cart_statements(app, statements, small)
+    large_count, large_data, large_totals = cart_statements(app, statements, large)
+
+    assert len(small_data['items']) == 1
+    assert len(large_data['items']) == 50
+    assert large_totals == (100, 100000)
+    assert small_count == large_count <= 2
+
+
+def test_get_cart_request_statements_do_not_grow_with_lines(
+    app, client, statements, make_user, make_product, make_cart, auth_headers
+):
+    products = [make_product(stock=100) for _ in range(50)]
+    make_cart(make_user(email='small@example.com'), {products[0]: 1})
+    make_cart(make_user(email='large@example.com'), {product_id: 1 for product_id in products})
+
+    counts = {}
+    for email, lines in (('small@example.com', 1), ('large@example.com', 50)):
+        headers = auth_headers(email=email)
+        with statements:
+            response = client.get('/api/v1/cart', headers=headers)
+        assert response.status_code == 200
+        assert len(response.get_json()['data']['items']) == lines
+        counts[lines] = len(statements)
+
+    assert counts[1] == counts[50]
+
+
+def merge(app, session_id, user_id):
+    with app.app_context():
+        success, error = CartService.merge_guest_cart_to_user(session_id, user_id)
+        assert (success, error) == (True, None)
+        cart = CartService.load_cart(user_id=user_id)
+        return {item.product_id: item.quantity for item in cart.items} if cart else {}
+
+
+def test_merge_adds_overlapping_lines_capped_at_stock(app, make_user, make_product, make_cart):
+    capped, uncapped = make_product(stock=5), make_product(stock=10)
+    user_id = make_user()
+    make_cart(user_id, {capped: 2, uncapped: 1})
+    guest_carts.add('guest-1', capped, 4, Decimal('1000.00'))
+    guest_carts.add('guest-1', uncapped, 3, Decimal('1000.00'))
+
+    assert merge(app, 'guest-1', user_id) == {capped: 5, uncapped: 4}
+    assert guest_carts.items('guest-1') == {}
+
+
+def test_merge_adds_disjoint_lines(app, make_user, make_product, make_cart):
+    existing, new = make_product(stock=5), make_product(stock=5, price='250.00')
+    user_id = make_user()
+    make_cart(user_id, {existing: 1})
+    guest_carts.add('guest-1', new, 2, Decimal('200.00'))
+
+    assert merge(app, 'guest-1', user_id) == {existing: 1, new: 2}
+    with app.app_context():
+        line = CartItem.query.filter_by(product_id=new).one()
+        assert line.price_at_addition == Decimal('200.00')  # Price when added as a guest
+
+
+def test_merge_skips_inactive_and_out_of_stock_products(app, make_user, make_product):
+    available = make_product(stock=5)
+    inactive = make_product(stock=5, is_active=False)
+    sold_out = make_product(stock=0)
+    user_id = make_user()
+    for product_id in (available, inactive, sold_out):
+        guest_carts.add('guest-1', product_id, 1, Decimal('1000.00'))
+
+    assert merge(app, 'guest-1', user_id) == {available: 1}
+
+
+def test_merge_combines_legacy_sql_guest_carts_with_store_lines(app, make_user, make_product):
+    shared, legacy_only = make_product(stock=10), make_product(stock=10)
+    user_id = make_user()
+    with app.app_context():
+        legacy = Cart(session_id='guest-1')
+        db.session.add(legacy)
+        db.session.flush()
+        db.session.add_all([
+            CartItem(cart_id=legacy.id, product_id=shared, quantity=2, price_at_addition=Decimal('1000.00')),
+            CartItem(cart_id=legacy.id, product_id=legacy_only, quantity=1, price_at_addition=Decimal('1000.00')),
+        ])
+        db.session.commit()
+    guest_carts.add('guest-1', shared, 3, Decimal('1000.00'))
+
+    assert merge(app, 'guest-1', user_id) == {shared: 5, legacy_only: 1}
+    with app.app_context():
+        assert Cart.query.filter_by(session_id='guest-1').count() == 0
+
+
+def test_memory_guest_carts_sweep_abandoned_sessions():
+    backend = MemoryGuestCartBackend(ttl=0.05)
+    backend.incr('abandoned', 'q:product', 1)
+    time.sleep(0.1)
+
+    backend.incr('active', 'q:product', 1)  # Any write sweeps once the interval has passed
+
+    assert list(backend._carts) == ['active']
+
+
+class UnreachableGuestCartBackend:
+    """Fails every call, as RedisGuestCartBackend does while Redis is down"""
+
+    def __getattr__(self, name):
+        def unavailable(*args, **kwargs):
+            raise GuestCartUnavailable()
+        return unavailable
+
+
+def test_guest_cart_routes_answer_503_while_the_store_is_down(client, make_product, monkeypatch):
+    product_id = make_product()
+    monkeypatch.setattr(guest_carts, 'backend', UnreachableGuestCartBackend())
+
+    for response in (
+        client.get('/api/v1/cart'),
+        client.post('/api/v1/cart/items', json={'product_id': product_id, 'quantity': 1}),
+        client.delete('/api/v1/cart'),
+    ):
+        assert response.status_code == 503
+        assert response.get_json()['message'] == 'Cart is temporarily unavailable, please try again shortly'
@@ -0,0 +1,186 @@
+"""Stock reservation at checkout (InventoryService)"""
+
+import pytest
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app.extensions import db
+from app.models import Cart, Notification, Order, Product, StockReservation, User
+from app.services.inventory_service import InventoryService
+from app.services.order_service import OrderService
+from app.services.payment_service import PaymentService
+
+ADDRESS = {'full_name': 'Test User', 'city': 'Nairobi', 'country': 'Kenya'}
+
+
+@pytest.fixture
+def immediate_transactions(app):
+    """
+    Take SQLite's write lock at BEGIN
+
+    SQLite locks the whole database, and a transaction that read before
+    writing fails instead of waiting. Starting every transaction with BEGIN
+    IMMEDIATE makes concurrent checkouts queue, as PostgreSQL row locks do.
+    Whole transactions then run one at a time, so tests using this check
+    checkout end to end; the conditional UPDATE itself is covered by
+    test_decrement_refuses_stock_taken_since_it_was_read.
+    """
+    with app.app_context():
+        engine = db.engine
+
+    def begin(connection):
+        connection.connection.dbapi_connection.isolation_level = None
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    event.listen(engine, 'begin', begin)
+    yield
+    event.remove(engine, 'begin', begin)
+    engine.dispose()
+
+
+def checkout(app, cart_id, user_id):
+    with app.app_context():
+        cart = db.session.get(Cart, cart_id)
+        user = db.session.get(User, user_id)
+        order, error = OrderService.create_order_from_cart(cart, user, ADDRESS)
+        return order.id if order else None, error
+
+
+def stock_of(app, product_id):
+    with app.app_context():
+        return db.session.get(Product, product_id).stock_quantity
+
+
+def test_parallel_checkouts_do_not_oversell(app, make_user, make_product, make_cart, immediate_transactions):
+    product_id = make_product(stock=3)
+    buyers = []
+    for n in range(8):
+        user_id = make_user(email=f'buyer{n}@example.com')
+        buyers.append((make_cart(user_id, {product_id: 1}), user_id))
+
+    results = []
+    start = threading.Barrier(len(buyers))
+
+    def buy(cart_id, user_id):
+        start.wait()
+        try:
+            results.append(checkout(app, cart_id, user_id))
+        except Exception as e:
+            results.append((None, repr(e)))
+
+    threads = [threading.Thread(target=buy, args=buyer) for buyer in buyers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    orders = [order_id for order_id, _ in results if order_id]
+    errors = [error for order_id, error in results if not order_id]
+    assert len(orders) == 3
+    assert len(errors) == 5
+    assert all('out of stock' in error for error in errors)
+    assert stock_of(app, product_id) == 0
+
+
+def test_decrement_refuses_stock_taken_since_it_was_read(app, make_product):
+    product_id = make_product(stock=1)
+
+    with app.app_context():
+        product = db.session.get(Product, product_id)
+        assert product.stock_quantity == 1  # Read: enough for one more
+
+        # A competing checkout takes the last unit in its own transaction
+        with app.app_context():
+            assert InventoryService.decrement_stock([(product_id, 1)]) == (True, [])
+            db.session.commit()
+
+        # A read-check-write would still see 1 here and sell the unit again
+        assert InventoryService.decrement_stock([(product_id, 1)]) == (False, [product_id])
+        db.session.commit()
+
+    assert stock_of(app, product_id) == 0
+
+
+def test_short_line_rolls_back_the_whole_order(app, make_user, make_product, make_cart):
+    plenty, scarce = make_product(stock=10), make_product(stock=1, name='Scarce Jacket')
+    user_id = make_user()
+    cart_id = make_cart(user_id, {plenty: 2, scarce: 2})
+
+    order_id, error = checkout(app, cart_id, user_id)
+
+    assert order_id is None
+    assert error == 'Scarce Jacket is out of stock'
+    assert stock_of(app, plenty) == 10
+    assert stock_of(app, scarce) == 1
+
+
+def test_release_expired_restores_stock(app, make_user, make_product, make_cart):
+    product_id = make_product(stock=5)
+    user_id = make_user()
+    order_id, _ = checkout(app, make_cart(user_id, {product_id: 2}), user_id)
+    assert stock_of(app, product_id) == 3
+
+    with app.app_context():
+        assert InventoryService.release_expired(now=datetime.utcnow()) == 0
+        assert InventoryService.release_expired(now=datetime.utcnow() + timedelta(days=1)) == 1
+        # Already expired reservations are not released twice
+        assert InventoryService.release_expired(now=datetime.utcnow() + timedelta(days=1)) == 0
+        statuses = {r.status for r in StockReservation.query.filter_by(order_id=order_id)}
+
+    assert statuses == {'expired'}
+    assert stock_of(app, product_id) == 5
+
+
+def test_cancel_order_restores_stock_once(app, make_user, make_product, make_cart):
+    product_id = make_product(stock=5)
+    user_id = make_user()
+    order_id, _ = checkout(app, make_cart(user_id, {product_id: 2}), user_id)
+
+    with app.app_context():
+        order, error = OrderService.cancel_order(order_id)
+        assert error is None
+        assert order.status == 'cancelled'
+        # The expiry sweep finds nothing left to return
+        assert InventoryService.release_expired(now=datetime.utcnow() + timedelta(days=1)) == 0
+
+    assert stock_of(app, product_id) == 5
+
+
+def test_paid_order_with_lapsed_and_sold_stock_goes_on_hold(app, make_user, make_product, make_cart):
+    product_id = make_product(stock=1, name='Last Jacket')
+    admin_id = make_user(email='admin@example.com', role='super_admin')
+    late_buyer, other_buyer = make_user(email='late@example.com'), make_user(email='other@example.com')
+    order_id, _ = checkout(app, make_cart(late_buyer, {product_id: 1}), late_buyer)
+
+    with app.app_context():
+        InventoryService.release_expired(now=datetime.utcnow() + timedelta(days=1))
+    checkout(app, make_cart(other_buyer, {product_id: 1}), other_buyer)  # Sells the released unit
+
+    with app.app_context():
+        assert PaymentService.confirm_paid_order(db.session.get(Order, order_id)) is False
+        db.session.commit()
+
+        order = db.session.get(Order, order_id)
+        assert (order.status, order.payment_status, order.confirmed_at) == ('on_hold', 'completed', None)
+        assert 'Last Jacket' in order.admin_notes
+        notification = Notification.query.filter_by(user_id=admin_id).one()
+        assert order.order_number in notification.title
+        statuses = {r.status for r in StockReservation.query.filter_by(order_id=order_id)}
+
+    assert statuses == {'expired'}
+    assert stock_of(app, product_id) == 0
+
+
+def test_paid_order_with_lapsed_stock_still_available_is_confirmed(app, make_user, make_product, make_cart):
+    product_id = make_product(stock=3)
+    user_id = make_user()
+    order_id, _ = checkout(app, make_cart(user_id, {product_id: 2}), user_id)
+
+    with app.app_context():
+        InventoryService.release_expired(now=datetime.utcnow() + timedelta(days=1))
+        assert PaymentService.confirm_paid_order(db.session.get(Order, order_id)) is True
+        db.session.commit()
+        assert db.session.get(Order, order_id).status == 'confirmed'
+        assert Notification.query.count() == 0
+
+    assert stock_of(app, product_id) == 1
@@ -0,0 +1,103 @@
+"""Checkout (OrderService.create_order_from_cart and POST /orders)"""
+
+from app.extensions import db
+from app.models import Order, UserAddress, User
+from app.services.cart_service import CartService
+from app.services.order_service import OrderService
+
+ADDRESS = {'full_name': 'Test User', 'city': 'Nairobi', 'country': 'Kenya'}
+
+
+def checkout_statements(app, statements, cart_id, user_id):
+    with app.app_context():
+        cart = CartService.load_cart(cart_id=cart_id)
+        user = db.session.get(User, user_id)
+        with statements:
+            order, error = OrderService.create_order_from_cart(cart, user, ADDRESS)
+        assert error is None
+        lines = len(order.items)
+        db.session.remove()
+    return len(statements), lines
+
+
+def test_checkout_statements_do_not_grow_with_lines(app, statements, make_user, make_product, make_cart):
+    products = [make_product(stock=10) for _ in range(30)]
+    small_user, large_user = make_user(email='small@example.com'), make_user(email='large@example.com')
+    small = make_cart(small_user, {products[0]: 1})
+    large = make_cart(large_user, {product_id: 1 for product_id in products})
+
+    small_count, small_lines = checkout_statements(app, statements, small, small_user)
+    large_count, large_lines = checkout_statements(app, statements, large, large_user)
+
+    assert (small_lines, large_lines) == (1, 30)
+    assert small_count == large_count <= 8
+
+
+def test_create_order_request_statements_do_not_grow_with_lines(
+    app, client, statements, make_user, make_product, make_cart, auth_headers
+):
+    products = [make_product(stock=10) for _ in range(30)]
+    counts = {}
+    for email, lines in (('small@example.com', 1), ('large@example.com', 30)):
+        user_id = make_user(email=email)
+        make_cart(user_id, {product_id: 1 for product_id in products[:lines]})
+        with app.app_context():
+            address = UserAddress(
+                user_id=user_id, full_name='Test User', phone='0700000000',
+                address_line1='1 Test Road', city='Nairobi'
+            )
+            db.session.add(address)
+            db.session.commit()
+            address_id = address.id
+
+        headers = auth_headers(email=email)
+        with statements:
+            response = client.post('/api/v1/orders', json={'shipping_address_id': address_id}, headers=headers)
+        assert response.status_code == 201, response.get_json()
+        assert len(response.get_json()['data']['items']) == lines
+        counts[lines] = len(statements)
+
+    assert counts[1] == counts[30]
+    with app.app_context():
+        assert Order.query.count() == 2
+
+
+def test_profile_update_renames_the_customer_on_orders(
+    app, client, make_user, make_product, make_cart, auth_headers
+):
+    user_id = make_user()
+    make_user(email='admin@example.com', role='admin')  # The check this route makes
+    with app.app_context():
+        cart = CartService.load_cart(cart_id=make_cart(user_id, {make_product(): 1}))
+        order, _ = OrderService.create_order_from_cart(cart, db.session.get(User, user_id), ADDRESS)
+        order_id = order.id
+
+    response = client.put(
+        '/api/v1/auth/me', json={'first_name': 'Ada', 'last_name': 'Okafor'}, headers=auth_headers()
+    )
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert db.session.get(Order, order_id).customer_name == 'Ada Okafor'
+    response = client.get(
+        '/api/v1/orders/admin/orders?search=okafor', headers=auth_headers(email='admin@example.com')
+    )
+    assert [order['id'] for order in response.get_json()['data']['items']] == [order_id]
+
+
+def test_order_numbers_are_unique_and_increasing(app, make_user, make_product, make_cart):
+    product_id = make_product(stock=10)
+    numbers = []
+    for n in range(3):
+        user_id = make_user(email=f'buyer{n}@example.com')
+        cart_id = make_cart(user_id, {product_id: 1})
+        with app.app_context():
+            order, error = OrderService.create_order_from_cart(
+                CartService.load_cart(cart_id=cart_id), db.session.get(User, user_id), ADDRESS
+            )
+            assert error is None
+            numbers.append(order.order_number)
+
+    suffixes = [int(number.rsplit('-', 1)[1]) for number in numbers]
+    assert suffixes == sorted(set(suffixes))  # Strictly increasing, so unique
+    assert all(number.startswith('HS-') and len(number.rsplit('-', 1)[1]) == 6 for number in numbers)
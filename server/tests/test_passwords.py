@@ -0,0 +1,80 @@
+"""Password hashing at login and registration (PasswordHasher)"""
+
+import pytest
+from werkzeug.security import generate_password_hash
+from app.extensions import db
+from app.models import User
+from app.services.password_service import passwords
+
+CREDENTIALS = {'email': 'customer@example.com', 'password': 'Password123!'}
+
+
+@pytest.fixture
+def full_queue():
+    """Hold every hashing slot, as a burst of logins would"""
+    held = 0
+    while passwords._slots.acquire(blocking=False):
+        held += 1
+    yield
+    for _ in range(held):
+        passwords._slots.release()
+
+
+def stored_hash(app, email='customer@example.com'):
+    with app.app_context():
+        return User.query.filter_by(email=email).one().password_hash
+
+
+def test_full_queue_answers_503_with_retry_after(app, client, make_user, full_queue):
+    make_user()
+
+    response = client.post('/api/v1/auth/login', json=CREDENTIALS)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app.config['PASSWORD_HASH_RETRY_AFTER'])
+
+    response = client.post('/api/v1/auth/register', json={
+        'email': 'new@example.com', 'password': 'Password123!', 'first_name': 'New', 'last_name': 'User'
+    })
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+    with app.app_context():
+        assert User.query.filter_by(email='new@example.com').count() == 0
+
+
+def test_login_succeeds_once_the_queue_drains(client, make_user, full_queue):
+    make_user()
+    assert client.post('/api/v1/auth/login', json=CREDENTIALS).status_code == 503
+
+    passwords._slots.release()  # One job finishes
+    try:
+        assert client.post('/api/v1/auth/login', json=CREDENTIALS).status_code == 200
+    finally:
+        passwords._slots.acquire()
+
+
+def test_login_rehashes_outdated_hashes(app, client, make_user):
+    user_id = make_user()
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.password_hash = generate_password_hash(CREDENTIALS['password'], method='pbkdf2:sha256:500')
+        db.session.commit()
+
+    assert client.post('/api/v1/auth/login', json=CREDENTIALS).status_code == 200
+    upgraded = stored_hash(app)
+    assert upgraded.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+
+    # A current hash is left alone
+    assert client.post('/api/v1/auth/login', json=CREDENTIALS).status_code == 200
+    assert stored_hash(app) == upgraded
+
+
+def test_failed_login_does_not_rehash(app, client, make_user):
+    user_id = make_user()
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.password_hash = outdated = generate_password_hash(CREDENTIALS['password'], method='pbkdf2:sha256:500')
+        db.session.commit()
+
+    response = client.post('/api/v1/auth/login', json={**CREDENTIALS, 'password': 'Wrong123!'})
+    assert response.status_code == 401
+    assert stored_hash(app) == outdated
@@ -0,0 +1,27 @@
+"""Product payloads (Product.to_dict and the product serializer)"""
+
+import pytest
+from decimal import Decimal
+from app.extensions import db
+from app.models import Product
+from app.serializers import PRODUCT_PROJECTIONS
+
+
+@pytest.mark.parametrize('original_price', [None, Decimal('0')])
+def test_missing_original_price_serializes_as_none(app, make_product, original_price):
+    product_id = make_product(original_price=original_price)
+    with app.app_context():
+        data = db.session.get(Product, product_id).to_dict()
+
+    assert data['original_price'] is None
+    assert data['discount_percentage'] is None
+
+
+def test_to_dict_is_the_detail_projection(app, make_product):
+    product_id = make_product(price='750.00', original_price=Decimal('1000.00'))
+    with app.app_context():
+        data = db.session.get(Product, product_id).to_dict()
+
+    assert list(data) == PRODUCT_PROJECTIONS['detail']
+    assert data['original_price'] == Decimal('1000.00')
+    assert data['discount_percentage'] == 25
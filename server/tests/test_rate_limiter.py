@@ -0,0 +1,27 @@
+"""Token buckets of the rate limiter (MemoryBucketBackend)"""
+
+import time
+from app.middleware.rate_limiter import MemoryBucketBackend, parse_limit
+
+
+def test_bucket_refuses_when_empty_and_reports_the_wait():
+    backend = MemoryBucketBackend()
+    capacity, rate = parse_limit('2/minute')
+
+    assert backend.take('ip:1', rate, capacity) == (True, 0)
+    assert backend.take('ip:1', rate, capacity) == (True, 0)
+    allowed, wait = backend.take('ip:1', rate, capacity)
+
+    assert not allowed
+    assert 29 < wait <= 30
+
+
+def test_refilled_buckets_are_swept():
+    backend = MemoryBucketBackend(sweep_interval=0.05)
+    backend.take('idle', 100, 1)  # Refills in 10ms
+    backend.take('drained', 1 / 3600, 1)  # Refills in an hour
+    time.sleep(0.1)
+
+    backend.take('new', 100, 1)  # Any request sweeps once the interval has passed
+
+    assert sorted(backend._buckets) == ['drained', 'new']
@@ -0,0 +1,32 @@
+"""Rating summaries of approved reviews (ReviewService)"""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models import ProductRatingSummary, Review
+from app.services.review_service import ReviewService
+
+
+def test_site_wide_row_is_unique(app):
+    with app.app_context():
+        db.session.add(ProductRatingSummary(product_id=None))
+        db.session.commit()
+
+        db.session.add(ProductRatingSummary(product_id=None))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+
+
+def test_approvals_update_one_site_wide_row_and_the_product_row(app, make_user, make_product):
+    user_id = make_user()
+    product_id = make_product()
+    with app.app_context():
+        for rating, product in ((5, product_id), (3, None), (4, product_id)):
+            ReviewService.record_approval_change(
+                Review(user_id=user_id, product_id=product, rating=rating, content='Nice'), True
+            )
+            db.session.commit()
+
+        assert ProductRatingSummary.query.filter_by(product_id=None).count() == 1
+        assert ReviewService.get_rating_summary()['total_reviews'] == 3
+        assert ReviewService.get_rating_summary(product_id)['average_rating'] == 4.5
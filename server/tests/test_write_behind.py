@@ -0,0 +1,68 @@
+"""Read markers and batched bookkeeping writes (write_behind)"""
+
+import pytest
+from app.extensions import db
+from app.models import ContactMessage, Notification, User
+from app.services.write_behind_service import write_behind
+
+
+@pytest.fixture
+def batched(monkeypatch):
+    """Hold deferred updates until flushed, as between two background flushes"""
+    monkeypatch.setattr(write_behind, 'interval', 60)
+    monkeypatch.setattr(write_behind, '_ensure_thread', lambda: None)
+    yield
+    write_behind.flush()
+
+
+def stored(app, model, row_id):
+    with app.app_context():
+        return db.session.get(model, row_id)
+
+
+def test_notification_read_flag_is_written_at_once(app, client, make_user, auth_headers, batched):
+    user_id = make_user(role='content_manager')
+    with app.app_context():
+        notification = Notification(user_id=user_id, type='order', title='New order', message='HS-1')
+        db.session.add(notification)
+        db.session.commit()
+        notification_id = notification.id
+
+    headers = auth_headers()
+    write_behind.flush()  # The login's last_login
+
+    response = client.patch(f'/api/v1/admin/notifications/{notification_id}/read', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['data']['is_read'] is True
+
+    notification = stored(app, Notification, notification_id)
+    assert notification.is_read is True
+    assert notification.read_at is None  # Batched
+
+    assert write_behind.flush() == 1
+    assert stored(app, Notification, notification_id).read_at is not None
+
+
+def test_contact_message_read_flag_is_written_at_once(app, client, make_user, auth_headers, batched):
+    make_user(role='admin')  # The check this route makes
+    with app.app_context():
+        message = ContactMessage(name='Visitor', email='visitor@example.com', message='Hello')
+        db.session.add(message)
+        db.session.commit()
+        message_id = message.id
+
+    response = client.put(f'/api/v1/admin/contact/messages/{message_id}/read', headers=auth_headers())
+    assert response.status_code == 200
+
+    assert stored(app, ContactMessage, message_id).is_read is True
+
+
+def test_last_login_is_batched(app, client, make_user, batched):
+    user_id = make_user()
+
+    response = client.post('/api/v1/auth/login', json={'email': 'customer@example.com', 'password': 'Password123!'})
+    assert response.status_code == 200
+    assert stored(app, User, user_id).last_login is None
+
+    assert write_behind.flush() == 1
+    assert stored(app, User, user_id).last_login is not None